@@ -9,6 +9,7 @@ sys.path.append('.')
 
 import helpers.database as db
 from helpers.data_handler import get_stock_data
+from helpers.streaming_indicators import StreamingRsi
 
 # Loglama ayarları
 logging.basicConfig(
@@ -19,6 +20,29 @@ logging.basicConfig(
 )
 
 CHECK_INTERVAL_SECONDS = 60  # Alarmları kontrol etme aralığı (saniye)  
+# RSI alarmlarının ısınması için çekilen günlük geçmiş (takvim günü)
+RSI_HISTORY_DAYS = 400
+
+# Hisse -> (son işlenen kapanmış bar, akış RSI'ı). Her kontrolde yalnızca yeni kapanan
+# barlar işlenir; henüz kapanmamış son bar durumu değiştirmeden önizlenir.
+_rsi_states = {}
+
+
+def get_latest_rsi(stock_code, veri):
+    """Hissenin akış RSI'ını yeni kapanan barlarla günceller ve son bar dahil değerini döndürür."""
+    last_ts, rsi = _rsi_states.get(stock_code, (None, None))
+    if rsi is None:
+        rsi = StreamingRsi(14)
+    closed = veri.iloc[:-1]
+    if last_ts is not None:
+        closed = closed[closed.index > last_ts]
+    for close in closed["close"]:
+        rsi.update(close)
+    if not closed.empty:
+        last_ts = closed.index[-1]
+    _rsi_states[stock_code] = (last_ts, rsi)
+    return rsi.preview(veri["close"].iloc[-1])
+
 
 def check_alarms():
     """Veritabanındaki aktif alarmları kontrol eder ve koşullar sağlanırsa bildirim gönderir."""
@@ -35,8 +59,10 @@ def check_alarms():
     for stock_code in unique_stocks:
         try:
             hisse_yf = f"{stock_code}.IS"
-            # Sadece son 2 günlük veriyi çekmek yeterli
-            latest_data = get_stock_data(hisse_yf, interval="1d", period="2d")
+            # RSI'ın ısınması için yeterli geçmiş; yerel depo sayesinde sonraki
+            # kontrollerde yalnızca yeni barlar indirilir.
+            start_date = (pd.Timestamp.today() - pd.Timedelta(days=RSI_HISTORY_DAYS)).strftime("%Y-%m-%d")
+            latest_data = get_stock_data(hisse_yf, interval="1d", start_date=start_date)
             if latest_data is None or latest_data.empty:
                 logging.warning(f"{stock_code} için güncel fiyat alınamadı.")
                 continue
@@ -45,6 +71,9 @@ def check_alarms():
             
             # Bu hisseye ait alarmları filtrele
             stock_alarms = active_alarms[active_alarms['hisse'] == stock_code]
+            current_rsi = None
+            if stock_alarms['condition_type'].str.startswith('RSI').any():
+                current_rsi = get_latest_rsi(stock_code, latest_data)
 
             for _, alarm in stock_alarms.iterrows():
                 condition_met = False
@@ -55,15 +84,23 @@ def check_alarms():
                     condition_met = True
                 elif condition_type == 'Fiyat <=' and current_price <= target_value:
                     condition_met = True
+                elif condition_type == 'RSI >=' and current_rsi is not None and current_rsi >= target_value:
+                    condition_met = True
+                elif condition_type == 'RSI <=' and current_rsi is not None and current_rsi <= target_value:
+                    condition_met = True
                 
                 if condition_met:
-                    logging.info(f"ALARM TETİKLENDİ: {alarm['hisse']} fiyatı ({current_price:.2f}) {condition_type} {target_value:.2f} koşulunu sağladı.")
+                    if condition_type.startswith('RSI'):
+                        durum = f"RSI {current_rsi:.2f}"
+                    else:
+                        durum = f"fiyatı {current_price:.2f} TL"
+                    logging.info(f"ALARM TETİKLENDİ: {alarm['hisse']} {durum}; {condition_type} {target_value:.2f} koşulunu sağladı.")
                     
                     # Masaüstü bildirimi gönder
                     try:
                         notification.notify(
                             title=f"Borsa Alarmı: {alarm['hisse']}",
-                            message=f"{alarm['hisse']} fiyatı {current_price:.2f} TL oldu. Alarm koşulu: {condition_type} {target_value:.2f}",
+                            message=f"{alarm['hisse']} {durum} oldu. Alarm koşulu: {condition_type} {target_value:.2f}",
                             app_name="BIST Analiz Platformu",
                             timeout=30  # Bildirimin ekranda kalma süresi (saniye)
                         )
@@ -8,12 +8,21 @@ import plotly.express as px
 
 from helpers.data_handler import (
     get_stock_data,
+    get_stock_data_with_warmup,
+    get_available_history_start,
+    get_required_indicators,
+    get_indicator_cache_stats,
+    get_vwap_anchors,
+    add_anchored_vwap,
     get_fundamental_data,
     filter_data_by_date,
-    calculate_indicators,
     convert_dataframe_for_streamlit,
     get_sector_comparison_data,
 )
+from helpers.indicator_engine import update_indicators
+from helpers.event_index import update_event_index
+from helpers.support_resistance import find_stocks_near_support, get_sr_cache_stats
+from helpers.multi_timeframe import MTF_OVERLAYS, add_higher_timeframe_indicators
 from helpers.plotter import (
     display_candlestick_chart,
     display_financial_trends_chart,
@@ -33,6 +42,7 @@ from helpers.ui_components import (
     display_key_metrics_comparison,
 )
 from helpers.backtester import (
+    BACKTEST_ENGINES,
     run_backtest,
     optimize_strategy,
     EmaCross,
@@ -72,6 +82,8 @@ def display_technical_analysis(
     selected_indicators,
     show_support_resistance,
     show_fibonacci,
+    events=None,
+    interval=None,
 ):
     st.header(f"{hisse_kodu_yf} - Teknik Grafik")
     display_candlestick_chart(
@@ -82,6 +94,8 @@ def display_technical_analysis(
         selected_indicators,
         show_support_resistance,
         show_fibonacci=show_fibonacci,
+        events=events,
+        interval=interval,
     )
     csv = convert_df_to_csv(veri)
     st.download_button(
@@ -102,6 +116,10 @@ def display_technical_analysis(
             for yorum in yorumlar:
                 st.markdown(f"- {yorum}")
 
+    with st.expander("Gösterge Önbelleği"):
+        st.json(get_indicator_cache_stats())
+        st.json({"destek_direnc": get_sr_cache_stats()})
+
 
 def display_fundamental_analysis(hisse_kodu_yf):
     st.header(f"{hisse_kodu_yf} - Temel Veriler")
@@ -215,6 +233,11 @@ def display_backtesting(veri, hisse_kodu_yf):
     test_mode = st.radio(
         "Çalışma Modu", ["Tekli Test", "Optimizasyon"], horizontal=True
     )
+    # Hızlı motor aynı istatistikleri verir ama etkileşimli işlem grafiği çizmez.
+    engine_name = st.radio(
+        "Test Motoru", list(BACKTEST_ENGINES), horizontal=True
+    )
+    engine = BACKTEST_ENGINES[engine_name]
     strategy_options = {
         "EMA Kesişimi": EmaCross,
         "RSI Osilatörü": RsiOscillator,
@@ -350,11 +373,16 @@ def display_backtesting(veri, hisse_kodu_yf):
                             backtest_data,
                             initial_cash,
                             commission,
+                            engine=engine,
                             **params,
                         )
                         display_backtest_summary(stats, initial_cash)
-                        st.subheader("İşlem Grafiği")
-                        st_bokeh.bokeh_chart(plot_fig, use_container_width=True)
+                        if plot_fig is not None:
+                            st.subheader("İşlem Grafiği")
+                            st_bokeh.bokeh_chart(plot_fig, use_container_width=True)
+                        else:
+                            st.subheader("Özsermaye Eğrisi")
+                            st.line_chart(stats["_equity_curve"]["Equity"])
                     else:
                         heatmap = optimize_strategy(
                             selected_strategy_class,
@@ -362,6 +390,7 @@ def display_backtesting(veri, hisse_kodu_yf):
                             initial_cash,
                             commission,
                             maximize=maximize_metric,
+                            engine=engine,
                             **params,
                         )
 
@@ -410,6 +439,17 @@ def display_comparison(hisse_list, interval, start_date, end_date):
     # Temel Metrikler Tablosu
     display_key_metrics_comparison(hisse_list)
 
+    st.divider()
+
+    # Destek/direnç seviyeleri grafikle aynı önbellekten gelir.
+    st.subheader("Güçlü Desteğe Yakın Hisseler")
+    yakin = find_stocks_near_support(hisse_list_yf, interval)
+    if yakin.empty:
+        st.info("Seçilen hisselerden güçlü bir desteğe yakın olan yok (veya yerel depoda verisi yok).")
+    else:
+        yakin["hisse"] = yakin["hisse"].str.replace(".IS", "", regex=False)
+        st.dataframe(yakin, use_container_width=True)
+
 def display_news_and_sentiment(hisse_kodu):
     """İlgili hisse için haberleri ve duyarlılık analizini gösterir."""
     st.header(f"{hisse_kodu} için Haberler ve Piyasa Duyarlılığı")
@@ -548,7 +588,7 @@ def analyzer_main_page():
             "OBV",
             "Golden/Death Cross",
             "Super Trend",
-        ]
+        ] + list(MTF_OVERLAYS)
         selected_indicators = st.sidebar.multiselect(
             "Göstergeler:",
             available_indicators,
@@ -570,17 +610,20 @@ def analyzer_main_page():
         else:
             interval_code = ZAMAN_ARALIKLARI[interval_display]
 
-            max_days = None
-            if interval_code in ["15m", "30m"]:
-                max_days = 59
-            elif interval_code == "60m":
-                max_days = 729
-
-            if max_days and (end_date - start_date).days > max_days:
-                start_date = end_date - timedelta(days=max_days)
-                st.sidebar.warning(
-                    f"Tarih aralığı, {interval_display} için {max_days} günle sınırlandırıldı."
-                )
+            # Gün içi aralıklarda yerel depoda biriken geçmiş, yfinance'in
+            # penceresinden eskiye gidebilir; yalnızca hiçbir kaynağın kapsamadığı
+            # dönem kesilir.
+            earliest_dates = [
+                get_available_history_start(f"{h}.IS", interval_code)
+                for h in hisse_secim_list
+            ]
+            if earliest_dates[0] is not None:
+                earliest = max(earliest_dates).date()
+                if start_date < earliest:
+                    start_date = earliest
+                    st.sidebar.warning(
+                        f"{interval_display} verisi {earliest:%d.%m.%Y} tarihinden itibaren mevcut; başlangıç tarihi buna göre ayarlandı."
+                    )
 
             st.session_state.analysis_requested = True
             st.session_state.hisse_secim_list = hisse_secim_list
@@ -612,14 +655,37 @@ def analyzer_main_page():
             with st.spinner(
                 f"{hisse_kodu_yf} için veriler çekiliyor ve analiz ediliyor..."
             ):
-                veri_raw = get_stock_data(
+                # Göstergeler görünür aralığın başında da doğru olsun diye
+                # gereken ısınma barları da çekilir, hesaplamadan sonra kesilir.
+                veri_raw = get_stock_data_with_warmup(
                     hisse_kodu_yf,
                     interval_code,
                     start_date=start,
                     end_date=end,
+                    selected_indicators=st.session_state.selected_indicators,
                 )
                 if veri_raw is not None and not veri_raw.empty:
-                    veri_hesaplanmis = calculate_indicators(veri_raw.copy())
+                    # Yalnızca grafikte seçilen ve özetin kullandığı göstergeler hesaplanır;
+                    # durum saklanır, yenilemelerde yalnızca yeni barlar işlenir.
+                    veri_hesaplanmis = update_indicators(
+                        hisse_kodu_yf,
+                        interval_code,
+                        veri_raw,
+                        get_required_indicators(st.session_state.selected_indicators),
+                    )
+                    # Üst aralık göstergeleri (ör. günlük EMA 200) yerel yeniden örneklemeyle eklenir.
+                    veri_hesaplanmis = add_higher_timeframe_indicators(
+                        hisse_kodu_yf,
+                        interval_code,
+                        veri_hesaplanmis,
+                        st.session_state.selected_indicators,
+                    )
+                    if "VWAP" in st.session_state.selected_indicators:
+                        veri_hesaplanmis = add_anchored_vwap(
+                            veri_hesaplanmis, get_vwap_anchors(veri_hesaplanmis)
+                        )
+                    # Kesişim olayları dizine yalnızca yeni kapanan barlar için eklenir.
+                    olaylar = update_event_index(hisse_kodu_yf, interval_code, veri_hesaplanmis)
                     veri_filtrelenmis = filter_data_by_date(
                         veri_hesaplanmis,
                         start_date=start,
@@ -642,6 +708,8 @@ def analyzer_main_page():
                             st.session_state.selected_indicators,
                             st.session_state.show_support_resistance,
                             st.session_state.show_fibonacci,
+                            events=olaylar,
+                            interval=interval_code,
                         )
                     with temel_tab:
                         display_fundamental_analysis(hisse_kodu_yf)
@@ -836,8 +904,8 @@ def alarm_manager_page():
         
         c1, c2, c3 = st.columns(3)
         hisse = c1.selectbox("Hisse Kodu", all_stocks)
-        condition = c2.selectbox("Koşul", ["Fiyat >=", "Fiyat <="])
-        value = c3.number_input("Hedef Fiyat", min_value=0.01, format="%.2f")
+        condition = c2.selectbox("Koşul", ["Fiyat >=", "Fiyat <=", "RSI >=", "RSI <="])
+        value = c3.number_input("Hedef Değer (Fiyat veya RSI)", min_value=0.01, format="%.2f")
         
         if st.form_submit_button("Alarm Kur", use_container_width=True):
             if hisse and condition and value > 0:
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+
+def sample_bars(
+    n=500,
+    seed=0,
+    start="2023-01-02",
+    freq="B",
+    index=None,
+    base=50.0,
+    step=1.0,
+    spread=0.5,
+    open_noise=0.2,
+    volume=(1_000, 50_000),
+):
+    """
+    Testler için rastgele yürüyüş OHLCV barları. index verilmezse start'tan itibaren
+    freq aralıklı n bar üretilir. Yüksek/düşük, açılış ve kapanışı kapsar.
+    """
+    if index is None:
+        index = pd.date_range(start, periods=n, freq=freq)
+    rng = np.random.default_rng(seed)
+    n = len(index)
+    close = base + np.cumsum(rng.normal(0, step, n))
+    wick = np.abs(rng.normal(0, spread, n)) + 0.05
+    open_ = close + rng.normal(0, open_noise, n)
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) + wick,
+            "low": np.minimum(open_, close) - wick,
+            "close": close,
+            "volume": rng.integers(volume[0], volume[1], n).astype(float),
+        },
+        index=index,
+    )
@@ -1,8 +1,15 @@
+import itertools
+import sys
+
 from backtesting import Backtest, Strategy
+from backtesting._stats import compute_stats
 from backtesting.lib import crossover
+import numpy as np
 import pandas as pd
 import pandas_ta as ta
 
+from helpers import indicator_kernels as kernels
+
 
 # Strateji 1: EMA Kesişimi
 class EmaCross(Strategy):
@@ -156,9 +163,14 @@ def _prepare_data_for_backtesting(data):
 
 
 def run_backtest(
-    strategy_class, data, cash=100000, commission=0.002, **strategy_params
+    strategy_class, data, cash=100000, commission=0.002, engine="backtesting", **strategy_params
 ):
-    """Verilen veri üzerinde seçilen stratejiyi tek bir test olarak çalıştırır."""
+    """
+    Verilen veri üzerinde seçilen stratejiyi tek bir test olarak çalıştırır.
+    engine="vectorized" ise hızlı motor kullanılır ve grafik yerine None döner.
+    """
+    if engine == "vectorized":
+        return run_backtest_vectorized(strategy_class, data, cash, commission, **strategy_params), None
     daily_data = _prepare_data_for_backtesting(data)
     bt = Backtest(
         daily_data,
@@ -181,9 +193,14 @@ def optimize_strategy(
     cash=100000,
     commission=0.002,
     maximize="Equity Final [$]",
+    engine="backtesting",
     **optimization_params
 ):
     """Verilen parametre aralıkları için bir stratejinin optimizasyonunu çalıştırır."""
+    if engine == "vectorized":
+        return optimize_strategy_vectorized(
+            strategy_class, data, cash, commission, maximize, **optimization_params
+        )
     daily_data = _prepare_data_for_backtesting(data)
     bt = Backtest(
         daily_data,
@@ -204,3 +221,227 @@ def optimize_strategy(
             heatmap.index = heatmap.index.astype(str)
 
     return heatmap
+
+
+# --- Vektörel motor ---
+# Stratejilerin giriş/çıkış kuralları NumPy çekirdekleriyle sinyal dizilerine çevrilir;
+# döngü bar bar değil yalnızca işlemler üzerinde döner. Dolum kuralları backtesting.py
+# ile aynıdır (trade_on_close): sinyal barının kapanışından girilir/çıkılır, komisyon
+# giriş fiyatına eklenir, SL/TP sonraki barların yüksek/düşüğüyle tetiklenir ve aynı
+# barda ikisi birden tetiklenirse SL önce işlenir. İstatistikler backtesting.py'nin
+# kendi hesaplayıcısıyla üretilir.
+BACKTEST_ENGINES = {"backtesting.py": "backtesting", "Hızlı (vektörel)": "vectorized"}
+# backtesting.py'de buy() varsayılan olarak kullanılabilir nakdin bu oranıyla alır.
+_ORDER_FRACTION = 1 - sys.float_info.epsilon
+
+
+def _crossover(series1, series2):
+    """backtesting.lib.crossover'ın tüm barlar için dizi hali (skaler eşik de olabilir)."""
+    a = np.broadcast_to(np.asarray(series1, dtype=float), np.shape(series2) or np.shape(series1))
+    b = np.broadcast_to(np.asarray(series2, dtype=float), a.shape)
+    out = np.zeros(a.shape, dtype=bool)
+    with np.errstate(invalid="ignore"):
+        out[1:] = (a[:-1] < b[:-1]) & (a[1:] > b[1:])
+    return out
+
+
+def _ema_cross_signals(bars, p):
+    fast, slow = kernels.ema(bars["Close"], p["n1"]), kernels.ema(bars["Close"], p["n2"])
+    return (fast, slow), _crossover(fast, slow), _crossover(slow, fast)
+
+
+def _rsi_signals(bars, p):
+    rsi = kernels.rsi(bars["Close"], p["rsi_window"])
+    return (
+        (rsi,),
+        _crossover(rsi, p["buy_threshold"]),
+        _crossover(p["sell_threshold"], rsi),
+    )
+
+
+def _macd_signals(bars, p):
+    line, _, signal = kernels.macd(bars["Close"], p["fast"], p["slow"], p["signal"])
+    return (line, signal), _crossover(line, signal), _crossover(signal, line)
+
+
+def _bband_signals(bars, p):
+    lower, _, upper, _ = kernels.bbands(bars["Close"], p["length"], p["std"])
+    close = bars["Close"]
+    return (lower, upper), _crossover(lower, close), _crossover(close, upper)
+
+
+# Strateji sınıfı -> (göstergeler, giriş sinyali, çıkış sinyali) üreten fonksiyon
+VECTORIZED_SIGNALS = {
+    EmaCross: _ema_cross_signals,
+    RsiOscillator: _rsi_signals,
+    MacdCross: _macd_signals,
+    BBandStrategy: _bband_signals,
+}
+
+
+def _strategy_params(strategy_class, strategy_params):
+    """Sınıf varsayılanlarını verilen parametrelerle birleştirir (bilinmeyen parametre hata verir)."""
+    for name in strategy_params:
+        if not hasattr(strategy_class, name):
+            raise AttributeError(
+                f"Strategy '{strategy_class.__name__}' is missing parameter '{name}'."
+            )
+    params = {
+        name: value
+        for name, value in vars(strategy_class).items()
+        if not name.startswith("_") and not callable(value)
+    }
+    params.update(strategy_params)
+    return params
+
+
+def _simulate(bars, start, entries, exits, cash, commission, stop_loss=None, take_profit=None):
+    """
+    Sinyal dizilerinden tek pozisyonluk uzun işlemleri backtesting.py kurallarıyla
+    canlandırır. (işlem listesi, özsermaye eğrisi) döndürür.
+    """
+    open_, high, low, close = (bars[c] for c in ("Open", "High", "Low", "Close"))
+    n = len(close)
+    equity = np.full(n, float(cash))
+    trades = []
+    if start >= n:
+        return trades, equity
+
+    entry_bars = np.flatnonzero(entries[start:]) + start
+    exit_bars = np.flatnonzero(exits[start:]) + start
+    balance, search_from = float(cash), start
+    while True:
+        pos = np.searchsorted(entry_bars, search_from)
+        if pos == len(entry_bars):
+            break
+        signal_bar = entry_bars[pos]
+        signal_price = close[signal_bar]
+        sl = signal_price * (1 - stop_loss) if stop_loss else None
+        tp = signal_price * (1 + take_profit) if take_profit else None
+        if not (sl or -np.inf) < signal_price * (1 + commission) < (tp or np.inf):
+            raise ValueError(
+                "Long orders require: "
+                f"SL ({sl}) < LIMIT ({signal_price * (1 + commission)}) < TP ({tp})"
+            )
+
+        # Son bardaki emir, backtesting.py'de son barın verisiyle bir kez daha işlenir:
+        # dolum bir önceki kapanıştan olur ve pozisyon kapatılmadan kalır.
+        last_bar_order = signal_bar == n - 1
+        entry_bar = n - 2 if last_bar_order else signal_bar
+        entry_price = close[entry_bar] * (1 + commission)
+        size = int((balance * _ORDER_FRACTION) // entry_price)
+        if not size:
+            search_from = signal_bar + 1
+            continue
+
+        # Çıkış sinyali (son bar hariç; sondaki açık işlem n-2 kapanışından kapatılır)
+        pos = np.searchsorted(exit_bars, signal_bar + 1)
+        exit_signal = exit_bars[pos] if pos < len(exit_bars) and exit_bars[pos] <= n - 2 else None
+        check_from = signal_bar + 1 if not last_bar_order else n - 1
+        check_to = exit_signal if exit_signal is not None else n - 1
+
+        hit = None
+        if sl or tp:
+            window = slice(check_from, check_to + 1)
+            touched = np.zeros(check_to + 1 - check_from, dtype=bool)
+            if sl:
+                touched |= low[window] < sl
+            if tp:
+                touched |= high[window] > tp
+            if touched.any():
+                hit = check_from + int(touched.argmax())
+
+        if hit is not None:
+            exit_bar = hit
+            if sl and low[hit] < sl:
+                exit_price = min(close[hit - 1], sl)
+            else:
+                exit_price = max(open_[hit], tp)
+            search_from = n if last_bar_order else hit
+        elif last_bar_order:
+            equity[n - 1] = balance + size * (close[n - 1] - entry_price)
+            break
+        elif exit_signal is not None:
+            exit_bar, exit_price = exit_signal, close[exit_signal]
+            search_from = exit_signal + 1
+        else:
+            exit_bar, exit_price = n - 2, close[n - 2]
+            search_from = n
+
+        pnl = size * (exit_price - entry_price)
+        equity[entry_bar + 1 : exit_bar] = balance + size * (close[entry_bar + 1 : exit_bar] - entry_price)
+        balance += pnl
+        equity[exit_bar:] = balance
+        trades.append((size, entry_bar, exit_bar, entry_price, exit_price, pnl))
+    return trades, equity
+
+
+def _trades_frame(trades, index):
+    trades_df = pd.DataFrame(
+        trades, columns=["Size", "EntryBar", "ExitBar", "EntryPrice", "ExitPrice", "PnL"]
+    )
+    trades_df["ReturnPct"] = trades_df["ExitPrice"] / trades_df["EntryPrice"] - 1
+    trades_df["EntryTime"] = index[trades_df["EntryBar"].to_numpy(dtype=int)]
+    trades_df["ExitTime"] = index[trades_df["ExitBar"].to_numpy(dtype=int)]
+    trades_df["Duration"] = trades_df["ExitTime"] - trades_df["EntryTime"]
+    return trades_df
+
+
+def _run_vectorized(strategy_class, daily_data, bars, cash, commission, strategy_params):
+    params = _strategy_params(strategy_class, strategy_params)
+    indicators, entries, exits = VECTORIZED_SIGNALS[strategy_class](bars, params)
+    # backtesting.py ile aynı ısınma: tüm göstergeler geçerli olduktan bir bar sonra başlar.
+    start = 1 + max(int(np.isnan(ind).argmin()) for ind in indicators)
+    trades, equity = _simulate(
+        bars, start, entries, exits, cash, commission,
+        params.get("stop_loss"), params.get("take_profit"),
+    )
+    label = ",".join(f"{k}={v}" for k, v in strategy_params.items())
+    return compute_stats(
+        trades=_trades_frame(trades, daily_data.index),
+        equity=equity,
+        ohlc_data=daily_data,
+        strategy_instance=f"{strategy_class.__name__}({label})" if label else strategy_class.__name__,
+    )
+
+
+def run_backtest_vectorized(
+    strategy_class, data, cash=100000, commission=0.002, **strategy_params
+):
+    """
+    run_backtest'in vektörel motorla çalışan karşılığı. İstatistikler aynıdır;
+    etkileşimli bokeh grafiği üretilmez, özsermaye eğrisi stats["_equity_curve"]'dedir.
+    """
+    daily_data = _prepare_data_for_backtesting(data)
+    bars = {col: daily_data[col].to_numpy(dtype=float) for col in ("Open", "High", "Low", "Close")}
+    return _run_vectorized(strategy_class, daily_data, bars, cash, commission, strategy_params)
+
+
+def optimize_strategy_vectorized(
+    strategy_class,
+    data,
+    cash=100000,
+    commission=0.002,
+    maximize="Equity Final [$]",
+    **optimization_params
+):
+    """Parametre ızgarasını vektörel motorla tarar; optimize_strategy ile aynı biçimde heatmap döndürür."""
+    daily_data = _prepare_data_for_backtesting(data)
+    bars = {col: daily_data[col].to_numpy(dtype=float) for col in ("Open", "High", "Low", "Close")}
+    grid = {
+        name: list(values) if isinstance(values, (list, tuple, range)) else [values]
+        for name, values in optimization_params.items()
+    }
+    combinations = list(itertools.product(*grid.values()))
+    values = [
+        _run_vectorized(
+            strategy_class, daily_data, bars, cash, commission, dict(zip(grid, combination))
+        )[maximize]
+        for combination in combinations
+    ]
+    return pd.Series(
+        values,
+        index=pd.MultiIndex.from_tuples(combinations, names=list(grid)),
+        name=maximize,
+        dtype=float,
+    )
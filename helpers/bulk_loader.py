@@ -0,0 +1,196 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from helpers import data_store
+from helpers import rate_limiter
+from helpers.providers import get_provider
+import helpers.database as db
+from helpers.data_handler import FULL_HISTORY_START, get_provider_history_start
+from constants import HISSE_GRUPPARI
+
+DEFAULT_CHUNK_SIZE = 50
+DEFAULT_MAX_WORKERS = 4
+# Günlük biriktirilen gün içi aralıklar. 30m ve 60m, 15m geçmişinden türetilebilir;
+# 60m ayrıca yfinance'in 729 günlük penceresinden bir kez geriye doldurulur.
+INTRADAY_ACCUMULATION_INTERVALS = ("15m", "60m")
+
+
+def _chunks(items, size):
+    """Listeyi en fazla size elemanlı parçalara böler."""
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+def _split_batch(veri, tickers):
+    """Çoklu hisse yf.download çıktısını hisse başına normalize edilmiş DataFrame'lere ayırır."""
+    result = {}
+    if veri is None or veri.empty:
+        return result
+
+    if isinstance(veri.columns, pd.MultiIndex):
+        available = set(veri.columns.get_level_values(0))
+    else:
+        available = set(tickers[:1])
+
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+        tek = veri[ticker].copy() if isinstance(veri.columns, pd.MultiIndex) else veri.copy()
+        tek = tek.dropna(how="all")
+        if not tek.empty:
+            result[ticker] = data_store.normalize_ohlcv(tek)
+    return result
+
+
+def _batch_start_date(tickers, interval):
+    """
+    Parti için ortak başlangıç tarihi: en geride kalan hissenin son kayıtlı günü.
+
+    Gün içi aralıklarda tarih, yfinance'in sunduğu pencerenin başından eski olamaz.
+    """
+    provider_start = get_provider_history_start(interval)
+    start = pd.Timestamp(FULL_HISTORY_START)
+    last_dates = [data_store.get_last_timestamp(t, interval) for t in tickers]
+    if all(ts is not None for ts in last_dates):
+        start = min(last_dates)
+    if provider_start is not None:
+        start = max(start, provider_start)
+    return start.strftime("%Y-%m-%d")
+
+
+def _refresh_batch(tickers, interval, start_date=None):
+    """Tek bir partiyi indirir, depoya yazar ve hisse başına sonuç satırları döndürür."""
+    batch_start = start_date or _batch_start_date(tickers, interval)
+    end_date = (datetime.today() + timedelta(days=1)).strftime("%Y-%m-%d")
+    try:
+        provider = get_provider()
+        # Çoklu hisse indirmesi hisse başına bir istek yapar. İndirmeler sağlayıcıda
+        # sırayla yapılır; parti içindeki hisseler yfinance tarafından paralel çekilir.
+        provider.acquire(cost=len(tickers))
+        veri = provider.download(
+            tickers,
+            start=batch_start,
+            end=end_date,
+            interval=interval,
+            group_by="ticker",
+            threads=True,
+        )
+    except Exception as e:
+        logging.error(f"Parti indirilemedi ({tickers[0]}...): {e}")
+        rate_limiter.record_failure(e)
+        return [
+            {"hisse": t, "durum": "hata", "bar_sayisi": 0, "hata": str(e)} for t in tickers
+        ]
+
+    per_ticker = _split_batch(veri, tickers)
+    throttled = {t for t in tickers if t not in per_ticker and rate_limiter.download_throttled(t)}
+    if throttled:
+        rate_limiter.record_failure("Too Many Requests")
+    elif per_ticker:
+        rate_limiter.record_success()
+    rows = []
+    for ticker in tickers:
+        bars = per_ticker.get(ticker)
+        if bars is None:
+            if ticker in throttled:
+                # Kısıtlama sembolün suçu değildir; bir sonraki çalıştırmada yeniden denenir.
+                hata = "İstek kısıtlandı"
+            else:
+                hata = "Veri bulunamadı"
+                db.record_symbol_failure(ticker, "price", hata)
+            rows.append({"hisse": ticker, "durum": "hata", "bar_sayisi": 0, "hata": hata})
+            continue
+        try:
+            had_data = data_store.get_last_timestamp(ticker, interval) is not None
+            data_store.append_bars(ticker, interval, bars)
+            if had_data:
+                data_store.update_meta(ticker, interval)
+            else:
+                data_store.update_meta(
+                    ticker, interval, covered_from=pd.to_datetime(batch_start).isoformat()
+                )
+            db.record_symbol_success(ticker, "price")
+            rows.append({"hisse": ticker, "durum": "ok", "bar_sayisi": len(bars), "hata": None})
+        except Exception as e:
+            rows.append({"hisse": ticker, "durum": "hata", "bar_sayisi": 0, "hata": str(e)})
+    return rows
+
+
+def refresh_universe(
+    hisseler=None,
+    interval="1d",
+    start_date=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    max_workers=DEFAULT_MAX_WORKERS,
+    skip_blocked=True,
+):
+    """
+    Hisse evrenini çoklu hisse partileri halinde indirip yerel depoya yazar.
+
+    Args:
+        hisseler (list): '.IS' eki olmadan hisse kodları. Varsayılan "Tüm Hisseler".
+        interval (str): yfinance zaman aralığı.
+        start_date (str): Verilirse tüm partiler bu tarihten itibaren çekilir; verilmezse
+            her parti depodaki son bardan devam eder.
+        chunk_size (int): Tek bir yf.download çağrısındaki hisse sayısı.
+        max_workers (int): Aynı anda işlenen parti sayısı. İndirmeler sırayla yapılır;
+            bir partinin depoya yazılması sonraki partinin indirmesiyle örtüşür.
+        skip_blocked (bool): Yakın zamanda veri vermeyen semboller bekleme süreleri
+            dolana kadar atlanır ve raporda "atlandı" olarak görünür.
+
+    Returns:
+        tuple: (hisse başına sonuç DataFrame'i, toplam süre saniye)
+    """
+    if hisseler is None:
+        hisseler = HISSE_GRUPPARI["Tüm Hisseler"]
+    tickers = [f"{h}.IS" for h in dict.fromkeys(hisseler)]
+
+    rows = []
+    if skip_blocked:
+        blocked = db.get_blocked_symbols("price")
+        rows = [
+            {"hisse": t, "durum": "atlandı", "bar_sayisi": 0, "hata": "Bekleme süresinde"}
+            for t in tickers
+            if t in blocked
+        ]
+        tickers = [t for t in tickers if t not in blocked]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_refresh_batch, batch, interval, start_date)
+            for batch in _chunks(tickers, chunk_size)
+        ]
+        for future in as_completed(futures):
+            rows.extend(future.result())
+    elapsed = time.perf_counter() - started
+
+    report = pd.DataFrame(rows, columns=["hisse", "durum", "bar_sayisi", "hata"])
+    report["hisse"] = report["hisse"].str.replace(".IS", "", regex=False)
+    return report.sort_values("hisse").reset_index(drop=True), elapsed
+
+
+def accumulate_intraday(
+    hisseler=None,
+    intervals=INTRADAY_ACCUMULATION_INTERVALS,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    max_workers=DEFAULT_MAX_WORKERS,
+):
+    """
+    Günün gün içi barlarını yerel depoya ekler.
+
+    Her gün çalıştırıldığında depo yfinance'in 59/729 günlük penceresinin ötesine
+    uzayan kesintisiz bir gün içi geçmiş biriktirir.
+
+    Returns:
+        dict: interval -> (hisse başına sonuç DataFrame'i, toplam süre saniye)
+    """
+    return {
+        interval: refresh_universe(
+            hisseler, interval=interval, chunk_size=chunk_size, max_workers=max_workers
+        )
+        for interval in intervals
+    }
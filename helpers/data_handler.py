@@ -1,16 +1,107 @@
-import pandas_ta as ta
-import yfinance as yf
 import pandas as pd
-import time
+import math
 from datetime import datetime, timedelta
 from json import JSONDecodeError
 import streamlit as st
 import logging
 import traceback
-
-from helpers.exceptions import DataFetchError
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from helpers.exceptions import DataFetchError, NoDataError, RateLimitError
+from helpers import data_store
+from helpers import indicator_kernels as kernels
+from helpers.dtype_policy import compact_frame
+from helpers.indicator_cache import ByteLRUCache
+from helpers import rate_limiter
+from helpers.providers import get_provider
+from helpers import fundamentals
+from helpers.single_flight import SingleFlight, coalesce
+import helpers.database as db
 from constants import HISSE_GRUPPARI
 
+FULL_HISTORY_START = "1990-01-01"
+# Depodaki bir bölüm bu süreden daha yeni yenilendiyse ağa hiç gidilmez.
+STORE_REFRESH_SECONDS = 300
+
+# yfinance'in gün içi aralıklar için geriye dönük sunduğu en uzun süre (gün).
+INTRADAY_HISTORY_DAYS = {"15m": 59, "30m": 59, "60m": 729}
+# BIST sürekli işlem seansı 10:00-18:00; bir seanstaki bar sayısı.
+BARS_PER_SESSION = {"15m": 32, "30m": 16, "60m": 8, "1d": 1}
+
+# Daha kaba zaman aralıkları, yerel depodaki bu ince aralıklardan türetilir.
+RESAMPLE_SOURCES = {"30m": "15m", "60m": "15m", "1wk": "1d", "1mo": "1d"}
+# Gün içi barlar seans açılışına hizalanır; yfinance haftalık barları pazartesiye,
+# aylık barları ayın ilk gününe etiketler.
+BIST_SESSION_OPEN = pd.Timedelta(hours=10)
+_RESAMPLE_RULES = {"30m": "30min", "60m": "60min", "1d": "1D", "1wk": "W-MON", "1mo": "MS"}
+_OHLCV_AGGREGATION = {
+    "open": "first",
+    "high": "max",
+    "low": "min",
+    "close": "last",
+    "adj close": "last",
+    "volume": "sum",
+}
+
+# Her göstergenin görünür aralığın ilk barında doğru değer üretmesi için önceden
+# gereken bar sayısı. Özyinelemeli göstergelerde (EMA, Wilder ortalaması) bu,
+# başlangıç değerinin etkisinin %2'nin altına indiği uzunluktur.
+INDICATOR_WARMUP_BARS = {
+    "EMA KISA (5, 20)": 40,
+    "EMA UZUN (50, 200)": 400,
+    "Bollinger Bantları": 20,
+    "VWAP": 0,
+    "Ichimoku Cloud": 78,
+    "RSI": 60,
+    "StochRSI": 90,
+    "MACD": 80,
+    "ADX": 120,
+    "OBV": 0,
+    "Golden/Death Cross": 400,
+    "Super Trend": 30,
+}
+
+# Anchored VWAP'ın başlatılacağı son dibin aranacağı bar sayısı
+VWAP_SWING_LOOKBACK_BARS = 60
+
+# Teknik özet ve yapay zeka skoru, seçimden bağımsız olarak bu göstergeleri kullanır.
+SUMMARY_INDICATORS = [
+    "EMA KISA (5, 20)",
+    "EMA UZUN (50, 200)",
+    "Bollinger Bantları",
+    "RSI",
+    "StochRSI",
+    "MACD",
+    "ADX",
+    "OBV",
+    "Super Trend",
+]
+
+# calculate_indicators sonuçları girdinin içeriği hash'lenmeden (hisse, aralık, bar
+# aralığı, son bar değerleri, gösterge seti sürümü) anahtarıyla saklanır. Sütunlar
+# veya formüller değiştiğinde INDICATOR_SET_VERSION artırılmalıdır.
+INDICATOR_SET_VERSION = 1
+INDICATOR_CACHE_MAX_BYTES = 256 * 1024 * 1024
+INDICATOR_CACHE = ByteLRUCache(INDICATOR_CACHE_MAX_BYTES)
+
+# Aynı sunucudaki oturumların eş zamanlı özdeş istekleri tek bir yfinance çağrısına iner.
+PRICE_FLIGHT = SingleFlight()
+FUNDAMENTAL_FLIGHT = SingleFlight()
+
+
+def get_coalescing_stats():
+    """Fiyat ve temel veri çağrıları için birleştirme sayaçlarını döndürür."""
+    return {
+        "price": PRICE_FLIGHT.get_stats(),
+        "fundamental": FUNDAMENTAL_FLIGHT.get_stats(),
+        "fundamental_section": fundamentals.SECTION_FLIGHT.get_stats(),
+    }
+
+
+def get_indicator_cache_stats():
+    """Gösterge önbelleğinin isabet/ıskalama/atılma sayaçlarını ve boyutunu döndürür."""
+    return INDICATOR_CACHE.get_stats()
+
 
 def _flatten_columns(df):
     """
@@ -26,16 +117,31 @@ def _flatten_columns(df):
     return df
 
 
+@coalesce(PRICE_FLIGHT)
 def _get_stock_data_native(
-    hisse_kodu, interval, start_date=None, end_date=None, retries=3, delay=5
+    hisse_kodu,
+    interval,
+    start_date=None,
+    end_date=None,
+    retries=3,
+    track_health=True,
 ):
     """
     Belirtilen hisse senedi için yfinance'ten veri çeker.
+
+    Yakın zamanda veri vermeyen semboller (bkz. symbol_health tablosu) ağa hiç
+    gidilmeden DataFetchError ile reddedilir. track_health=False, boş sonucun
+    sembol hatası sayılmaması gereken çağrılar (ör. halka arz öncesi dönem) içindir.
     """
+    track_health = track_health and isinstance(hisse_kodu, str)
+    if track_health and db.is_symbol_blocked(hisse_kodu):
+        raise DataFetchError(
+            f"{hisse_kodu} yakın zamanda veri vermedi, bekleme süresi dolana kadar atlanıyor."
+        )
     print(f"Attempting to fetch data for {hisse_kodu} with interval {interval}")
 
     if start_date is None:
-        start_date = "1990-01-01"
+        start_date = FULL_HISTORY_START
 
     # yfinance includes the start date but excludes the end date, so add a day to include it.
     if end_date is None:
@@ -47,106 +153,392 @@ def _get_stock_data_native(
         end_date = (end_date + timedelta(days=1)).strftime("%Y-%m-%d")
 
 
+    provider = get_provider()
+    last_error = "Boş veri döndü"
+    empty_result = False
     for i in range(retries):
+        provider.acquire(cost=1 if isinstance(hisse_kodu, str) else len(hisse_kodu))
         try:
-            veri = yf.download(
-                hisse_kodu,
-                start=start_date,
-                end=end_date,
-                interval=interval,
-                progress=False,
-                auto_adjust=False,
+            veri = provider.download(
+                hisse_kodu, start=start_date, end=end_date, interval=interval
             )
             if not veri.empty:
-                if isinstance(veri.columns, pd.MultiIndex):
-                    veri.columns = veri.columns.droplevel(1)
-                veri.columns = [col.lower() for col in veri.columns]
-                if veri.index.tz is not None:
-                    veri.index = veri.index.tz_convert("Europe/Istanbul").tz_localize(
-                        None
-                    )
-                return veri
+                rate_limiter.record_success()
+                if track_health:
+                    db.record_symbol_success(hisse_kodu)
+                return data_store.normalize_ohlcv(veri)
+            if rate_limiter.download_throttled(hisse_kodu):
+                raise RateLimitError(f"{hisse_kodu} isteği kısıtlandı (Too Many Requests)")
+            # Boş yanıt geçici bir hata değildir (sembol kaldırılmış veya adı
+            # değişmiş olabilir); tekrar denemek yalnızca süre kaybettirir.
+            last_error = "Boş veri döndü"
+            empty_result = True
+            break
         except JSONDecodeError as e:
+            last_error = e
             print(
                 f"Attempt {i+1}/{retries} failed for {hisse_kodu} with JSONDecodeError: {e}"
             )
-            if i < retries - 1:
-                time.sleep(delay)
         except Exception as e:
+            last_error = e
             print(f"Attempt {i+1}/{retries} failed for {hisse_kodu}: {e}")
-            if i < retries - 1:
-                time.sleep(delay)
-    raise DataFetchError(f"{hisse_kodu} için yfinance'ten veri bulunamadı.")
+        rate_limiter.record_failure(last_error)
+        if i < retries - 1:
+            rate_limiter.wait_before_retry(i)
+    if rate_limiter.is_throttle_error(last_error):
+        # Kısıtlama sembolün suçu değildir; symbol_health'e yazılmaz.
+        raise RateLimitError(f"{hisse_kodu} için veri çekilemedi: {last_error}")
+    if empty_result:
+        if track_health:
+            db.record_symbol_failure(hisse_kodu, "price", last_error)
+        raise NoDataError(f"{hisse_kodu} için yfinance'ten veri bulunamadı.")
+    # Bağlantı hatası veya zaman aşımı sembolün suçu değildir; symbol_health'e yazılmaz.
+    raise DataFetchError(f"{hisse_kodu} için veri çekilemedi: {last_error}")
 
-@st.cache_data(ttl=300)
-def get_stock_data(hisse_kodu, interval, start_date=None, end_date=None):
-    """Cached and error-handled function to fetch stock data."""
-    try:
-        return _get_stock_data_native(
-            hisse_kodu, interval, start_date=start_date, end_date=end_date
-        )
-    except Exception as e:
-        st.error(f"{hisse_kodu} için teknik veriler çekilirken hata oluştu: {e}")
-        logging.error(f"Traceback: {traceback.format_exc()}")
+
+def get_required_indicators(selected_indicators=()):
+    """Grafikte seçilenler ile özet/yapay zeka skorunun ihtiyaç duyduğu göstergeler."""
+    return list(dict.fromkeys(list(selected_indicators) + SUMMARY_INDICATORS))
+
+
+def get_warmup_bars(selected_indicators=()):
+    """Grafikte seçili göstergelerin görünür aralıktan önce ihtiyaç duyduğu en uzun ısınma (bar)."""
+    return max((INDICATOR_WARMUP_BARS.get(i, 0) for i in selected_indicators), default=0)
+
+
+def get_summary_warmup_bars():
+    """
+    Özet göstergelerinin ısınması (bar). Özet ve yapay zeka skoru yalnızca son barı
+    kullandığından bu süre görünür aralığın başından değil, son bardan geriye sayılır.
+    """
+    return max(INDICATOR_WARMUP_BARS.get(i, 0) for i in SUMMARY_INDICATORS)
+
+
+def get_warmup_start(start_date, interval, warmup_bars, earliest=None):
+    """
+    Görünür aralıktan önce warmup_bars kadar bar içerecek takvim başlangıcını tahmin eder.
+
+    Hafta sonları ve resmi tatiller için küçük bir pay bırakılır; gün içi aralıklarda
+    sonuç earliest'tan (varsayılan: yfinance'in sunduğu en eski tarih) geriye gitmez.
+    """
+    start = pd.to_datetime(start_date)
+    if warmup_bars <= 0:
+        return start
+
+    if interval == "1wk":
+        days = warmup_bars * 7
+    elif interval == "1mo":
+        days = warmup_bars * 31
+    else:
+        sessions = math.ceil(warmup_bars / BARS_PER_SESSION.get(interval, 1))
+        # Haftada 5 seans, yılda ~14 tatil günü (~%6).
+        days = math.ceil(sessions * 7 / 5 * 1.06) + 3
+    warmup_start = start - timedelta(days=days)
+
+    if earliest is None:
+        earliest = get_provider_history_start(interval)
+    if earliest is not None:
+        warmup_start = max(warmup_start, min(earliest, start))
+    return warmup_start
+
+
+def get_provider_history_start(interval):
+    """yfinance'in bu aralık için sunduğu en eski tarih; sınırsızsa None."""
+    max_days = INTRADAY_HISTORY_DAYS.get(interval)
+    if max_days is None:
         return None
+    return pd.Timestamp(datetime.today()).normalize() - timedelta(days=max_days)
 
-@st.cache_data
-def calculate_indicators(veri):
-    """Gerekli tüm teknik göstergeleri pandas_ta kullanarak hesaplar."""
-    veri["ema_5"] = ta.ema(close=veri["close"], length=5)
-    veri["ema_20"] = ta.ema(close=veri["close"], length=20)
-    veri["ema_50"] = ta.ema(close=veri["close"], length=50)
-    veri["ema_200"] = ta.ema(close=veri["close"], length=200)
 
-    bbands = ta.bbands(close=veri["close"], length=20)
-    veri["BBL_20_2.0"] = bbands["BBL_20_2.0"]
-    veri["BBM_20_2.0"] = bbands["BBM_20_2.0"]
-    veri["BBU_20_2.0"] = bbands["BBU_20_2.0"]
-    veri["BBW_20_2.0"] = (veri["BBU_20_2.0"] - veri["BBL_20_2.0"]) / veri["BBM_20_2.0"]
+def get_available_history_start(hisse_kodu, interval):
+    """
+    Bir hisse ve aralık için sunulabilecek en eski tarihi döndürür; sınırsızsa None.
 
-    veri["volume_ma_20"] = ta.sma(close=veri["volume"], length=20)
+    Gün içi aralıklarda yerel depoda biriktirilmiş (veya türetilebileceği ince)
+    seri, yfinance penceresinden daha eskiye gidebilir.
+    """
+    earliest = get_provider_history_start(interval)
+    if earliest is None:
+        return None
+    for source in (interval, RESAMPLE_SOURCES.get(interval)):
+        if source is None:
+            continue
+        stored = data_store.read_bars(hisse_kodu, source)
+        if stored is not None and not stored.empty:
+            earliest = min(earliest, _period_start(stored.index.min(), "1d"))
+    return earliest
 
-    veri["rsi_14"] = ta.rsi(close=veri["close"], length=14)
 
-    macd_data = ta.macd(close=veri["close"])
-    veri["macd_12_26_9"] = macd_data["MACD_12_26_9"]
-    veri["macdh_12_26_9"] = macd_data["MACDh_12_26_9"]
-    veri["macds_12_26_9"] = macd_data["MACDs_12_26_9"]
+def resample_ohlcv(veri, interval):
+    """
+    İnce aralıklı OHLCV barlarını daha kaba bir aralığa (30m/60m/1d/1wk/1mo) dönüştürür.
 
-    veri["atr_14"] = ta.atr(
-        high=veri["high"], low=veri["low"], close=veri["close"], length=14
+    Gün içi barlar her gün 10:00 seans açılışından başlayan dilimlere ayrılır; seans
+    dışı (boş) dilimler atılır.
+    """
+    rule = _RESAMPLE_RULES[interval]
+    aggregation = {c: a for c, a in _OHLCV_AGGREGATION.items() if c in veri.columns}
+    if interval == "1wk":
+        resampler = veri.resample(rule, label="left", closed="left")
+    elif interval in ("1d", "1mo"):
+        resampler = veri.resample(rule)
+    else:
+        resampler = veri.resample(rule, origin="start_day", offset=BIST_SESSION_OPEN)
+    return resampler.agg(aggregation).dropna(subset=["close"])
+
+
+def _period_start(ts, interval):
+    """Verilen zamanın içinde bulunduğu kaba barın başlangıcını döndürür."""
+    if interval == "1wk":
+        return (ts - pd.Timedelta(days=ts.dayofweek)).normalize()
+    if interval == "1mo":
+        return ts.normalize().replace(day=1)
+    return ts.normalize()
+
+
+def _get_resampled_from_store(hisse_kodu, interval, start_date=None, end_date=None):
+    """
+    Kaba aralığı, depoda istenen dönemi kapsayan ince seriden türetir.
+
+    Kaynak seri yoksa veya dönemi kapsamıyorsa None döndürür; bu durumda veri
+    doğrudan istenen aralıkta çekilir.
+    """
+    source = RESAMPLE_SOURCES.get(interval)
+    if source is None:
+        return None
+    stored = data_store.read_bars(hisse_kodu, source)
+    if stored is None or stored.empty:
+        return None
+
+    source_start = _period_start(
+        pd.to_datetime(start_date or FULL_HISTORY_START), interval
     )
+    meta = data_store.read_meta(hisse_kodu, source)
+    if pd.to_datetime(meta.get("covered_from", stored.index.min())) > source_start:
+        return None
+
+    fine = _get_stock_data_stored(
+        hisse_kodu, source, start_date=source_start, end_date=end_date
+    )
+    return data_store.slice_bars(resample_ohlcv(fine, interval), start_date, end_date)
+
 
-    adx_data = ta.adx(
-        high=veri["high"], low=veri["low"], close=veri["close"], length=14
+def _get_stock_data_stored(hisse_kodu, interval, start_date=None, end_date=None):
+    """
+    Veriyi önce yerel depodan okur; ağdan yalnızca eksik kısmı çeker.
+
+    - Bölüm yoksa istenen başlangıçtan bugüne kadar olan veri bir kez indirilir.
+    - İstenen başlangıç depodaki kapsamdan eskiyse yalnızca aradaki dönem çekilir.
+    - Aksi halde son kayıtlı bardan (henüz kapanmamış olabileceği için o bar dahil)
+      itibaren yeni barlar çekilip depoya eklenir.
+    """
+    requested_start = pd.to_datetime(start_date or FULL_HISTORY_START)
+    stored = data_store.read_bars(hisse_kodu, interval)
+
+    if stored is None or stored.empty:
+        provider_start = get_provider_history_start(interval)
+        if provider_start is not None:
+            requested_start = max(requested_start, provider_start)
+        stored = _get_stock_data_native(
+            hisse_kodu, interval, start_date=requested_start.strftime("%Y-%m-%d")
+        )
+        stored = data_store.write_bars(hisse_kodu, interval, stored)
+        data_store.update_meta(
+            hisse_kodu, interval, covered_from=requested_start.isoformat()
+        )
+        return data_store.slice_bars(stored, start_date, end_date)
+
+    meta = data_store.read_meta(hisse_kodu, interval)
+    covered_from = pd.to_datetime(meta.get("covered_from", stored.index.min()))
+    provider_start = get_provider_history_start(interval)
+    # Sağlayıcı penceresinden eski dönem ağdan alınamaz; depoda ne varsa o sunulur.
+    backfill_start = (
+        requested_start if provider_start is None else max(requested_start, provider_start)
     )
-    veri["adx_14"] = adx_data["ADX_14"]
-    veri["dmp_14"] = adx_data["DMP_14"]
-    veri["dmn_14"] = adx_data["DMN_14"]
+    if backfill_start < covered_from:
+        covered = True
+        try:
+            eski = _get_stock_data_native(
+                hisse_kodu,
+                interval,
+                start_date=backfill_start.strftime("%Y-%m-%d"),
+                end_date=covered_from.strftime("%Y-%m-%d"),
+                track_health=False,
+            )
+            stored = data_store.append_bars(hisse_kodu, interval, eski)
+        except NoDataError as e:
+            # Hisse bu tarihte henüz işlem görmüyordu; aynı aralık tekrar istenmesin.
+            logging.info(f"{hisse_kodu} için geçmiş tamamlanamadı: {e}")
+        except DataFetchError as e:
+            # Kısıtlama veya geçici ağ hatası: kapsam değişmez, sonraki çağrıda yeniden denenir.
+            covered = False
+            logging.warning(f"{hisse_kodu} için geçmiş şimdilik çekilemedi: {e}")
+        if covered:
+            data_store.update_meta(
+                hisse_kodu, interval, covered_from=requested_start.isoformat()
+            )
+
+    last_ts = stored.index.max()
+    range_is_closed = end_date is not None and pd.to_datetime(end_date) < last_ts.normalize()
+    if not range_is_closed and not data_store.is_fresh(
+        hisse_kodu, interval, STORE_REFRESH_SECONDS
+    ):
+        delta_start = last_ts if provider_start is None else max(last_ts, provider_start)
+        try:
+            yeni = _get_stock_data_native(
+                hisse_kodu, interval, start_date=delta_start.strftime("%Y-%m-%d")
+            )
+            stored = data_store.append_bars(hisse_kodu, interval, yeni)
+        except DataFetchError as e:
+            logging.warning(
+                f"{hisse_kodu} için yeni barlar çekilemedi, depodaki veri kullanılıyor: {e}"
+            )
+        data_store.update_meta(hisse_kodu, interval)
+
+    return data_store.slice_bars(stored, start_date, end_date)
+
 
-    veri["obv"] = ta.obv(close=veri["close"], volume=veri["volume"])
+@st.cache_data(ttl=300)
+def get_stock_data(hisse_kodu, interval, start_date=None, end_date=None):
+    """Cached and error-handled function to fetch stock data."""
+    try:
+        if isinstance(hisse_kodu, str):
+            veri = _get_resampled_from_store(
+                hisse_kodu, interval, start_date=start_date, end_date=end_date
+            )
+            if veri is None:
+                veri = _get_stock_data_stored(
+                    hisse_kodu, interval, start_date=start_date, end_date=end_date
+                )
+        else:
+            veri = _get_stock_data_native(
+                hisse_kodu, interval, start_date=start_date, end_date=end_date
+            )
+        # Oturum önbelleğinde tutulan barlar dtype_policy'ye göre küçültülür.
+        return compact_frame(veri)
+    except Exception as e:
+        st.error(f"{hisse_kodu} için teknik veriler çekilirken hata oluştu: {e}")
+        logging.error(f"Traceback: {traceback.format_exc()}")
+        return None
 
-    stochrsi_data = ta.stochrsi(close=veri["close"])
-    veri["STOCHRSIk_14_14_3_3"] = stochrsi_data["STOCHRSIk_14_14_3_3"]
-    veri["STOCHRSId_14_14_3_3"] = stochrsi_data["STOCHRSId_14_14_3_3"]
+def get_stock_data_with_warmup(
+    hisse_kodu, interval, start_date, end_date=None, selected_indicators=()
+):
+    """
+    Görünür aralığı, göstergelerin ihtiyaç duyduğu ısınma barlarıyla birlikte çeker.
 
-    supertrend_data = ta.supertrend(
-        high=veri["high"], low=veri["low"], close=veri["close"], length=7, multiplier=3
+    Dönen veri start_date'ten önce seçili göstergelerin ısınması kadar bar içerir;
+    ayrıca son bardan geriye özet göstergelerinin ısınması kadar bar bulunur. Görünür
+    aralık bundan uzunsa özet için ek bar çekilmez. Göstergeler hesaplandıktan sonra
+    filter_data_by_date ile görünür aralığa kesilmelidir.
+    """
+    warmup_bars = get_warmup_bars(selected_indicators)
+    summary_bars = get_summary_warmup_bars()
+    earliest = get_available_history_start(hisse_kodu, interval)
+    fetch_start = min(
+        get_warmup_start(start_date, interval, warmup_bars, earliest),
+        get_warmup_start(
+            end_date if end_date is not None else datetime.today(),
+            interval,
+            summary_bars,
+            earliest,
+        ),
     )
-    if supertrend_data is not None and not supertrend_data.empty:
-        veri = veri.join(supertrend_data)
+    veri = get_stock_data(hisse_kodu, interval, start_date=fetch_start, end_date=end_date)
+    if veri is None or veri.empty:
+        return veri
+    first_visible = veri.index.searchsorted(pd.to_datetime(start_date))
+    first = min(first_visible - warmup_bars, len(veri) - 1 - summary_bars)
+    return veri.iloc[max(first, 0) :]
+
 
-    ichimoku_data, _ = ta.ichimoku(
-        high=veri["high"], low=veri["low"], close=veri["close"]
+def _indicator_cache_key(veri, hisse_kodu, interval):
+    """
+    Bar aralığı ve son barın değerleri anahtara girer: gün içinde güncellenen son
+    bar (aynı zaman damgası, farklı kapanış) eski sonucu döndürmez.
+    """
+    son_bar = tuple(veri[c].iloc[-1] for c in ("open", "high", "low", "close", "volume"))
+    return (
+        hisse_kodu,
+        interval,
+        INDICATOR_SET_VERSION,
+        len(veri),
+        veri.index[0],
+        veri.index[-1],
+        son_bar,
     )
-    if ichimoku_data is not None and not ichimoku_data.empty:
-        veri = veri.join(ichimoku_data)
 
-    veri["typical_price"] = (veri["high"] + veri["low"] + veri["close"]) / 3
-    veri["tp_volume"] = veri["typical_price"] * veri["volume"]
-    veri["cum_tp_volume"] = veri.groupby(veri.index.date)["tp_volume"].cumsum()
-    veri["cum_volume"] = veri.groupby(veri.index.date)["volume"].cumsum()
-    veri["vwap_d"] = veri["cum_tp_volume"] / veri["cum_volume"]
+
+def calculate_indicators(veri, hisse_kodu=None, interval=None):
+    """
+    Gerekli tüm teknik göstergeleri hesaplar.
+
+    hisse_kodu ve interval verilirse sonuç INDICATOR_CACHE'ten döner (her çağrıya
+    ayrı bir kopya); verilmezse her seferinde yeniden hesaplanır.
+    """
+    if hisse_kodu is None or interval is None or veri.empty:
+        return _calculate_indicators(veri)
+    key = _indicator_cache_key(veri, hisse_kodu, interval)
+    sonuc = INDICATOR_CACHE.get(key)
+    if sonuc is None:
+        sonuc = _calculate_indicators(veri.copy())
+        INDICATOR_CACHE.put(key, sonuc)
+    return sonuc.copy()
+
+
+def _calculate_indicators(veri):
+    """Gerekli tüm teknik göstergeleri NumPy çekirdekleriyle (pandas_ta formülleri) hesaplar."""
+    high = veri["high"].to_numpy(dtype=float)
+    low = veri["low"].to_numpy(dtype=float)
+    close = veri["close"].to_numpy(dtype=float)
+    volume = veri["volume"].to_numpy(dtype=float)
+
+    for length in (5, 20, 50, 200):
+        veri[f"ema_{length}"] = kernels.ema(close, length)
+
+    (
+        veri["bbl_20_2.0"],
+        veri["bbm_20_2.0"],
+        veri["bbu_20_2.0"],
+        veri["bbw_20_2.0"],
+    ) = kernels.bbands(close, 20, 2.0)
+
+    veri["volume_ma_20"] = kernels.rolling(volume, 20, "mean")
+
+    veri["rsi_14"] = kernels.rsi(close, 14)
+
+    veri["macd_12_26_9"], veri["macdh_12_26_9"], veri["macds_12_26_9"] = kernels.macd(close)
+
+    veri["atr_14"] = kernels.atr(high, low, close, 14)
+
+    veri["adx_14"], veri["dmp_14"], veri["dmn_14"] = kernels.adx(high, low, close, 14)
+
+    veri["obv"] = kernels.obv(close, volume)
+
+    veri["stochrsik_14_14_3_3"], veri["stochrsid_14_14_3_3"] = kernels.stochrsi(close)
+
+    (
+        veri["supert_7_3.0"],
+        veri["supertd_7_3.0"],
+        veri["supertl_7_3.0"],
+        veri["superts_7_3.0"],
+    ) = kernels.supertrend(high, low, close, 7, 3.0)
+
+    (
+        veri["isa_9"],
+        veri["isb_26"],
+        veri["its_9"],
+        veri["iks_26"],
+        veri["ics_26"],
+    ) = kernels.ichimoku(high, low, close)
+
+    (
+        veri["typical_price"],
+        veri["tp_volume"],
+        veri["cum_tp_volume"],
+        veri["cum_volume"],
+        veri["vwap_d"],
+    ) = kernels.session_vwap(high, low, close, volume, kernels.day_codes(veri.index))
 
     veri = _flatten_columns(veri)
     veri.columns = [col.lower() for col in veri.columns]
@@ -158,6 +550,41 @@ def calculate_indicators(veri):
     veri["death_cross"] = (ema50.shift(1) > ema200.shift(1)) & (ema50 < ema200)
 
     # veri = veri.dropna()
+    return compact_frame(veri)
+
+
+def get_vwap_anchors(veri, swing_lookback=VWAP_SWING_LOOKBACK_BARS):
+    """Anchored VWAP için varsayılan başlangıçlar: son dip ve (varsa) son golden cross."""
+    anchors = {}
+    if veri.empty:
+        return anchors
+    anchors["swing_low"] = veri["low"].iloc[-swing_lookback:].idxmin()
+    if "golden_cross" in veri.columns and veri["golden_cross"].any():
+        anchors["golden_cross"] = veri.index[veri["golden_cross"].to_numpy(dtype=bool)][-1]
+    return anchors
+
+
+def add_anchored_vwap(veri, anchors):
+    """
+    anchors sözlüğündeki (ad -> tarih) her başlangıç için avwap_<ad> sütunu ekler;
+    örn. {"bilanco": "2024-05-10"}. Tarih iki bar arasına düşerse sonraki bar kullanılır.
+    """
+    anchors = {name: ts for name, ts in anchors.items() if ts is not None}
+    if veri.empty or not anchors:
+        return veri
+    positions = veri.index.searchsorted(pd.to_datetime(list(anchors.values())))
+    selected = [(name, pos) for name, pos in zip(anchors, positions) if pos < len(veri)]
+    if not selected:
+        return veri
+    values = kernels.anchored_vwap(
+        veri["high"].to_numpy(dtype=float),
+        veri["low"].to_numpy(dtype=float),
+        veri["close"].to_numpy(dtype=float),
+        veri["volume"].to_numpy(dtype=float),
+        [pos for _, pos in selected],
+    )
+    for i, (name, _) in enumerate(selected):
+        veri[f"avwap_{name}"] = values[:, i]
     return veri
 
 
@@ -175,41 +602,47 @@ def convert_dataframe_for_streamlit(df):
     return df
 
 
-def _get_fundamental_data_native(hisse_kodu, retries=3, delay=5):
-    """Hisse senedi için temel verileri ve finansal tabloları çeker."""
-    for i in range(retries):
-        try:
-            stock = yf.Ticker(hisse_kodu)
-            info = stock.info
-            if not info or info.get("quoteType") != "EQUITY":
-                raise DataFetchError(
-                    f"{hisse_kodu} için temel veri bilgisi (info) alınamadı veya hisse senedi değil."
-                )
+@coalesce(FUNDAMENTAL_FLIGHT)
+def _get_fundamental_data_native(hisse_kodu):
+    """
+    Hisse senedi için temel verileri döndürür.
 
-            financials = stock.financials
-            balance_sheet = stock.balance_sheet
-            cashflow = stock.cashflow
-            dividends = stock.dividends
-            actions = stock.actions
-
-            return {
-                "info": info,
-                "financials": financials,
-                "balance_sheet": balance_sheet,
-                "cashflow": cashflow,
-                "dividends": dividends,
-                "actions": actions,
-            }
-        except Exception as e:
-            print(
-                f"Attempt {i+1}/{retries} for fundamental data of {hisse_kodu} failed: {e}"
-            )
-            if i < retries - 1:
-                time.sleep(delay)
-    raise DataFetchError(f"{hisse_kodu} için temel veriler çekilemedi.")
+    Yalnızca info hemen yüklenir (hisse olmayan semboller burada elenir); finansal
+    tablolar, temettüler ve kurumsal işlemler ilk erişildiklerinde ayrı ayrı çekilir.
+    """
+    data = fundamentals.LazyFundamentals(hisse_kodu)
+    data["info"]
+    return data
+
+
+# Karşılaştırma sayfasında aynı anda çekilen en fazla hisse sayısı; istekler yine de
+# ortak hız sınırlayıcıdan geçer.
+FUNDAMENTAL_MAX_WORKERS = 8
 
 
-@st.cache_data(ttl=86400) # Cache for a day
+def iter_fundamental_info(hisse_kodlari, max_workers=FUNDAMENTAL_MAX_WORKERS):
+    """
+    Hisselerin info verisini sınırlı bir havuzda paralel çeker.
+
+    Sonuçlar tamamlandıkça (hisse_kodu, info, hata) olarak üretilir; böylece arayüz
+    en yavaş isteği beklemeden tabloyu doldurmaya başlayabilir.
+    """
+    if not hisse_kodlari:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(hisse_kodlari))) as executor:
+        futures = {
+            executor.submit(_get_fundamental_data_native, hisse): hisse
+            for hisse in hisse_kodlari
+        }
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()["info"], None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+# Bölümlerin kendi disk önbellekleri ve TTL'leri vardır; burada yalnızca nesne paylaşılır.
+@st.cache_resource(ttl=3600)
 def get_fundamental_data(hisse_kodu):
     """Cached and error-handled function to fetch fundamental data."""
     try:
@@ -233,84 +666,59 @@ def filter_data_by_date(veri, time_delta=None, start_date=None, end_date=None):
     return veri
 
 
-def get_sector_peers(hisse_kodu, retries=3, delay=2):
-    """Bir hissenin sektörünü ve sektördeki benzer şirketleri bulur."""
-    for i in range(retries):
-        try:
-            stock = yf.Ticker(hisse_kodu)
-            info = stock.info
-            if not info:
-                print(f"Sektör bilgisi {hisse_kodu} için bulunamadı.")
-                return None, None
-            sector = info.get("sector")
-            if not sector:
-                print(f"Sektör bilgisi {hisse_kodu} için bulunamadı.")
-                return None, None
-
-            bist100 = HISSE_GRUPPARI["BIST 100 Hisseleri"]
-
-            peers = []
-            for peer_ticker in bist100:
-                if peer_ticker != hisse_kodu.split(".")[0]:
-                    try:
-                        peer_info = yf.Ticker(f"{peer_ticker}.IS").info
-                        time.sleep(0.2)
-                        if peer_info and peer_info.get("sector") == sector:
-                            peers.append(peer_ticker)
-                    except Exception:
-                        print(f"Peer {peer_ticker} için bilgi alınamadı, atlanıyor.")
-                        continue
-            return sector, peers
-        except Exception as e:
-            print(
-                f"Attempt {i+1}/{retries} for sector peers of {hisse_kodu} failed: {e}"
-            )
-            if i < retries - 1:
-                time.sleep(delay)
-    print(f"Sektör verileri {hisse_kodu} için tüm denemelerden sonra çekilemedi.")
-    return None, None
-
+# symbol_master sütunu -> sektör karşılaştırma tablosundaki oran adı
+SECTOR_RATIO_COLUMNS = {
+    "trailing_pe": "F/K",
+    "price_to_book": "PD/DD",
+    "profit_margins": "Kâr Marjı",
+    "ebitda_margins": "FAVÖK Marjı",
+    "debt_to_equity": "Borç/Özkaynak",
+}
 
-@st.cache_data(ttl=86400)
-def get_sector_comparison_data(hisse_kodu):
-    """Fetches key ratios for sector peers and calculates the average."""
-    sector, peers = get_sector_peers(hisse_kodu)
-    if not sector or not peers:
-        return sector, None
 
-    peer_ratios = []
-    peers_to_process = peers[:15]
+def _sector_members(hisse_kodu):
+    """
+    Hissenin sektörünü ve sembol ana tablosundaki BIST 100 sektör üyelerini döndürür.
 
-    progress_bar = st.progress(
-        0, text=f"{sector} sektörü için benzer şirket verileri toplanıyor..."
+    Yalnızca yerel tabloyu okur; sayfa çizilirken sağlayıcıya gidilmez. Tablo
+    universe_updater.py --master ile yenilenir.
+    """
+    kod = hisse_kodu.split(".")[0]
+    bist100 = HISSE_GRUPPARI["BIST 100 Hisseleri"]
+    record = db.get_symbol_master_record(f"{kod}.IS")
+    if record is None or not record["sector"]:
+        print(
+            f"Sektör bilgisi {hisse_kodu} için sembol ana tablosunda yok "
+            "(universe_updater.py --master ile doldurulabilir)."
+        )
+        return None, None
+    members = db.get_symbols_by_sector(
+        record["sector"], [f"{p}.IS" for p in bist100 if p != kod]
     )
+    return record["sector"], members
 
-    for i, peer_ticker in enumerate(peers_to_process):
-        try:
-            peer_info = yf.Ticker(f"{peer_ticker}.IS").info
-            ratios = {
-                "Hisse": peer_ticker,
-                "F/K": peer_info.get("trailingPE"),
-                "PD/DD": peer_info.get("priceToBook"),
-                "Kâr Marjı": peer_info.get("profitMargins"),
-                "FAVÖK Marjı": peer_info.get("ebitdaMargins"),
-                "Borç/Özkaynak": peer_info.get("debtToEquity"),
-            }
-            peer_ratios.append(ratios)
-            time.sleep(0.1)
-        except Exception as e:
-            print(f"Could not fetch data for peer {peer_ticker}: {e}")
-        finally:
-            progress_bar.progress(
-                (i + 1) / len(peers_to_process), text=f"{peer_ticker} verisi işlendi..."
-            )
 
-    progress_bar.empty()
+def get_sector_peers(hisse_kodu):
+    """Bir hissenin sektörünü ve sektördeki benzer şirketleri bulur."""
+    sector, members = _sector_members(hisse_kodu)
+    if sector is None:
+        return None, None
+    member_set = set(members["symbol"])
+    peers = [
+        p for p in HISSE_GRUPPARI["BIST 100 Hisseleri"] if f"{p}.IS" in member_set
+    ]
+    return sector, peers
 
-    if not peer_ratios:
+
+def get_sector_comparison_data(hisse_kodu):
+    """Sektördeki benzer şirketlerin temel oranlarının ortalamasını döndürür."""
+    sector, members = _sector_members(hisse_kodu)
+    if sector is None or members.empty:
         return sector, None
 
-    df = pd.DataFrame(peer_ratios).set_index("Hisse")
+    df = members.set_index("symbol")[list(SECTOR_RATIO_COLUMNS)].rename(
+        columns=SECTOR_RATIO_COLUMNS
+    )
     for col in df.columns:
         df[col] = pd.to_numeric(df[col], errors="coerce")
 
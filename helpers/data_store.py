@@ -0,0 +1,178 @@
+import contextlib
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import pandas as pd
+
+# Hisse x zaman aralığı bölümleri: market_data/<interval>/<hisse>.parquet
+DATA_STORE_DIR = "market_data"
+
+
+def _partition_path(hisse_kodu, interval):
+    """Bir hisse ve zaman aralığı için Parquet dosyasının yolunu döndürür."""
+    return os.path.join(DATA_STORE_DIR, interval, f"{hisse_kodu}.parquet")
+
+
+def _meta_path(hisse_kodu, interval):
+    """Bölümün meta verilerini (kapsam, son yenileme) tutan dosyanın yolu."""
+    return os.path.join(DATA_STORE_DIR, interval, f"{hisse_kodu}.meta.json")
+
+
+def _atomic_replace(path, write_func):
+    """Dosyayı önce geçici bir isme yazar, sonra tek adımda yerine koyar.
+
+    Aynı bölüme yazan ikinci bir süreç yarım kalmış bir dosya göremez.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write_func(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# Aynı süreçteki iş parçacıkları için bölüm başına kilit; süreçler arası dışlama
+# bölümün yanındaki .lock dosyası üzerinden yapılır.
+_partition_locks_guard = threading.Lock()
+_partition_locks = {}
+
+
+def _lock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            # LK_LOCK yaklaşık 10 sn denedikten sonra vazgeçer; kilit bırakılana kadar beklenir.
+            continue
+
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextlib.contextmanager
+def _partition_lock(hisse_kodu, interval):
+    """Bölümün oku-birleştir-yaz adımlarını diğer iş parçacıkları ve süreçlerden korur."""
+    path = _partition_path(hisse_kodu, interval)
+    with _partition_locks_guard:
+        lock = _partition_locks.setdefault(path, threading.Lock())
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with lock, open(f"{path}.lock", "a+b") as f:
+        _lock_file(f)
+        try:
+            yield
+        finally:
+            _unlock_file(f)
+
+
+def normalize_ohlcv(veri):
+    """yfinance çıktısını depodaki biçime getirir (küçük harfli sütunlar, İstanbul saati)."""
+    if isinstance(veri.columns, pd.MultiIndex):
+        veri.columns = veri.columns.droplevel(1)
+    veri.columns = [col.lower() for col in veri.columns]
+    if isinstance(veri.index, pd.DatetimeIndex) and veri.index.tz is not None:
+        veri.index = veri.index.tz_convert("Europe/Istanbul").tz_localize(None)
+    return veri
+
+
+def read_bars(hisse_kodu, interval, start_date=None, end_date=None):
+    """Depodaki barları okur; bölüm yoksa None döndürür.
+
+    end_date gün olarak dahildir (yfinance çağrılarıyla aynı anlam).
+    """
+    path = _partition_path(hisse_kodu, interval)
+    if not os.path.exists(path):
+        return None
+    return slice_bars(pd.read_parquet(path), start_date, end_date)
+
+
+def slice_bars(veri, start_date=None, end_date=None):
+    """Barları [start_date, end_date] aralığına göre keser; end_date gün olarak dahildir."""
+    if start_date is not None:
+        veri = veri[veri.index >= pd.to_datetime(start_date)]
+    if end_date is not None:
+        end_ts = pd.to_datetime(end_date).normalize() + pd.Timedelta(days=1)
+        veri = veri[veri.index < end_ts]
+    return veri
+
+
+def _write_bars(hisse_kodu, interval, veri):
+    veri = veri[~veri.index.duplicated(keep="last")].sort_index()
+    _atomic_replace(
+        _partition_path(hisse_kodu, interval), lambda p: veri.to_parquet(p)
+    )
+    return veri
+
+
+def write_bars(hisse_kodu, interval, veri):
+    """Bölümü verilen barlarla tamamen değiştirir."""
+    with _partition_lock(hisse_kodu, interval):
+        return _write_bars(hisse_kodu, interval, veri)
+
+
+def append_bars(hisse_kodu, interval, yeni_veri):
+    """
+    Yeni barları mevcut bölümle birleştirir; çakışan zamanlarda yeni bar kazanır.
+
+    Okuma ve yazma bölüm kilidi altında yapılır; aynı bölüme eşzamanlı eklemeler
+    birbirinin barlarını silmez.
+    """
+    with _partition_lock(hisse_kodu, interval):
+        mevcut = read_bars(hisse_kodu, interval)
+        if mevcut is not None and not mevcut.empty:
+            yeni_veri = pd.concat([mevcut, yeni_veri])
+        return _write_bars(hisse_kodu, interval, yeni_veri)
+
+
+def get_last_timestamp(hisse_kodu, interval):
+    """Depodaki son barın zamanını döndürür; bölüm boşsa None."""
+    veri = read_bars(hisse_kodu, interval)
+    if veri is None or veri.empty:
+        return None
+    return veri.index.max()
+
+
+def read_meta(hisse_kodu, interval):
+    """Bölümün meta verisini okur."""
+    path = _meta_path(hisse_kodu, interval)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def update_meta(hisse_kodu, interval, **values):
+    """Meta veriyi günceller ve 'refreshed_at' alanını şimdiki zamana ayarlar."""
+    meta = read_meta(hisse_kodu, interval)
+    meta.update(values)
+    meta["refreshed_at"] = time.time()
+
+    def _write(path):
+        with open(path, "w") as f:
+            json.dump(meta, f)
+
+    _atomic_replace(_meta_path(hisse_kodu, interval), _write)
+    return meta
+
+
+def is_fresh(hisse_kodu, interval, max_age_seconds):
+    """Bölüm son max_age_seconds içinde ağdan yenilendiyse True döndürür."""
+    refreshed_at = read_meta(hisse_kodu, interval).get("refreshed_at")
+    return refreshed_at is not None and time.time() - refreshed_at < max_age_seconds
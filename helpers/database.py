@@ -1,10 +1,15 @@
 import sqlite3
+import time
 import pandas as pd
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 
 DB_FILE = "portfolio.db"
 
+# Veri vermeyen semboller için bekleme süresi her hatada ikiye katlanır.
+SYMBOL_BACKOFF_BASE_SECONDS = 15 * 60
+SYMBOL_BACKOFF_MAX_SECONDS = 7 * 24 * 60 * 60
+
 
 def get_db_connection():
     """Veritabanı bağlantısı oluşturur."""
@@ -51,6 +56,81 @@ def init_db():
         )
         """
     )
+    # Sembol sağlık tablosu (başarısız veri çekme denemeleri)
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS symbol_health (
+            symbol TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            failures INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            last_failure TIMESTAMP,
+            retry_after TIMESTAMP NOT NULL,
+            PRIMARY KEY (symbol, kind)
+        )
+        """
+    )
+    # Sembol ana tablosu (sektör, endüstri ve temel oranlar)
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS symbol_master (
+            symbol TEXT PRIMARY KEY,
+            name TEXT,
+            sector TEXT,
+            industry TEXT,
+            trailing_pe REAL,
+            price_to_book REAL,
+            profit_margins REAL,
+            ebitda_margins REAL,
+            debt_to_equity REAL,
+            market_cap REAL,
+            updated_at TIMESTAMP NOT NULL
+        )
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_symbol_master_sector ON symbol_master (sector)"
+    )
+    # Kesişim olayları dizini (golden cross, MACD kesişimi, SuperTrend dönüşü vb.)
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS indicator_events (
+            symbol TEXT NOT NULL,
+            interval TEXT NOT NULL,
+            ts TEXT NOT NULL,
+            event TEXT NOT NULL,
+            price REAL,
+            PRIMARY KEY (symbol, interval, ts, event)
+        )
+        """
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_indicator_events_time ON indicator_events (interval, ts)"
+    )
+    # Her hisse ve aralık için olay dizinine işlenmiş son kapanmış bar
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS indicator_event_watermarks (
+            symbol TEXT NOT NULL,
+            interval TEXT NOT NULL,
+            last_ts TEXT NOT NULL,
+            PRIMARY KEY (symbol, interval)
+        )
+        """
+    )
+    # Süreçler arası paylaşılan istek kovası ve devre kesici durumu
+    cursor.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rate_limit_state (
+            name TEXT PRIMARY KEY,
+            tokens REAL NOT NULL,
+            rate REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            throttles INTEGER NOT NULL DEFAULT 0,
+            open_until REAL NOT NULL DEFAULT 0
+        )
+        """
+    )
     conn.commit()
     conn.close()
 
@@ -149,3 +229,300 @@ def delete_alarm(alarm_id):
     cursor.execute("DELETE FROM alarms WHERE id = ?", (alarm_id,))
     conn.commit()
     conn.close()
+
+# --- Sembol Sağlık Fonksiyonları ---
+
+def record_symbol_failure(symbol, kind="price", error=""):
+    """Bir sembol için başarısız denemeyi kaydeder ve üstel bekleme süresini uzatır."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT failures FROM symbol_health WHERE symbol = ? AND kind = ?", (symbol, kind)
+    )
+    row = cursor.fetchone()
+    failures = (row["failures"] if row else 0) + 1
+    backoff = min(
+        SYMBOL_BACKOFF_BASE_SECONDS * 2 ** (failures - 1), SYMBOL_BACKOFF_MAX_SECONDS
+    )
+    now = datetime.now()
+    cursor.execute(
+        "REPLACE INTO symbol_health (symbol, kind, failures, last_error, last_failure, retry_after) VALUES (?, ?, ?, ?, ?, ?)",
+        (symbol, kind, failures, str(error), now, now + timedelta(seconds=backoff)),
+    )
+    conn.commit()
+    conn.close()
+    return failures
+
+
+def record_symbol_success(symbol, kind="price"):
+    """Başarılı bir denemeden sonra sembolün hata geçmişini temizler."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "DELETE FROM symbol_health WHERE symbol = ? AND kind = ?", (symbol, kind)
+    )
+    conn.commit()
+    conn.close()
+
+
+def is_symbol_blocked(symbol, kind="price"):
+    """Sembol hâlâ bekleme süresi içindeyse True döndürür."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT retry_after FROM symbol_health WHERE symbol = ? AND kind = ?",
+        (symbol, kind),
+    )
+    row = cursor.fetchone()
+    conn.close()
+    return row is not None and row["retry_after"] > datetime.now()
+
+
+def get_blocked_symbols(kind="price"):
+    """Bekleme süresi dolmamış tüm sembolleri bir küme olarak döndürür."""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT symbol FROM symbol_health WHERE kind = ? AND retry_after > ?",
+        (kind, datetime.now()),
+    )
+    symbols = {row["symbol"] for row in cursor.fetchall()}
+    conn.close()
+    return symbols
+
+
+def get_symbol_health():
+    """Tüm sembol sağlık kayıtlarını bir DataFrame olarak döndürür."""
+    conn = get_db_connection()
+    df = pd.read_sql_query(
+        "SELECT * FROM symbol_health ORDER BY retry_after DESC", conn
+    )
+    conn.close()
+    return df
+
+
+# --- Sembol Ana Tablosu Fonksiyonları ---
+
+SYMBOL_MASTER_COLUMNS = [
+    "symbol",
+    "name",
+    "sector",
+    "industry",
+    "trailing_pe",
+    "price_to_book",
+    "profit_margins",
+    "ebitda_margins",
+    "debt_to_equity",
+    "market_cap",
+]
+
+
+def upsert_symbol_master(records):
+    """Sembol kayıtlarını (SYMBOL_MASTER_COLUMNS anahtarlı sözlükler) ekler veya günceller."""
+    now = datetime.now()
+    rows = [
+        tuple(record.get(col) for col in SYMBOL_MASTER_COLUMNS) + (now,) for record in records
+    ]
+    placeholders = ", ".join("?" * (len(SYMBOL_MASTER_COLUMNS) + 1))
+    conn = get_db_connection()
+    conn.executemany(
+        f"REPLACE INTO symbol_master ({', '.join(SYMBOL_MASTER_COLUMNS)}, updated_at) VALUES ({placeholders})",
+        rows,
+    )
+    conn.commit()
+    conn.close()
+
+
+def get_symbol_master_record(symbol):
+    """Tek bir sembolün kaydını sözlük olarak döndürür; yoksa None."""
+    conn = get_db_connection()
+    row = conn.execute(
+        "SELECT * FROM symbol_master WHERE symbol = ?", (symbol,)
+    ).fetchone()
+    conn.close()
+    return dict(row) if row is not None else None
+
+
+def get_symbols_by_sector(sector, symbols=None):
+    """Bir sektördeki sembolleri (isteğe bağlı olarak verilen listeyle sınırlı) DataFrame olarak döndürür."""
+    query = "SELECT * FROM symbol_master WHERE sector = ?"
+    params = [sector]
+    if symbols is not None:
+        symbols = list(symbols)
+        query += f" AND symbol IN ({', '.join('?' * len(symbols))})"
+        params += symbols
+    conn = get_db_connection()
+    df = pd.read_sql_query(query + " ORDER BY symbol", conn, params=params)
+    conn.close()
+    return df
+
+
+# --- İstek Sınırlama Fonksiyonları ---
+# Tüm süreçler aynı satırı BEGIN IMMEDIATE ile kilitleyerek günceller; böylece
+# Streamlit iş parçacıkları, alarm kontrolcüsü ve toplu indirici tek bir kovayı paylaşır.
+
+def _locked_rate_limit_row(conn, name, max_rate, burst):
+    """Kovanın satırını yazma kilidi altında okur (yoksa dolu bir kova ile başlatır)."""
+    conn.execute("BEGIN IMMEDIATE")
+    row = conn.execute(
+        "SELECT * FROM rate_limit_state WHERE name = ?", (name,)
+    ).fetchone()
+    if row is None:
+        return {"tokens": float(burst), "rate": float(max_rate), "updated_at": time.time(),
+                "throttles": 0, "open_until": 0.0}
+    return dict(row)
+
+
+def _save_rate_limit_row(conn, name, state):
+    conn.execute(
+        "REPLACE INTO rate_limit_state (name, tokens, rate, updated_at, throttles, open_until) VALUES (?, ?, ?, ?, ?, ?)",
+        (name, state["tokens"], state["rate"], state["updated_at"], state["throttles"], state["open_until"]),
+    )
+    conn.commit()
+
+
+def reserve_rate_limit_tokens(name, cost, max_rate, burst):
+    """
+    Kovadan cost kadar jeton ayırır ve isteğin yapılabilmesi için beklenmesi gereken
+    süreyi (saniye) döndürür. Jeton yoksa borç yazılır; sonraki çağıranlar sıraya girer.
+    """
+    conn = get_db_connection()
+    conn.isolation_level = None
+    try:
+        state = _locked_rate_limit_row(conn, name, max_rate, burst)
+        now = time.time()
+        rate = min(state["rate"], max_rate)
+        tokens = min(burst, state["tokens"] + (now - state["updated_at"]) * rate)
+        wait = max(0.0, (cost - tokens) / rate)
+        state.update(tokens=tokens - cost, updated_at=now)
+        _save_rate_limit_row(conn, name, state)
+        return wait
+    finally:
+        conn.close()
+
+
+def record_rate_limit_throttle(name, max_rate, burst, min_rate, threshold, open_seconds):
+    """
+    Sağlayıcının kısıtlama yanıtını kaydeder: hız yarıya iner, art arda threshold
+    kısıtlamada devre open_seconds boyunca açılır. Devre açıldıysa True döndürür.
+    """
+    conn = get_db_connection()
+    conn.isolation_level = None
+    try:
+        state = _locked_rate_limit_row(conn, name, max_rate, burst)
+        state["rate"] = max(min_rate, state["rate"] / 2)
+        state["throttles"] += 1
+        opened = state["throttles"] >= threshold
+        if opened:
+            state["open_until"] = time.time() + open_seconds
+            state["throttles"] = 0
+        _save_rate_limit_row(conn, name, state)
+        return opened
+    finally:
+        conn.close()
+
+
+def record_rate_limit_success(name, max_rate, burst, rate_step):
+    """Başarılı bir istekten sonra kısıtlama sayacını sıfırlar ve hızı kademeli artırır."""
+    current = get_rate_limit_state(name)
+    # Olağan durumda (kısıtlama yok, tam hız) yazma kilidi hiç alınmaz.
+    if current is None or (current["throttles"] == 0 and current["rate"] >= max_rate):
+        return
+    conn = get_db_connection()
+    conn.isolation_level = None
+    try:
+        state = _locked_rate_limit_row(conn, name, max_rate, burst)
+        state["throttles"] = 0
+        state["rate"] = min(max_rate, state["rate"] + rate_step)
+        _save_rate_limit_row(conn, name, state)
+    finally:
+        conn.close()
+
+
+def get_rate_limit_state(name):
+    """Kovanın güncel durumunu sözlük olarak döndürür; hiç kullanılmadıysa None."""
+    conn = get_db_connection()
+    row = conn.execute(
+        "SELECT * FROM rate_limit_state WHERE name = ?", (name,)
+    ).fetchone()
+    conn.close()
+    return dict(row) if row is not None else None
+
+
+def _ts_text(ts):
+    """Zaman damgasını olay tablolarında sıralanabilir metin olarak saklar."""
+    return pd.Timestamp(ts).isoformat(sep=" ")
+
+
+def replace_indicator_events(interval, events, ranges):
+    """
+    ranges'teki her hisse için (başlangıç, son bar) aralığındaki olayları siler, events'teki
+    (symbol, ts, event, price) kayıtlarını ekler ve işlenen son barı kaydeder. Başlangıç
+    None ise hissenin tüm olayları silinir. Tek işlemde yapılır.
+    """
+    conn = get_db_connection()
+    try:
+        with conn:
+            for symbol, (since, last_ts) in ranges.items():
+                if since is None:
+                    conn.execute(
+                        "DELETE FROM indicator_events WHERE symbol = ? AND interval = ?",
+                        (symbol, interval),
+                    )
+                else:
+                    conn.execute(
+                        "DELETE FROM indicator_events WHERE symbol = ? AND interval = ? AND ts >= ?",
+                        (symbol, interval, _ts_text(since)),
+                    )
+                conn.execute(
+                    "REPLACE INTO indicator_event_watermarks (symbol, interval, last_ts) VALUES (?, ?, ?)",
+                    (symbol, interval, _ts_text(last_ts)),
+                )
+            conn.executemany(
+                "REPLACE INTO indicator_events (symbol, interval, ts, event, price) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (row.symbol, interval, _ts_text(row.ts), row.event, float(row.price))
+                    for row in events.itertuples(index=False)
+                ],
+            )
+    finally:
+        conn.close()
+
+
+def get_indicator_event_watermarks(interval, symbols=None):
+    """{hisse: olay dizinine işlenmiş son bar} sözlüğünü döndürür."""
+    query = "SELECT symbol, last_ts FROM indicator_event_watermarks WHERE interval = ?"
+    params = [interval]
+    if symbols is not None:
+        symbols = list(symbols)
+        query += f" AND symbol IN ({', '.join('?' * len(symbols))})"
+        params += symbols
+    conn = get_db_connection()
+    rows = conn.execute(query, params).fetchall()
+    conn.close()
+    return {row["symbol"]: pd.Timestamp(row["last_ts"]) for row in rows}
+
+
+def get_indicator_events(interval, symbols=None, start=None, end=None, event_types=None):
+    """
+    Olayları [start, end) aralığında, isteğe bağlı hisse ve olay türü süzgeciyle
+    (symbol, ts, event, price) DataFrame'i olarak zamana göre sıralı döndürür.
+    """
+    query = "SELECT symbol, ts, event, price FROM indicator_events WHERE interval = ?"
+    params = [interval]
+    if start is not None:
+        query += " AND ts >= ?"
+        params.append(_ts_text(start))
+    if end is not None:
+        query += " AND ts < ?"
+        params.append(_ts_text(end))
+    for column, values in (("symbol", symbols), ("event", event_types)):
+        if values is not None:
+            values = list(values)
+            query += f" AND {column} IN ({', '.join('?' * len(values))})"
+            params += values
+    conn = get_db_connection()
+    df = pd.read_sql_query(query + " ORDER BY ts, symbol", conn, params=params)
+    conn.close()
+    df["ts"] = pd.to_datetime(df["ts"])
+    return df
@@ -0,0 +1,59 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Bellekte tutulan fiyat ve gösterge tablolarının veri tipleri.
+#   "compact": göstergeler float32, hacim tamsayı, sinyal bayrakları bool, SuperTrend
+#              yönü int8 (hisse başına bellek %40'tan fazla azalır)
+#   "full":    pandas varsayılanları (float64)
+# Göstergeler her iki durumda da float64 hesaplanır; yalnızca saklanan ve döndürülen
+# tablolar küçültülür. BORSA_DTYPE_POLICY ortam değişkeniyle seçilir.
+DTYPE_POLICY = os.environ.get("BORSA_DTYPE_POLICY", "compact")
+
+# OHLC float64 kalır: alarm, tarama ve portföy hesapları fiyatı kullanıcının girdiği
+# float64 eşiklerle doğrudan karşılaştırır; np.float32(123.45) >= 123.45 yanlıştır.
+PRICE_COLUMNS = ("open", "high", "low", "close", "adj close")
+FLAG_COLUMNS = ("golden_cross", "death_cross")
+VOLUME_COLUMNS = ("volume",)
+DIRECTION_COLUMNS = ("supertd_7_3.0",)
+
+
+def _volume_dtype(column):
+    """Hacim boşluksuz ve tam sayıysa int64, değilse float32."""
+    values = column.to_numpy()
+    if column.isna().any() or not np.array_equal(values, np.round(values)):
+        return np.float32
+    return np.int64
+
+
+def compact_dtypes(veri, policy=None):
+    """Politikaya göre sütun -> hedef veri tipi eşlemesi (değişmeyecek sütunlar hariç)."""
+    if (policy or DTYPE_POLICY) != "compact":
+        return {}
+    dtypes = {}
+    for column, dtype in veri.dtypes.items():
+        name = column[0] if isinstance(column, tuple) else column
+        if name in PRICE_COLUMNS:
+            continue
+        if name in FLAG_COLUMNS:
+            target = np.bool_
+        elif name in VOLUME_COLUMNS and dtype.kind in "fiu":
+            target = _volume_dtype(veri[column])
+        elif name in DIRECTION_COLUMNS and dtype.kind in "iu":
+            target = np.int8
+        elif dtype == np.float64:
+            target = np.float32
+        else:
+            continue
+        if dtype != target:
+            dtypes[column] = target
+    return dtypes
+
+
+def compact_frame(veri, policy=None):
+    """Fiyat/gösterge tablosunu politikadaki veri tiplerine dönüştürür; gerekmiyorsa aynen döndürür."""
+    if not isinstance(veri, pd.DataFrame):
+        return veri
+    dtypes = compact_dtypes(veri, policy)
+    return veri.astype(dtypes) if dtypes else veri
@@ -0,0 +1,199 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import helpers.database as db
+from helpers import data_store
+from helpers import indicator_engine
+from helpers import indicator_panel
+from helpers.data_handler import calculate_indicators
+
+# Kesişim olayları dizini. Golden/death cross, kısa EMA ve MACD kesişimleri,
+# SuperTrend dönüşleri ve RSI eşik geçişleri (hisse, zaman, olay) kayıtları olarak
+# veritabanında tutulur. Dizin panelden toplu kurulur, yeni barlar geldikçe yalnızca
+# işlenmemiş kapanmış barlarla genişletilir; bunların göstergeleri gösterge motorunun
+# saklanan durumundan devam edilerek hesaplanır. Henüz kapanmamış son bar dizine yazılmaz.
+
+# Olay -> (kural, a, b). "cross_up": a önceki barda b'nin altındaydı, bu barda üstünde.
+EVENT_RULES = {
+    "golden_cross": ("cross_up", "ema_50", "ema_200"),
+    "death_cross": ("cross_down", "ema_50", "ema_200"),
+    "ema_short_cross_up": ("cross_up", "ema_5", "ema_20"),
+    "ema_short_cross_down": ("cross_down", "ema_5", "ema_20"),
+    "macd_cross_up": ("cross_up", "macd_12_26_9", "macds_12_26_9"),
+    "macd_cross_down": ("cross_down", "macd_12_26_9", "macds_12_26_9"),
+    "supertrend_up": ("cross_up", "supertd_7_3.0", 0),
+    "supertrend_down": ("cross_down", "supertd_7_3.0", 0),
+    "rsi_overbought": ("cross_up", "rsi_14", 70),
+    "rsi_oversold": ("cross_down", "rsi_14", 30),
+}
+# Olayların ihtiyaç duyduğu gösterge grupları (arayüzdeki adlarıyla)
+EVENT_GROUPS = ["EMA KISA (5, 20)", "Golden/Death Cross", "MACD", "Super Trend", "RSI"]
+EVENT_COLUMNS = ["symbol", "ts", "event", "price"]
+# Olay kurallarının okuduğu gösterge sütunları
+EVENT_INPUTS = sorted(
+    {op for _, a, b in EVENT_RULES.values() for op in (a, b) if isinstance(op, str)}
+)
+
+
+def _operand(frame, operand):
+    if isinstance(operand, str):
+        return frame[operand].to_numpy(dtype=float)
+    return float(operand)
+
+
+def detect_events(frame, previous):
+    """
+    frame ve aynı satır düzenindeki bir önceki bar değerlerinden (previous) her olay
+    için bir maske döndürür. Sütunları bulunmayan olaylar atlanır.
+    """
+    masks = {}
+    for event, (rule, a, b) in EVENT_RULES.items():
+        if any(isinstance(op, str) and op not in frame.columns for op in (a, b)):
+            continue
+        cur_a, cur_b = _operand(frame, a), _operand(frame, b)
+        prev_a, prev_b = _operand(previous, a), _operand(previous, b)
+        if rule == "cross_up":
+            masks[event] = (prev_a < prev_b) & (cur_a > cur_b)
+        else:
+            masks[event] = (prev_a > prev_b) & (cur_a < cur_b)
+    return masks
+
+
+def _events_table(symbols, timestamps, close, masks):
+    parts = [
+        pd.DataFrame(
+            {"symbol": symbols[mask], "ts": timestamps[mask], "event": event, "price": close[mask]}
+        )
+        for event, mask in masks.items()
+        if mask.any()
+    ]
+    if not parts:
+        return pd.DataFrame(
+            {"symbol": pd.Series(dtype=object), "ts": pd.Series(dtype="datetime64[ns]"),
+             "event": pd.Series(dtype=object), "price": pd.Series(dtype=float)}
+        )
+    events = pd.concat(parts, ignore_index=True)
+    return events.sort_values(["ts", "symbol"], kind="stable").reset_index(drop=True)
+
+
+def events_from_frame(hisse_kodu, veri):
+    """Tek hissenin gösterge tablosundaki olayları (symbol, ts, event, price) olarak döndürür."""
+    masks = detect_events(veri, veri.shift(1))
+    symbols = np.full(len(veri), hisse_kodu, dtype=object)
+    return _events_table(symbols, veri.index.to_numpy(), veri["close"].to_numpy(dtype=float), masks)
+
+
+def events_from_panel(tidy):
+    """compute_panel çıktısındaki olaylar; her hisse kendi önceki barıyla karşılaştırılır."""
+    columns = [c for c in tidy.columns if c != "volume"]
+    previous = tidy[columns].groupby(level="ticker").shift(1)
+    masks = detect_events(tidy, previous)
+    return _events_table(
+        tidy.index.get_level_values("ticker").to_numpy(),
+        tidy.index.get_level_values("date").to_numpy(),
+        tidy["close"].to_numpy(dtype=float),
+        masks,
+    )
+
+
+def build_event_index(hisse_list, interval):
+    """
+    Depodaki hisselerin olay dizinini tek bir panel hesabıyla baştan kurar.
+    Yazılan (kapanmış barlara ait) olayları döndürür.
+    """
+    panel = indicator_panel.load_panel(hisse_list, interval)
+    if panel["close"].empty:
+        return _events_table(np.array([]), np.array([]), np.array([]), {})
+    tidy = indicator_panel.compute_panel(panel, EVENT_GROUPS)
+    events = events_from_panel(tidy)
+
+    dates = pd.Series(
+        tidy.index.get_level_values("date"), index=tidy.index.get_level_values("ticker")
+    ).groupby(level=0)
+    last_bar, last_closed = dates.max(), dates.nth(-2)
+    events = events[events["ts"] < events["symbol"].map(last_bar)].reset_index(drop=True)
+    db.replace_indicator_events(
+        interval,
+        events[events["symbol"].isin(last_closed.index)],
+        {symbol: (None, ts) for symbol, ts in last_closed.items()},
+    )
+    return events
+
+
+def _stored_history_indicators(hisse_kodu, interval):
+    """
+    Hissenin depodaki serisinin olay göstergeleri. Seri depo başından ısındığından
+    build_event_index ile aynı değerleri verir; gösterge motoru durumunu sakladığı için
+    yalnızca son çağrıdan sonra gelen barlar hesaplanır. Depoda bölüm yoksa None.
+    """
+    bars = data_store.read_bars(hisse_kodu, interval)
+    if bars is None or bars.empty:
+        return None
+    return indicator_engine.update_indicators(hisse_kodu, interval, bars, EVENT_GROUPS)
+
+
+def _index_closed_bars(hisse_kodu, interval, veri, watermark):
+    """veri'nin son barından önceki, dizine henüz işlenmemiş kapanmış barları işler."""
+    history = _stored_history_indicators(hisse_kodu, interval)
+    if history is None:
+        # Depoda geçmiş yok (ör. türetilen aralıklar): görünen aralık kullanılır. Bu
+        # aralık için panelden kurulmuş bir dizin de olmadığından çakışma olmaz.
+        if any(column not in veri.columns for column in EVENT_INPUTS):
+            veri = calculate_indicators(
+                veri[["open", "high", "low", "close", "volume"]], hisse_kodu, interval
+            )
+        history = veri
+        if watermark is not None and watermark not in veri.index:
+            watermark = None
+        first = veri.index[1]
+    else:
+        first = None
+    index = history.index
+    until = min(veri.index[-2], index[-1])
+    if watermark is not None and watermark >= until:
+        return
+    if watermark is not None:
+        # İşlenmiş son bardan sonraki ilk bardan itibaren yeniden yazılır.
+        first = index[index.searchsorted(watermark, side="right")]
+    # Olaylar yalnızca yeni barlar için, bir önceki barla karşılaştırılarak bulunur.
+    lo = 0 if first is None else max(index.searchsorted(first) - 1, 0)
+    events = events_from_frame(hisse_kodu, history.iloc[lo : index.searchsorted(until, side="right")])
+    if first is not None:
+        events = events[events["ts"] >= first]
+    db.replace_indicator_events(interval, events, {hisse_kodu: (first, until)})
+
+
+def update_event_index(hisse_kodu, interval, veri):
+    """
+    Gösterge sütunlu veri'nin dizine henüz işlenmemiş kapanmış barlarındaki olayları
+    ekler. Göstergeler depodaki serinin saklanan motor durumundan devam edilerek
+    yalnızca yeni bar kapandığında hesaplanır. veri aralığındaki olayları döndürür; kapanmamış son bardaki olaylar veri'de
+    bulunan sütunlardan hesaplanır ve yazılmaz. Grafik işaretleri bu dilimden çizilir.
+    """
+    if veri.empty:
+        return _events_table(np.array([]), np.array([]), np.array([]), {})
+    watermark = db.get_indicator_event_watermarks(interval, [hisse_kodu]).get(hisse_kodu)
+    last_ts = veri.index[-1]
+    if len(veri) > 1 and (watermark is None or veri.index[-2] > watermark):
+        _index_closed_bars(hisse_kodu, interval, veri, watermark)
+
+    stored = db.get_indicator_events(
+        interval, [hisse_kodu], start=veri.index[0], end=last_ts + pd.Timedelta(microseconds=1)
+    )
+    if watermark is not None and watermark >= last_ts:
+        return stored
+    events = events_from_frame(hisse_kodu, veri.iloc[-2:])
+    provisional = events[events["ts"] == last_ts]
+    if provisional.empty:
+        return stored
+    return pd.concat([stored[stored["ts"] < last_ts], provisional], ignore_index=True)
+
+
+def get_crossings(interval, day=None, event_types=None):
+    """Verilen günde (varsayılan: bugün) olay yaşayan hisseleri dizinden döndürür."""
+    day = pd.Timestamp(day if day is not None else datetime.today()).normalize()
+    return db.get_indicator_events(
+        interval, start=day, end=day + pd.Timedelta(days=1), event_types=event_types
+    )
@@ -2,3 +2,15 @@ class DataFetchError(Exception):
     """Custom exception for data fetching errors."""
 
     pass
+
+
+class RateLimitError(DataFetchError):
+    """Raised when the data provider is throttling requests or the circuit breaker is open."""
+
+    pass
+
+
+class NoDataError(DataFetchError):
+    """Raised when the provider answers but has no bars for the symbol or date range."""
+
+    pass
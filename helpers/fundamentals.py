@@ -0,0 +1,201 @@
+import os
+import time
+import pickle
+import logging
+import threading
+
+import pandas as pd
+
+import helpers.database as db
+from helpers import rate_limiter
+from helpers.exceptions import DataFetchError, RateLimitError
+from helpers.providers import get_provider
+from helpers.single_flight import SingleFlight
+
+# Bölüm başına disk önbelleği: fundamentals_cache/<hisse>/<bölüm>.pkl
+FUNDAMENTALS_CACHE_DIR = "fundamentals_cache"
+
+# Oranlar günlük değişir; finansal tablolar çeyrekte bir, temettüler daha seyrek.
+SECTION_TTL_SECONDS = {
+    "info": 24 * 60 * 60,
+    "financials": 30 * 24 * 60 * 60,
+    "balance_sheet": 30 * 24 * 60 * 60,
+    "cashflow": 30 * 24 * 60 * 60,
+    "dividends": 7 * 24 * 60 * 60,
+    "actions": 7 * 24 * 60 * 60,
+}
+SECTIONS = tuple(SECTION_TTL_SECONDS)
+
+SECTION_FLIGHT = SingleFlight()
+
+
+def _cache_path(hisse_kodu, section):
+    return os.path.join(FUNDAMENTALS_CACHE_DIR, hisse_kodu, f"{section}.pkl")
+
+
+def _read_cached(hisse_kodu, section):
+    """
+    Süresi dolmamış önbellek kaydını (değer, dosyanın yazıldığı zaman) olarak
+    döndürür; yoksa None. Bozuk veya yarım kalmış dosya silinir ve kayıt yokmuş gibi
+    davranılır (bölüm yeniden çekilir).
+    """
+    path = _cache_path(hisse_kodu, section)
+    try:
+        fetched_at = os.path.getmtime(path)
+    except OSError:
+        return None
+    if time.time() - fetched_at >= SECTION_TTL_SECONDS[section]:
+        return None
+    try:
+        return pd.read_pickle(path), fetched_at
+    except (OSError, EOFError, ValueError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+        logging.warning(f"{hisse_kodu} için bozuk {section} önbelleği siliniyor: {e}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+
+def _write_cached(hisse_kodu, section, value):
+    path = _cache_path(hisse_kodu, section)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        pd.to_pickle(value, tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _empty_section(section):
+    return pd.Series(dtype=float) if section == "dividends" else pd.DataFrame()
+
+
+def _fetch_section(hisse_kodu, section, retries=3):
+    """Tek bir bölümü sağlayıcıdan çeker (her bölüm tek bir HTTP isteğidir)."""
+    provider = get_provider()
+    last_error = None
+    for i in range(retries):
+        provider.acquire()
+        try:
+            value = getattr(provider.ticker(hisse_kodu), section)
+            rate_limiter.record_success()
+            return value
+        except Exception as e:
+            last_error = e
+            print(f"Attempt {i+1}/{retries} for {section} of {hisse_kodu} failed: {e}")
+            rate_limiter.record_failure(e)
+            if i < retries - 1:
+                rate_limiter.wait_before_retry(i)
+    if rate_limiter.is_throttle_error(last_error):
+        raise RateLimitError(f"{hisse_kodu} için {section} isteği kısıtlandı: {last_error}")
+    raise DataFetchError(f"{hisse_kodu} için {section} çekilemedi: {last_error}")
+
+
+def _load_section(hisse_kodu, section):
+    """Bölümü önce disk önbelleğinden, yoksa sağlayıcıdan yükler ve önbelleğe yazar."""
+    cached = _read_cached(hisse_kodu, section)
+    if cached is not None:
+        return cached
+    value = _fetch_section(hisse_kodu, section)
+    if value is not None:
+        _write_cached(hisse_kodu, section, value)
+    return value, time.time()
+
+
+def load_section(hisse_kodu, section):
+    """
+    Aynı hisse ve bölüm için eş zamanlı yüklemeleri tek bir isteğe indirir.
+
+    (değer, alınma zamanı) döndürür; önbellekten gelen bölümde bu, dosyanın zamanıdır.
+    """
+    return SECTION_FLIGHT.do((hisse_kodu, section), _load_section, hisse_kodu, section)
+
+
+def load_info(hisse_kodu):
+    """
+    info bölümünü yükler ve hissenin temel veri sunup sunmadığını doğrular.
+    Hisse olmayan veya bekleme süresindeki semboller DataFetchError fırlatır.
+    """
+    return _load_info(hisse_kodu)[0]
+
+
+def _load_info(hisse_kodu):
+    if db.is_symbol_blocked(hisse_kodu, "fundamental"):
+        raise DataFetchError(
+            f"{hisse_kodu} için temel veri yakın zamanda alınamadı, bekleme süresi dolana kadar atlanıyor."
+        )
+    try:
+        info, fetched_at = load_section(hisse_kodu, "info")
+    except RateLimitError:
+        raise
+    except DataFetchError as e:
+        db.record_symbol_failure(hisse_kodu, "fundamental", e)
+        raise
+    if not info or info.get("quoteType") != "EQUITY":
+        # Fon/varant gibi hisse olmayan semboller için tekrar denemenin anlamı yok.
+        db.record_symbol_failure(
+            hisse_kodu, "fundamental", "Temel veri bilgisi yok veya hisse senedi değil"
+        )
+        raise DataFetchError(f"{hisse_kodu} için temel veriler çekilemedi.")
+    db.record_symbol_success(hisse_kodu, "fundamental")
+    return info, fetched_at
+
+
+class LazyFundamentals:
+    """
+    Hissenin temel verilerine sözlük gibi erişim sağlar; her bölüm ilk erişildiğinde
+    (disk önbelleğinden veya sağlayıcıdan) yüklenir.
+
+    data["info"], data.get("financials") gibi mevcut kullanım aynen çalışır. Bir
+    finansal tablo alınamazsa sayfanın geri kalanı çalışsın diye boş tablo döner.
+    """
+
+    def __init__(self, hisse_kodu):
+        self.hisse_kodu = hisse_kodu
+        self._lock = threading.Lock()
+        # bölüm -> (değer, alınma zamanı); önbellekten gelen bölümün süresi dosyanın
+        # yazıldığı andan itibaren sayılır.
+        self._sections = {}
+
+    def __getitem__(self, section):
+        if section not in SECTION_TTL_SECONDS:
+            raise KeyError(section)
+        with self._lock:
+            cached = self._sections.get(section)
+        if cached is not None and time.time() - cached[1] < SECTION_TTL_SECONDS[section]:
+            return cached[0]
+
+        if section == "info":
+            value, fetched_at = _load_info(self.hisse_kodu)
+        else:
+            try:
+                value, fetched_at = load_section(self.hisse_kodu, section)
+            except DataFetchError as e:
+                logging.warning(f"{self.hisse_kodu} için {section} alınamadı: {e}")
+                return _empty_section(section)
+        with self._lock:
+            self._sections[section] = (value, fetched_at)
+        return value
+
+    def get(self, section, default=None):
+        try:
+            return self[section]
+        except KeyError:
+            return default
+        except DataFetchError as e:
+            logging.warning(f"{self.hisse_kodu} için {section} alınamadı: {e}")
+            return default
+
+    def __contains__(self, section):
+        return section in SECTION_TTL_SECONDS
+
+    def keys(self):
+        return SECTIONS
+
+    def loaded_sections(self):
+        """Şu ana kadar yüklenmiş bölümlerin adları."""
+        with self._lock:
+            return [s for s in SECTIONS if s in self._sections]
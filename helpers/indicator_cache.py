@@ -0,0 +1,79 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def value_nbytes(value):
+    """Önbellekteki değerin bellekte kapladığı yaklaşık bayt sayısı."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    return sys.getsizeof(value)
+
+
+class ByteLRUCache:
+    """
+    Toplam boyutu max_bytes ile sınırlı, en uzun süredir kullanılmayanı ilk atan önbellek.
+
+    Anahtarlar çağıranın ürettiği küçük demetlerdir; değerin içeriği hash'lenmez.
+    Tek başına sınırdan büyük değerler saklanmaz.
+    """
+
+    def __init__(self, max_bytes, sizeof=value_nbytes):
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return default
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get_stats(self):
+        """İsabet, ıskalama ve atılma sayılarıyla birlikte kayıt sayısı ve toplam boyutu döndürür."""
+        with self._lock:
+            return dict(
+                self._stats,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+            )
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {"hits": 0, "misses": 0, "evictions": 0}
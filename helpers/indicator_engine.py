@@ -0,0 +1,740 @@
+import copy
+import os
+import time
+import pickle
+import logging
+import threading
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from helpers import data_store
+from helpers import indicator_kernels as kernels
+from helpers.dtype_policy import compact_frame
+
+# Kalıcı durum biçimi değiştiğinde artırılır; eski durum dosyaları yok sayılır.
+ENGINE_VERSION = 6
+PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+# Düğümlerin girdi olarak kullanabileceği bar alanları
+BAR_FIELDS = PRICE_COLUMNS + ["day"]
+# Satır günlüğü bu kadar parçaya ulaşınca yüklenirken tek parçada yeniden yazılır.
+ENGINE_MAX_ROW_SEGMENTS = 64
+ICHIMOKU_KIJUN = 26
+
+
+# --- Durumlu düğüm türleri ---
+
+
+class _Stateless:
+    """Durum tutmayan, elemanlar üzerinde çalışan düğüm."""
+
+    def __init__(self, func):
+        self.func = func
+
+    def advance(self, *inputs):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.func(*inputs)
+
+
+class _Ema:
+    """pandas_ta ema: ilk length değerin ortalamasıyla başlayan adjust=False EMA."""
+
+    def __init__(self, length):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = np.nan
+
+    def advance(self, x):
+        out = np.full(len(x), np.nan)
+        i = 0
+        while i < len(x) and self.count < self.length:
+            # Baştaki boş değerler atlanır (MACD sinyali ilk geçerli değerden başlar).
+            if not (self.count == 0 and np.isnan(x[i])):
+                self.seed_sum += x[i]
+                self.count += 1
+                if self.count == self.length:
+                    self.value = self.seed_sum / self.length
+                    out[i] = self.value
+            i += 1
+        if i < len(x):
+            out[i:] = kernels.ewm_scan(self.alpha * x[i:], 1 - self.alpha, self.value)
+            self.value = out[-1]
+            self.count += len(x) - i
+        return out
+
+
+class _Wilder:
+    """pandas_ta rma: ewm(alpha=1/length, adjust=True, min_periods=length) ortalaması."""
+
+    def __init__(self, length):
+        self.length = length
+        self.weighted_sum = 0.0
+        self.weight = 0.0
+        self.nobs = 0
+
+    def advance(self, x):
+        out, s, w, nobs = kernels.wilder_scan(x, self.length, self.weighted_sum, self.weight, self.nobs)
+        self.weighted_sum, self.weight, self.nobs = s[-1], w[-1], int(nobs[-1])
+        return out
+
+
+class _Window:
+    """
+    Her yeni değerde biten size uzunluğundaki pencereleri (len(x) x size) verir; son
+    size - 1 değeri saklar. Geçmişi yetmeyen pencereler NaN içerir (min_periods=size).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.tail = np.empty(0)
+
+    def advance(self, x):
+        arr = np.concatenate([self.tail, x])
+        padded = np.concatenate([np.full(max(self.size - 1 - len(self.tail), 0), np.nan), arr])
+        self.tail = arr[-(self.size - 1):] if self.size > 1 else arr[:0]
+        return np.lib.stride_tricks.sliding_window_view(padded, self.size)[-len(x):]
+
+
+class _Rolling(_Window):
+    """Kayan pencere üzerinde mean/std/min/max gibi bir indirgeme."""
+
+    def __init__(self, size, reducer):
+        super().__init__(size)
+        self.reducer = reducer
+
+    def advance(self, x):
+        return getattr(super().advance(x), self.reducer)(axis=1)
+
+
+class _Delay:
+    """Seriyi lag bar ileri kaydırır (pandas shift(lag))."""
+
+    def __init__(self, lag):
+        self.buffer = np.full(lag, np.nan)
+
+    def advance(self, x):
+        arr = np.concatenate([self.buffer, x])
+        self.buffer = arr[len(x):]
+        return arr[: len(x)]
+
+
+class _Previous(_Delay):
+    """Bir önceki barın değerini (ilk bar için NaN) verir."""
+
+    def __init__(self):
+        super().__init__(1)
+
+
+class _Obv:
+    def __init__(self):
+        self.total = 0.0
+
+    def advance(self, change, volume):
+        # pandas_ta signed_series: ilk bar +1 sayılır.
+        sign = np.where(np.isnan(change), 1.0, np.sign(change))
+        obv = self.total + np.cumsum(sign * volume)
+        self.total = obv[-1]
+        return obv
+
+
+class _SessionCumsum:
+    """Gün içi kümülatif toplam; yeni günün ilk barında toplam sıfırlanır."""
+
+    def __init__(self):
+        self.day = None
+        self.total = 0.0
+
+    def advance(self, values, day):
+        out = kernels.session_cumsum(values, day, self.day, self.total)
+        self.day, self.total = day[-1], out[-1]
+        return out
+
+
+class _SuperTrend:
+    """pandas_ta supertrend döngüsü; bir önceki barın yönü ve bantları durumda tutulur."""
+
+    def __init__(self, multiplier):
+        self.multiplier = multiplier
+        self.started = False
+        self.direction, self.upper, self.lower = 1, np.nan, np.nan
+
+    def advance(self, close, hl2, atr):
+        *outputs, state = kernels.supertrend_scan(
+            close,
+            hl2 + self.multiplier * atr,
+            hl2 - self.multiplier * atr,
+            self.direction,
+            self.upper,
+            self.lower,
+            self.started,
+        )
+        self.started = True
+        self.direction, self.upper, self.lower = state
+        return tuple(outputs)
+
+
+# --- Durumsuz düğüm fonksiyonları (pickle edilebilmeleri için modül düzeyinde) ---
+
+
+def _true_range(high, low, prev_close):
+    return np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(prev_close - low)))
+
+
+def _midpoint(a, b):
+    return 0.5 * (a + b)
+
+
+def _typical_price(high, low, close):
+    return (high + low + close) / 3
+
+
+def _gain(change):
+    return np.where(change < 0, 0.0, change)
+
+
+def _loss(change):
+    return np.where(change > 0, 0.0, -change)
+
+
+def _rsi(avg_gain, avg_loss):
+    return 100 * avg_gain / (avg_gain + avg_loss)
+
+
+def _window_mean(windows):
+    return windows.mean(axis=1)
+
+
+def _window_std(windows):
+    return windows.std(axis=1)
+
+
+def _band(width, mid, std):
+    return mid + width * std
+
+
+def _band_width(lower, upper, mid):
+    return (upper - lower) / mid
+
+
+def _percent_of(value, base):
+    return value / base * 100
+
+
+def _dm_pos(high, prev_high, low, prev_low):
+    up, dn = high - prev_high, prev_low - low
+    # İlk barda fark tanımsızdır; pandas_ta'da bu bar NaN kalır.
+    return np.where(np.isnan(up), np.nan, np.where((up > dn) & (up > 0), up, 0.0))
+
+
+def _dm_neg(high, prev_high, low, prev_low):
+    up, dn = high - prev_high, prev_low - low
+    return np.where(np.isnan(dn), np.nan, np.where((dn > up) & (dn > 0), dn, 0.0))
+
+
+def _directional(avg_dm, atr):
+    return 100 / atr * avg_dm
+
+
+def _dx(dmp, dmn):
+    return 100 * np.abs(dmp - dmn) / (dmp + dmn)
+
+
+def _stoch(value, lowest, highest):
+    spread = highest - lowest
+    # pandas_ta non_zero_range: sıfır aralık epsilon ile değiştirilir.
+    return 100 * (value - lowest) / np.where(spread == 0, np.finfo(float).eps, spread)
+
+
+def _pick(i, values):
+    return values[i]
+
+
+def _cross_up(prev_fast, prev_slow, fast, slow):
+    return (prev_fast < prev_slow) & (fast > slow)
+
+
+def _cross_down(prev_fast, prev_slow, fast, slow):
+    return (prev_fast > prev_slow) & (fast < slow)
+
+
+# --- Gösterge kaydı ---
+
+
+class IndicatorNode:
+    """Bağımlılık grafiğinde bir düğüm: girdileri ve durum nesnesini üreten fonksiyon."""
+
+    def __init__(self, name, inputs, factory):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.factory = factory
+
+
+REGISTRY = {}
+
+
+def register(name, inputs, factory):
+    """
+    Grafiğe yeni bir düğüm ekler. inputs bar alanları (BAR_FIELDS) veya kayıtlı
+    düğüm adlarıdır; factory, advance(*girdiler) metodu olan bir durum nesnesi üretir.
+    """
+    for dep in inputs:
+        if dep not in BAR_FIELDS and dep not in REGISTRY:
+            raise ValueError(f"{name} düğümünün girdisi {dep} kayıtlı değil.")
+    REGISTRY[name] = IndicatorNode(name, inputs, factory)
+
+
+def stateless(func):
+    """Durum tutmayan fonksiyonlar için factory."""
+    return partial(_Stateless, func)
+
+
+# Paylaşılan ara değerler
+register("prev_close", ["close"], _Previous)
+register("prev_high", ["high"], _Previous)
+register("prev_low", ["low"], _Previous)
+register("change", ["close", "prev_close"], stateless(np.subtract))
+register("true_range", ["high", "low", "prev_close"], stateless(_true_range))
+register("hl2", ["high", "low"], stateless(_midpoint))
+register("typical_price", ["high", "low", "close"], stateless(_typical_price))
+for _length in (5, 12, 20, 26, 50, 200):
+    register(f"ema_{_length}", ["close"], partial(_Ema, _length))
+
+# Bollinger: ortalama ve standart sapma aynı pencereyi kullanır.
+register("close_window_20", ["close"], partial(_Window, 20))
+register("bbm_20_2.0", ["close_window_20"], stateless(_window_mean))
+register("close_std_20", ["close_window_20"], stateless(_window_std))
+register("bbl_20_2.0", ["bbm_20_2.0", "close_std_20"], stateless(partial(_band, -2.0)))
+register("bbu_20_2.0", ["bbm_20_2.0", "close_std_20"], stateless(partial(_band, 2.0)))
+register("bbw_20_2.0", ["bbl_20_2.0", "bbu_20_2.0", "bbm_20_2.0"], stateless(_band_width))
+register("volume_ma_20", ["volume"], partial(_Rolling, 20, "mean"))
+
+# RSI ve StochRSI aynı RSI serisini kullanır.
+register("gain", ["change"], stateless(_gain))
+register("loss", ["change"], stateless(_loss))
+register("avg_gain_14", ["gain"], partial(_Wilder, 14))
+register("avg_loss_14", ["loss"], partial(_Wilder, 14))
+register("rsi_14", ["avg_gain_14", "avg_loss_14"], stateless(_rsi))
+register("rsi_low_14", ["rsi_14"], partial(_Rolling, 14, "min"))
+register("rsi_high_14", ["rsi_14"], partial(_Rolling, 14, "max"))
+register("stochrsi_14_14", ["rsi_14", "rsi_low_14", "rsi_high_14"], stateless(_stoch))
+register("stochrsik_14_14_3_3", ["stochrsi_14_14"], partial(_Rolling, 3, "mean"))
+register("stochrsid_14_14_3_3", ["stochrsik_14_14_3_3"], partial(_Rolling, 3, "mean"))
+
+register("macd_12_26_9", ["ema_12", "ema_26"], stateless(np.subtract))
+register("macds_12_26_9", ["macd_12_26_9"], partial(_Ema, 9))
+register("macdh_12_26_9", ["macd_12_26_9", "macds_12_26_9"], stateless(np.subtract))
+
+# ATR, ADX ve SuperTrend aynı true range serisini kullanır.
+register("atr_14", ["true_range"], partial(_Wilder, 14))
+register("atrr_14", ["atr_14", "close"], stateless(_percent_of))
+register("dm_pos", ["high", "prev_high", "low", "prev_low"], stateless(_dm_pos))
+register("dm_neg", ["high", "prev_high", "low", "prev_low"], stateless(_dm_neg))
+register("avg_dm_pos_14", ["dm_pos"], partial(_Wilder, 14))
+register("avg_dm_neg_14", ["dm_neg"], partial(_Wilder, 14))
+register("dmp_14", ["avg_dm_pos_14", "atr_14"], stateless(_directional))
+register("dmn_14", ["avg_dm_neg_14", "atr_14"], stateless(_directional))
+register("dx_14", ["dmp_14", "dmn_14"], stateless(_dx))
+register("adx_14", ["dx_14"], partial(_Wilder, 14))
+register("obv", ["change", "volume"], _Obv)
+
+register("atr_7", ["true_range"], partial(_Wilder, 7))
+register("supertrend_7_3.0", ["close", "hl2", "atr_7"], partial(_SuperTrend, 3.0))
+for _i, _column in enumerate(["supert_7_3.0", "supertd_7_3.0", "supertl_7_3.0", "superts_7_3.0"]):
+    register(_column, ["supertrend_7_3.0"], stateless(partial(_pick, _i)))
+
+for _length in (9, 26, 52):
+    register(f"high_max_{_length}", ["high"], partial(_Rolling, _length, "max"))
+    register(f"low_min_{_length}", ["low"], partial(_Rolling, _length, "min"))
+register("its_9", ["high_max_9", "low_min_9"], stateless(_midpoint))
+register("iks_26", ["high_max_26", "low_min_26"], stateless(_midpoint))
+register("ichimoku_span_a", ["its_9", "iks_26"], stateless(_midpoint))
+register("ichimoku_span_b", ["high_max_52", "low_min_52"], stateless(_midpoint))
+register("isa_9", ["ichimoku_span_a"], partial(_Delay, ICHIMOKU_KIJUN))
+register("isb_26", ["ichimoku_span_b"], partial(_Delay, ICHIMOKU_KIJUN))
+
+register("tp_volume", ["typical_price", "volume"], stateless(np.multiply))
+register("cum_tp_volume", ["tp_volume", "day"], _SessionCumsum)
+register("cum_volume", ["volume", "day"], _SessionCumsum)
+register("vwap_d", ["cum_tp_volume", "cum_volume"], stateless(np.divide))
+
+register("prev_ema_50", ["ema_50"], _Previous)
+register("prev_ema_200", ["ema_200"], _Previous)
+_CROSS_INPUTS = ["prev_ema_50", "prev_ema_200", "ema_50", "ema_200"]
+register("golden_cross", _CROSS_INPUTS, stateless(_cross_up))
+register("death_cross", _CROSS_INPUTS, stateless(_cross_down))
+
+# Chikou (ics) geleceğe bakar; düğüm değildir, motor tüm seri üzerinden ekler.
+LOOKAHEAD_COLUMNS = ("ics_26",)
+
+# calculate_indicators ile aynı sütun sırası
+INDICATOR_COLUMNS = [
+    "ema_5", "ema_20", "ema_50", "ema_200",
+    "bbl_20_2.0", "bbm_20_2.0", "bbu_20_2.0", "bbw_20_2.0",
+    "volume_ma_20", "rsi_14",
+    "macd_12_26_9", "macdh_12_26_9", "macds_12_26_9",
+    "atr_14", "adx_14", "dmp_14", "dmn_14", "obv",
+    "stochrsik_14_14_3_3", "stochrsid_14_14_3_3",
+    "supert_7_3.0", "supertd_7_3.0", "supertl_7_3.0", "superts_7_3.0",
+    "isa_9", "isb_26", "its_9", "iks_26", "ics_26",
+    "typical_price", "tp_volume", "cum_tp_volume", "cum_volume", "vwap_d",
+    "atrr_14", "golden_cross", "death_cross",
+]
+
+# Arayüzdeki gösterge adı -> sonuçta yer alan sütunlar
+INDICATOR_GROUPS = {
+    "EMA KISA (5, 20)": ["ema_5", "ema_20"],
+    "EMA UZUN (50, 200)": ["ema_50", "ema_200"],
+    "Bollinger Bantları": ["bbl_20_2.0", "bbm_20_2.0", "bbu_20_2.0", "bbw_20_2.0"],
+    "Hacim Ortalaması": ["volume_ma_20"],
+    "RSI": ["rsi_14"],
+    "MACD": ["macd_12_26_9", "macdh_12_26_9", "macds_12_26_9"],
+    "ATR": ["atr_14", "atrr_14"],
+    "ADX": ["adx_14", "dmp_14", "dmn_14"],
+    "OBV": ["obv"],
+    "StochRSI": ["stochrsik_14_14_3_3", "stochrsid_14_14_3_3"],
+    "Super Trend": ["supert_7_3.0", "supertd_7_3.0", "supertl_7_3.0", "superts_7_3.0"],
+    "Ichimoku Cloud": ["isa_9", "isb_26", "its_9", "iks_26", "ics_26"],
+    "VWAP": ["typical_price", "tp_volume", "cum_tp_volume", "cum_volume", "vwap_d"],
+    "Golden/Death Cross": ["ema_50", "ema_200", "golden_cross", "death_cross"],
+}
+# Hacim skoru her zaman hacim ortalamasını kullanır.
+BASE_GROUPS = ("Hacim Ortalaması",)
+
+
+def _ordered(columns):
+    """Sütunları INDICATOR_COLUMNS sırasına dizer; sonradan kaydedilenler sona eklenir."""
+    columns = list(dict.fromkeys(columns))
+    known = [c for c in INDICATOR_COLUMNS if c in columns]
+    return known + [c for c in columns if c not in INDICATOR_COLUMNS]
+
+
+def group_columns(groups=None):
+    """İstenen grupların sütunlarını sonuç sırasıyla döndürür (None: tüm sütunlar)."""
+    if groups is None:
+        return list(INDICATOR_COLUMNS)
+    wanted = []
+    for group in list(BASE_GROUPS) + list(groups):
+        wanted.extend(INDICATOR_GROUPS.get(group, ()))
+    return _ordered(wanted)
+
+
+def resolve_nodes(columns):
+    """Sütunlar için gereken düğümleri bağımlılık (topolojik) sırasıyla döndürür."""
+    order, seen = [], set()
+
+    def visit(name):
+        if name in seen or name in BAR_FIELDS or name in LOOKAHEAD_COLUMNS:
+            return
+        seen.add(name)
+        for dep in REGISTRY[name].inputs:
+            visit(dep)
+        order.append(name)
+
+    for column in columns:
+        visit(column)
+    return order
+
+
+def _bar_arrays(veri):
+    bars = {col: veri[col].to_numpy(dtype=float) for col in PRICE_COLUMNS}
+    bars["day"] = kernels.day_codes(veri.index)
+    return bars
+
+
+class IndicatorEngine:
+    """
+    Etkin sütunların bağımlılık grafiğindeki düğümlerin durumunu (EMA değerleri,
+    Wilder toplamları, OBV, SuperTrend bantları, kayan pencere kuyrukları) tutar ve
+    yalnızca yeni barlar üzerinden ilerler. True range, EMA'lar ve RSI gibi ara
+    değerler her seri için bir kez hesaplanıp onları kullanan tüm göstergelere verilir.
+
+    Durum her zaman son "kapanmış" bara kadardır; en son bar henüz oluşmakta
+    olabileceği için her istekte durumun bir kopyası üzerinde hesaplanır. Sonradan
+    istenen bir sütun, kapanmış barlar için bir kez hesaplanıp motora eklenir.
+    Durum, serinin ilk hesaplandığı baştan (first_ts) itibaren tutulur; daha geç
+    başlayan istekler (farklı tarih aralıkları) aynı durumdan devam eder ve sonuç
+    isteğin aralığına kesilir.
+
+    Kapanmış barların gösterge satırları (frame) durumla birlikte pickle edilmez;
+    yalnızca kaydedilmemiş yeni satırlar (unsaved_rows) satır günlüğüne eklenir.
+    Geçmiş satırlar değiştiğinde (yeni motor, sonradan eklenen sütun) günlük baştan
+    yazılır (rewrite_rows).
+    """
+
+    def __init__(self):
+        self.version = ENGINE_VERSION
+        self.columns = []
+        self.nodes = {}
+        self.first_ts = None
+        self.checkpoint_ts = None
+        self.checkpoint_bar = None
+        self.closed_bars = 0
+        self.frame = None
+        self.unsaved_rows = []
+        self.rewrite_rows = True
+        self.last_advanced_bars = 0
+        self.timings = {}
+
+    def _advance(self, veri, nodes):
+        """Düğümlerin durumunu barlar üzerinden sırayla ilerletir; tüm ara değerleri döndürür."""
+        out = _bar_arrays(veri)
+        for name, state in nodes.items():
+            started = time.perf_counter()
+            out[name] = state.advance(*(out[dep] for dep in REGISTRY[name].inputs))
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+        return out
+
+    @staticmethod
+    def _to_frame(out, index, columns):
+        return pd.DataFrame(
+            {c: out[c] if c in out else np.full(len(index), np.nan) for c in columns},
+            index=index,
+        )
+
+    def _offset(self, veri):
+        """veri'nin ilk barının kapanmış satırlar (frame) içindeki konumu."""
+        return 0 if self.frame is None else int(self.frame.index.searchsorted(veri.index[0]))
+
+    def can_continue(self, veri, columns=()):
+        """
+        veri, durumun hesaplandığı serinin devamı mı? veri durumun başlangıcında veya
+        sonrasında başlamalı ve son kapanmış barı aynı değerlerle içermelidir. Eksik
+        sütunlar geçmiş barlardan hesaplandığından, bunun için veri baştan başlamalıdır.
+        """
+        if (
+            self.version != ENGINE_VERSION
+            or self.checkpoint_ts is None
+            or self.frame is None
+            or veri.empty
+        ):
+            return False
+        if veri.index[0] < self.first_ts or veri.index[-1] <= self.checkpoint_ts:
+            return False
+        if veri.index[0] != self.first_ts and any(c not in self.columns for c in columns):
+            return False
+        try:
+            pos = veri.index.get_loc(self.checkpoint_ts)
+        except KeyError:
+            return False
+        start = self._offset(veri)
+        return (
+            self.frame.index[start] == veri.index[0]
+            and pos == self.closed_bars - 1 - start
+            and np.array_equal(
+                veri[PRICE_COLUMNS].iloc[pos].to_numpy(dtype=float),
+                self.checkpoint_bar,
+                equal_nan=True,
+            )
+        )
+
+    def _add_columns(self, veri, columns):
+        """
+        Eksik sütunların düğümlerini kapanmış barlar üzerinden baştan hesaplar. Aynı
+        barlar üzerinde ilerlediklerinden mevcut ara düğümlerle aynı duruma ulaşırlar.
+        """
+        missing = [c for c in columns if c not in self.columns]
+        if not missing:
+            return
+        self.columns = _ordered(self.columns + missing)
+        fresh = {name: REGISTRY[name].factory() for name in resolve_nodes(missing)}
+        if self.frame is not None:
+            closed = veri.iloc[: self.closed_bars]
+            added = compact_frame(self._to_frame(self._advance(closed, fresh), closed.index, missing))
+            self.frame = pd.concat([self.frame, added], axis=1)[self.columns]
+            self.rewrite_rows = True
+        merged = {**self.nodes, **fresh}
+        self.nodes = {name: merged[name] for name in resolve_nodes(self.columns)}
+
+    def update(self, veri, columns=None):
+        """
+        Durumu veri'nin kapanmış barlarına kadar ilerletir ve tüm seri için etkin
+        gösterge sütunlarını içeren DataFrame'i döndürür.
+        """
+        self.timings = {}
+        self._add_columns(veri, INDICATOR_COLUMNS if columns is None else columns)
+        start = self._offset(veri)
+        closed = veri.iloc[self.closed_bars - start : -1]
+        self.last_advanced_bars = len(closed) + 1
+        if not closed.empty:
+            rows = compact_frame(
+                self._to_frame(self._advance(closed, self.nodes), closed.index, self.columns)
+            )
+            if self.frame is None:
+                self.first_ts = veri.index[0]
+            self.frame = rows if self.frame is None else pd.concat([self.frame, rows])
+            self.unsaved_rows.append(rows)
+            self.closed_bars = len(self.frame)
+            self.checkpoint_ts = closed.index[-1]
+            self.checkpoint_bar = closed[PRICE_COLUMNS].iloc[-1].to_numpy(dtype=float)
+
+        provisional = copy.deepcopy(self.nodes)
+        last_row = compact_frame(
+            self._to_frame(self._advance(veri.iloc[-1:], provisional), veri.index[-1:], self.columns)
+        )
+
+        frames = [last_row] if self.frame is None else [self.frame.iloc[start:], last_row]
+        indicators = pd.concat(frames)
+        if "ics_26" in indicators:
+            # Chikou çizgisi kapanışın kijun bar geri kaydırılmışıdır (geleceğe bakar).
+            indicators["ics_26"] = veri["close"].shift(-ICHIMOKU_KIJUN).to_numpy()
+        return compact_frame(pd.concat([veri, indicators], axis=1))
+
+    def __getstate__(self):
+        # Süre ölçümleri geçicidir; gösterge satırları ayrı satır günlüğünde tutulur.
+        state = self.__dict__.copy()
+        state.update(timings={}, frame=None, unsaved_rows=[], rewrite_rows=False)
+        return state
+
+
+def _state_path(hisse_kodu, interval):
+    return os.path.join(data_store.DATA_STORE_DIR, interval, f"{hisse_kodu}.indicators.pkl")
+
+
+def _rows_path(hisse_kodu, interval):
+    return os.path.join(data_store.DATA_STORE_DIR, interval, f"{hisse_kodu}.indicators.rows.pkl")
+
+
+def _read_row_segments(path):
+    """Satır günlüğündeki parçaları okur; yarım kalmış son parça atlanır."""
+    segments = []
+    try:
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    segments.append(pickle.load(f))
+                except EOFError:
+                    break
+    except (OSError, pickle.UnpicklingError, AttributeError):
+        pass
+    return segments
+
+
+def _load_engine(hisse_kodu, interval):
+    path = _state_path(hisse_kodu, interval)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            engine = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+        return None
+    if getattr(engine, "version", None) != ENGINE_VERSION:
+        return None
+    if engine.closed_bars:
+        segments = _read_row_segments(_rows_path(hisse_kodu, interval))
+        frame = pd.concat(segments) if segments else None
+        # Durum, günlüğe eklenen satırlardan sonra yazılır; fazla satırlar atılır.
+        if (
+            frame is None
+            or len(frame) < engine.closed_bars
+            or frame.index[engine.closed_bars - 1] != engine.checkpoint_ts
+        ):
+            return None
+        engine.frame = frame.iloc[: engine.closed_bars]
+        engine.rewrite_rows = (
+            len(frame) != engine.closed_bars or len(segments) > ENGINE_MAX_ROW_SEGMENTS
+        )
+    else:
+        engine.rewrite_rows = True
+    return engine
+
+
+def _save_engine(hisse_kodu, interval, engine):
+    """
+    Yeni satırları günlüğe ekler, ardından (sabit boyutlu) düğüm durumunu yazar. Maliyet
+    geçmişin uzunluğuyla değil yeni bar sayısıyla büyür.
+    """
+    rows_path = _rows_path(hisse_kodu, interval)
+    if engine.rewrite_rows:
+        def _write_rows(path):
+            with open(path, "wb") as f:
+                if engine.frame is not None:
+                    pickle.dump(engine.frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        data_store._atomic_replace(rows_path, _write_rows)
+    elif engine.unsaved_rows:
+        with open(rows_path, "ab") as f:
+            for rows in engine.unsaved_rows:
+                pickle.dump(rows, f, protocol=pickle.HIGHEST_PROTOCOL)
+    engine.unsaved_rows = []
+    engine.rewrite_rows = False
+
+    def _write(path):
+        with open(path, "wb") as f:
+            pickle.dump(engine, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    data_store._atomic_replace(_state_path(hisse_kodu, interval), _write)
+
+
+_engines = {}
+# _engines sözlüğünü korur; hesaplar (hisse, aralık) başına ayrı kilitle yapılır.
+_engines_lock = threading.Lock()
+_engine_locks = {}
+
+
+def _engine_lock(key):
+    with _engines_lock:
+        return _engine_locks.setdefault(key, threading.Lock())
+
+
+def update_indicators(hisse_kodu, interval, veri, groups=None):
+    """
+    Göstergeleri hisse ve aralık için saklanan durumdan devam ederek hesaplar.
+
+    groups yalnızca istenen gösterge gruplarını (arayüzdeki adlarıyla, örn. "RSI")
+    sınırlar; None tüm göstergeleri hesaplar. Daha önce hesaplanmış gruplar sonuçta
+    kalmaya devam eder, yeni istenen gruplar mevcut duruma eklenir.
+
+    Seri önceki çağrının devamıysa yalnızca yeni barlar işlenir. Durumdan daha geç
+    başlayan istekler (farklı başlangıç tarihleri) de aynı durumdan devam eder. Seri
+    durumdan önce başlıyorsa veya geçmiş barlar farklıysa hesap, önceki sütunlar
+    korunarak baştan yapılır. Durum, fiyat deposunun yanında
+    (<interval>/<hisse>.indicators.pkl) saklanır ve süreç yeniden başlasa da kullanılır.
+    """
+    veri = veri[~veri.index.duplicated(keep="last")]
+    key = (hisse_kodu, interval)
+    with _engine_lock(key):
+        with _engines_lock:
+            engine = _engines.get(key)
+        if engine is None:
+            engine = _load_engine(hisse_kodu, interval)
+        columns = group_columns(groups)
+        if engine is None or not engine.can_continue(veri, columns):
+            # Yeniden başlarken önceki sütunlar da hesaplanır; aralığı farklı iki istek
+            # birbirinin sütunları için motoru tekrar tekrar sıfırlamaz.
+            previous = [] if engine is None else engine.columns
+            engine = IndicatorEngine()
+            columns = _ordered(previous + columns)
+        previous_checkpoint = engine.checkpoint_ts
+        previous_columns = len(engine.columns)
+        result = engine.update(veri, columns)
+        with _engines_lock:
+            _engines[key] = engine
+        if engine.checkpoint_ts != previous_checkpoint or len(engine.columns) != previous_columns:
+            _save_engine(hisse_kodu, interval, engine)
+    logging.debug(
+        f"{hisse_kodu} {interval}: {engine.last_advanced_bars} bar, "
+        f"{len(engine.nodes)} düğüm, {sum(engine.timings.values()) * 1000:.1f} ms"
+    )
+    return result
+
+
+def get_node_timings(hisse_kodu, interval):
+    """
+    Son güncellemede her düğümün hesap süresini (saniye) en yavaştan başlayarak
+    döndürür; motor bellekte yoksa boş sözlük.
+    """
+    key = (hisse_kodu, interval)
+    with _engine_lock(key):
+        with _engines_lock:
+            engine = _engines.get(key)
+        timings = dict(engine.timings) if engine is not None else {}
+    return dict(sorted(timings.items(), key=lambda item: item[1], reverse=True))
+
+
+def clear_engine_cache():
+    """Bellekteki motorları boşaltır (diskteki durumlar korunur)."""
+    with _engines_lock:
+        _engines.clear()
@@ -0,0 +1,301 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+
+# Göstergeler için dizi alıp dizi döndüren NumPy çekirdekleri. Formüller pandas_ta
+# 0.3.14b0 ile aynıdır (SMA ile başlayan EMA, adjust=True Wilder ortalaması,
+# SuperTrend bant düzeltmeleri vb.). Çekirdekler 0. eksen (zaman) boyunca çalışır;
+# 1-B seri veya (tarih x hisse) 2-B matris alır. Seriler ilk geçerli değerden sonra
+# boşluksuz varsayılır.
+
+
+def _as_float(x):
+    return np.asarray(x, dtype=float)
+
+
+def _rows(x):
+    """Zaman indisini x ile yayınlanabilir biçimde döndürür."""
+    return np.arange(len(x)).reshape((len(x),) + (1,) * (x.ndim - 1))
+
+
+def _take(a, idx):
+    """Her sütun için 0. eksende idx'teki değeri alır."""
+    return np.take_along_axis(a, np.asarray(idx)[np.newaxis, ...], axis=0)[0]
+
+
+def shift(x, periods=1):
+    """pandas shift: pozitif periods ileri, negatif geri kaydırır; boşluklar NaN."""
+    x = _as_float(x)
+    out = np.full_like(x, np.nan)
+    if periods > 0:
+        out[periods:] = x[:-periods]
+    elif periods < 0:
+        out[:periods] = x[-periods:]
+    else:
+        out[:] = x
+    return out
+
+
+def ewm_scan(x, decay, prev=0.0):
+    """y[t] = x[t] + decay * y[t-1] özyinelemesi; prev, ilk bardan önceki y değeridir."""
+    x = _as_float(x)
+    zi = decay * np.broadcast_to(_as_float(prev), x.shape[1:])[np.newaxis, ...]
+    y, _ = lfilter([1.0], [1.0, -decay], x, axis=0, zi=zi)
+    return y
+
+
+def ema(x, length):
+    """İlk length geçerli değerin ortalamasıyla başlayan adjust=False EMA (pandas_ta ema)."""
+    x = _as_float(x)
+    n, alpha = len(x), 2.0 / (length + 1)
+    valid = ~np.isnan(x)
+    start = np.where(valid.any(axis=0), valid.argmax(axis=0), n)
+    seed_end = start + length - 1
+    filled = np.where(valid, x, 0.0)
+    cs = np.concatenate([np.zeros((1,) + x.shape[1:]), np.cumsum(filled, axis=0)])
+    seed = (_take(cs, np.minimum(seed_end + 1, n)) - _take(cs, np.minimum(start, n))) / length
+
+    # Tohum barında değer tohumun kendisi, sonrasında alpha * x; öncesi sıfır.
+    rows = _rows(x)
+    inputs = np.where(rows > seed_end, alpha * filled, 0.0)
+    inputs = np.where(rows == seed_end, seed, inputs)
+    return np.where(rows >= seed_end, ewm_scan(inputs, 1 - alpha), np.nan)
+
+
+def wilder_scan(x, length, weighted_sum=0.0, weight=0.0, nobs=0):
+    """
+    Önceki toplamlardan devam eden Wilder ortalaması (ewm alpha=1/length, adjust=True,
+    min_periods=length). (değerler, ağırlıklı toplam, ağırlık, gözlem sayısı) döndürür.
+    NaN değerler pandas'taki gibi ağırlığı azaltır ama ortalamaya katılmaz.
+    """
+    x = _as_float(x)
+    decay = 1.0 - 1.0 / length
+    valid = ~np.isnan(x)
+    s = ewm_scan(np.where(valid, x, 0.0), decay, weighted_sum)
+    w = ewm_scan(valid.astype(float), decay, weight)
+    count = nobs + np.cumsum(valid, axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        out = np.where(count >= length, s / w, np.nan)
+    return out, s, w, count
+
+
+def rma(x, length):
+    """pandas_ta rma (Wilder ortalaması)."""
+    return wilder_scan(x, length)[0]
+
+
+def rolling(x, length, reducer="mean"):
+    """Tam length değerlik pencerelerde mean/std/min/max/sum; eksik pencereler NaN."""
+    x = _as_float(x)
+    padded = np.concatenate([np.full((length - 1,) + x.shape[1:], np.nan), x])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, length, axis=0)
+    return getattr(windows, reducer)(axis=-1)
+
+
+def true_range(high, low, close):
+    prev_close = shift(close)
+    return np.maximum(
+        _as_float(high) - low, np.maximum(np.abs(high - prev_close), np.abs(prev_close - low))
+    )
+
+
+def rsi(close, length=14):
+    change = _as_float(close) - shift(close)
+    gain = np.where(change < 0, 0.0, change)
+    loss = np.where(change > 0, 0.0, -change)
+    avg_gain, avg_loss = rma(gain, length), rma(loss, length)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return 100 * avg_gain / (avg_gain + avg_loss)
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """(macd, histogram, signal) döndürür."""
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, line - signal_line, signal_line
+
+
+def atr(high, low, close, length=14):
+    return rma(true_range(high, low, close), length)
+
+
+def adx(high, low, close, length=14):
+    """(adx, dmp, dmn) döndürür."""
+    high, low = _as_float(high), _as_float(low)
+    up, dn = high - shift(high), shift(low) - low
+    pos = np.where(np.isnan(up), np.nan, np.where((up > dn) & (up > 0), up, 0.0))
+    neg = np.where(np.isnan(dn), np.nan, np.where((dn > up) & (dn > 0), dn, 0.0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        k = 100 / atr(high, low, close, length)
+        dmp = k * rma(pos, length)
+        dmn = k * rma(neg, length)
+        dx = 100 * np.abs(dmp - dmn) / (dmp + dmn)
+    return rma(dx, length), dmp, dmn
+
+
+def obv(close, volume):
+    change = _as_float(close) - shift(close)
+    # pandas_ta signed_series: ilk bar +1 sayılır; boş barlar toplamı bozmaz.
+    signed = np.where(np.isnan(change), 1.0, np.sign(change)) * volume
+    out = np.nancumsum(signed, axis=0)
+    out[np.isnan(signed)] = np.nan
+    return out
+
+
+def stochrsi(close, length=14, rsi_length=14, k=3, d=3):
+    """(stochrsi_k, stochrsi_d) döndürür."""
+    value = rsi(close, rsi_length)
+    lowest, highest = rolling(value, length, "min"), rolling(value, length, "max")
+    spread = highest - lowest
+    # pandas_ta non_zero_range: sıfır aralık epsilon ile değiştirilir.
+    stoch = 100 * (value - lowest) / np.where(spread == 0, np.finfo(float).eps, spread)
+    stoch_k = rolling(stoch, k, "mean")
+    return stoch_k, rolling(stoch_k, d, "mean")
+
+
+def bbands(close, length=20, std=2.0):
+    """(alt, orta, üst, genişlik) döndürür; standart sapma ddof=0."""
+    close = _as_float(close)
+    padded = np.concatenate([np.full((length - 1,) + close.shape[1:], np.nan), close])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, length, axis=0)
+    mid, deviation = windows.mean(axis=-1), windows.std(axis=-1)
+    lower, upper = mid - std * deviation, mid + std * deviation
+    return lower, mid, upper, (upper - lower) / mid
+
+
+def supertrend_scan(close, upperband, lowerband, direction=1, prev_ub=np.nan, prev_lb=np.nan, started=False):
+    """
+    pandas_ta supertrend döngüsü (1-B). Önceki barın yönü ve bantlarından devam eder;
+    (trend, yön, long, short, (yön, üst bant, alt bant)) döndürür.
+
+    Döngü sade float'lar üzerinde çalışır; derleyiciye (numba vb.) uygun yapıdadır.
+    """
+    close, ubs, lbs = _as_float(close).tolist(), _as_float(upperband).tolist(), _as_float(lowerband).tolist()
+    n = len(close)
+    trend, dirs = [0.0] * n, [1] * n
+    long, short = [np.nan] * n, [np.nan] * n
+    d = direction
+    for i in range(n):
+        ub, lb = ubs[i], lbs[i]
+        if not started:
+            # pandas_ta döngüsü ikinci bardan başlar; ilk barın trendi 0'dır.
+            started = True
+            d = 1
+        else:
+            if close[i] > prev_ub:
+                d = 1
+            elif close[i] < prev_lb:
+                d = -1
+            else:
+                if d > 0 and lb < prev_lb:
+                    lb = prev_lb
+                if d < 0 and ub > prev_ub:
+                    ub = prev_ub
+            if d > 0:
+                trend[i] = long[i] = lb
+            else:
+                trend[i] = short[i] = ub
+        dirs[i] = d
+        prev_ub, prev_lb = ub, lb
+    return (
+        np.array(trend), np.array(dirs, dtype=np.int64), np.array(long), np.array(short),
+        (d, prev_ub, prev_lb),
+    )
+
+
+def supertrend(high, low, close, length=7, multiplier=3.0):
+    """(trend, yön, long, short) döndürür. 2-B girdide her hisse ilk geçerli barından başlar."""
+    high, low, close = _as_float(high), _as_float(low), _as_float(close)
+    matr = multiplier * atr(high, low, close, length)
+    hl2 = 0.5 * (high + low)
+    upperband, lowerband = hl2 + matr, hl2 - matr
+    if close.ndim == 1:
+        return supertrend_scan(close, upperband, lowerband)[:4]
+
+    outputs = [np.full(close.shape, np.nan) for _ in range(4)]
+    outputs[1] = np.ones(close.shape, dtype=np.int64)
+    valid = ~np.isnan(close)
+    for j in range(close.shape[1]):
+        if not valid[:, j].any():
+            continue
+        start = valid[:, j].argmax()
+        column = supertrend_scan(close[start:, j], upperband[start:, j], lowerband[start:, j])
+        for out, values in zip(outputs, column[:4]):
+            out[start:, j] = values
+    return tuple(outputs)
+
+
+def midprice(high, low, length):
+    return 0.5 * (rolling(high, length, "max") + rolling(low, length, "min"))
+
+
+def ichimoku(high, low, close, tenkan=9, kijun=26, senkou=52):
+    """(span_a, span_b, tenkan_sen, kijun_sen, chikou) döndürür (pandas_ta ichimoku)."""
+    tenkan_sen = midprice(high, low, tenkan)
+    kijun_sen = midprice(high, low, kijun)
+    span_a = shift(0.5 * (tenkan_sen + kijun_sen), kijun)
+    span_b = shift(midprice(high, low, senkou), kijun)
+    return span_a, span_b, tenkan_sen, kijun_sen, shift(close, -kijun)
+
+
+def day_codes(index):
+    """Zaman indeksini tamsayı gün kodlarına çevirir; saat dilimli indekste yerel gün kullanılır."""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype("datetime64[D]").astype(np.int64)
+
+
+def session_cumsum(values, day, prev_day=None, carry=0.0):
+    """
+    Gün kodu değiştiğinde sıfırlanan kümülatif toplam (0. eksen boyunca, döngüsüz).
+    prev_day ve carry bir önceki parçanın son günü ve toplamıdır; ilk bar aynı güne
+    aitse toplam kaldığı yerden sürer. Boş değerler toplamı bozmaz, kendileri NaN kalır.
+    day 1-B olabileceği gibi values ile aynı biçimde (hisse başına ayrı günler) de olabilir.
+    """
+    values, day = _as_float(values), np.asarray(day)
+    if len(day) == 0:
+        return values.copy()
+    missing = np.isnan(values)
+    filled = np.where(missing, 0.0, values)
+    starts = np.empty(day.shape, dtype=bool)
+    starts[0] = day[0] != prev_day
+    starts[1:] = day[1:] != day[:-1]
+
+    cs = np.cumsum(filled, axis=0)
+    # Her bar için içinde bulunduğu seansın ilk barı (seans önceki parçadan sürüyorsa -1)
+    last_start = np.maximum.accumulate(np.where(starts, _rows(day), -1), axis=0)
+    last_start = np.broadcast_to(
+        last_start.reshape(last_start.shape + (1,) * (values.ndim - day.ndim)), values.shape
+    )
+    base = np.take_along_axis(cs - filled, np.clip(last_start, 0, None), axis=0)
+    out = cs - np.where(last_start < 0, -np.asarray(carry, dtype=float), base)
+    out[missing] = np.nan
+    return out
+
+
+def session_vwap(high, low, close, volume, day):
+    """(tipik fiyat, tp*hacim, kümülatif tp*hacim, kümülatif hacim, VWAP) döndürür; her gün sıfırlanır."""
+    typical_price = (_as_float(high) + low + close) / 3
+    tp_volume = typical_price * volume
+    cum_tp_volume = session_cumsum(tp_volume, day)
+    cum_volume = session_cumsum(volume, day)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return typical_price, tp_volume, cum_tp_volume, cum_volume, cum_tp_volume / cum_volume
+
+
+def anchored_vwap(high, low, close, volume, anchors):
+    """
+    Her başlangıç indisinden (örn. son dip, golden cross, bilanço tarihi) itibaren
+    VWAP. (bar x başlangıç) matrisi döndürür; başlangıçtan önceki barlar NaN.
+    Tüm başlangıçlar tek bir kümülatif toplam farkıyla hesaplanır.
+    """
+    tp_volume = (_as_float(high) + low + close) / 3 * volume
+    cs_tp_volume = np.concatenate([[0.0], np.cumsum(tp_volume)])
+    cs_volume = np.concatenate([[0.0], np.cumsum(_as_float(volume))])
+    anchors = np.atleast_1d(np.asarray(anchors, dtype=np.int64))
+    numerator = cs_tp_volume[1:, np.newaxis] - cs_tp_volume[anchors][np.newaxis, :]
+    denominator = cs_volume[1:, np.newaxis] - cs_volume[anchors][np.newaxis, :]
+    started = np.arange(len(tp_volume))[:, np.newaxis] >= anchors[np.newaxis, :]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(started, numerator / denominator, np.nan)
@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+
+from helpers import data_store
+from helpers import indicator_kernels as kernels
+from helpers.dtype_policy import compact_frame
+from helpers.indicator_engine import BASE_GROUPS, INDICATOR_COLUMNS, INDICATOR_GROUPS
+
+# Çok hisseli gösterge hesabı. Her fiyat alanı (tarih x hisse) geniş bir matris olarak
+# tutulur; indicator_kernels çekirdekleri 0. eksen boyunca çalıştığı için tüm hisseler
+# tek çağrıda, sütun bazında hesaplanır. Sonuç (tarih, hisse) satırlı düzenli (tidy)
+# bir tablodur; tek hisse için calculate_indicators ile aynı sütun adlarını kullanır.
+
+PANEL_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def build_panel(frames):
+    """{hisse: OHLCV DataFrame} sözlüğünü {alan: (tarih x hisse) DataFrame} paneline çevirir."""
+    return {
+        field: pd.DataFrame({hisse: veri[field] for hisse, veri in frames.items()}).sort_index()
+        for field in PANEL_FIELDS
+    }
+
+
+def load_panel(hisse_list, interval, start_date=None, end_date=None):
+    """Yerel depodaki hisselerden panel kurar; depoda olmayan hisseler atlanır."""
+    frames = {}
+    for hisse_kodu in hisse_list:
+        veri = data_store.read_bars(hisse_kodu, interval, start_date, end_date)
+        if veri is not None and not veri.empty:
+            frames[hisse_kodu] = veri
+    return build_panel(frames)
+
+
+def _pack(panel):
+    """
+    Her hissenin gerçekten işlem gördüğü barları kendi sütununun başına toplar; kısa
+    geçmişli hisselerin sütunları sonda NaN ile biter. Çekirdekler böylece her hisseyi
+    calculate_indicators'taki gibi yalnızca kendi barları üzerinde görür (halka arz
+    öncesi veya işlem durdurma günleri için yapay bar üretilmez). Çekirdekler nedensel
+    olduğundan sondaki boşluk önceki değerleri etkilemez.
+    (alan -> matris, gün kodu matrisi, konumlar, gerçek bar maskesi) döndürür; konumlar
+    maskedeki gözlemlerin (tarih-hisse sırasıyla) paketteki (satır, sütun) yerleridir.
+    """
+    close = panel["close"].to_numpy(dtype=float)
+    observed = ~np.isnan(close)
+    rows, cols = np.nonzero(observed)
+    packed_rows = (np.cumsum(observed, axis=0) - 1)[rows, cols]
+    depth = int(observed.sum(axis=0).max()) if observed.size else 0
+
+    arrays = {}
+    for field in PANEL_FIELDS:
+        values = np.full((depth, close.shape[1]), np.nan)
+        values[packed_rows, cols] = panel[field].to_numpy(dtype=float)[rows, cols]
+        arrays[field] = values
+    day = np.full((depth, close.shape[1]), -1, dtype=np.int64)
+    day[packed_rows, cols] = kernels.day_codes(panel["close"].index)[rows]
+    return arrays, day, (packed_rows, cols), observed
+
+
+def _emas(out, bars, *lengths):
+    for length in lengths:
+        if f"ema_{length}" not in out:
+            out[f"ema_{length}"] = kernels.ema(bars["close"], length)
+
+
+def _short_emas(out, bars):
+    _emas(out, bars, 5, 20)
+
+
+def _long_emas(out, bars):
+    _emas(out, bars, 50, 200)
+
+
+def _bbands(out, bars):
+    (
+        out["bbl_20_2.0"],
+        out["bbm_20_2.0"],
+        out["bbu_20_2.0"],
+        out["bbw_20_2.0"],
+    ) = kernels.bbands(bars["close"], 20, 2.0)
+
+
+def _volume_ma(out, bars):
+    out["volume_ma_20"] = kernels.rolling(bars["volume"], 20, "mean")
+
+
+def _rsi(out, bars):
+    out["rsi_14"] = kernels.rsi(bars["close"], 14)
+
+
+def _macd(out, bars):
+    out["macd_12_26_9"], out["macdh_12_26_9"], out["macds_12_26_9"] = kernels.macd(bars["close"])
+
+
+def _atr(out, bars):
+    out["atr_14"] = kernels.atr(bars["high"], bars["low"], bars["close"], 14)
+    out["atrr_14"] = out["atr_14"] / bars["close"] * 100
+
+
+def _adx(out, bars):
+    out["adx_14"], out["dmp_14"], out["dmn_14"] = kernels.adx(bars["high"], bars["low"], bars["close"], 14)
+
+
+def _obv(out, bars):
+    out["obv"] = kernels.obv(bars["close"], bars["volume"])
+
+
+def _stochrsi(out, bars):
+    out["stochrsik_14_14_3_3"], out["stochrsid_14_14_3_3"] = kernels.stochrsi(bars["close"])
+
+
+def _supertrend(out, bars):
+    (
+        out["supert_7_3.0"],
+        out["supertd_7_3.0"],
+        out["supertl_7_3.0"],
+        out["superts_7_3.0"],
+    ) = kernels.supertrend(bars["high"], bars["low"], bars["close"], 7, 3.0)
+
+
+def _ichimoku(out, bars):
+    (
+        out["isa_9"],
+        out["isb_26"],
+        out["its_9"],
+        out["iks_26"],
+        out["ics_26"],
+    ) = kernels.ichimoku(bars["high"], bars["low"], bars["close"])
+
+
+def _vwap(out, bars):
+    (
+        out["typical_price"],
+        out["tp_volume"],
+        out["cum_tp_volume"],
+        out["cum_volume"],
+        out["vwap_d"],
+    ) = kernels.session_vwap(bars["high"], bars["low"], bars["close"], bars["volume"], bars["day"])
+
+
+def _crosses(out, bars):
+    _long_emas(out, bars)
+    fast, slow = out["ema_50"], out["ema_200"]
+    prev_fast, prev_slow = kernels.shift(fast), kernels.shift(slow)
+    out["golden_cross"] = (prev_fast < prev_slow) & (fast > slow)
+    out["death_cross"] = (prev_fast > prev_slow) & (fast < slow)
+
+
+# Arayüzdeki gösterge adı -> sütunlarını panele yazan fonksiyon (INDICATOR_GROUPS ile aynı adlar)
+PANEL_GROUPS = {
+    "EMA KISA (5, 20)": _short_emas,
+    "EMA UZUN (50, 200)": _long_emas,
+    "Bollinger Bantları": _bbands,
+    "Hacim Ortalaması": _volume_ma,
+    "RSI": _rsi,
+    "MACD": _macd,
+    "ATR": _atr,
+    "ADX": _adx,
+    "OBV": _obv,
+    "StochRSI": _stochrsi,
+    "Super Trend": _supertrend,
+    "Ichimoku Cloud": _ichimoku,
+    "VWAP": _vwap,
+    "Golden/Death Cross": _crosses,
+}
+
+
+def compute_panel(panel, groups=None):
+    """
+    Paneldeki tüm hisseler için göstergeleri tek geçişte hesaplar.
+
+    panel, build_panel/load_panel çıktısı gibi alan -> (tarih x hisse) tablo eşlemesidir.
+    groups arayüzdeki gösterge adlarıdır (None: hepsi). (date, ticker) çok düzeyli indeksli,
+    fiyat ve gösterge sütunlu tablo döndürür; yalnızca hissenin gerçekten işlem gördüğü
+    satırlar yer alır. Tek hisse için sonuc.xs(hisse, level="ticker") kullanılabilir.
+    """
+    index, tickers = panel["close"].index, panel["close"].columns
+    arrays, day, positions, observed = _pack(panel)
+    bars = dict(arrays, day=day)
+
+    selected = list(INDICATOR_GROUPS) if groups is None else list(BASE_GROUPS) + list(groups)
+    out = {}
+    for group in dict.fromkeys(selected):
+        if group in PANEL_GROUPS:
+            PANEL_GROUPS[group](out, bars)
+
+    keep = observed.ravel()
+    rows = pd.MultiIndex.from_product([index, tickers], names=["date", "ticker"])[keep]
+    data = {field: panel[field].to_numpy().ravel()[keep] for field in PANEL_FIELDS}
+    wanted = [c for c in INDICATOR_COLUMNS if c in out] + [c for c in out if c not in INDICATOR_COLUMNS]
+    for column in wanted:
+        data[column] = np.asarray(out[column])[positions]
+    return compact_frame(pd.DataFrame(data, index=rows))
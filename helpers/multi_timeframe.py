@@ -0,0 +1,102 @@
+import pandas as pd
+
+from helpers import data_store
+from helpers.data_handler import (
+    BIST_SESSION_OPEN,
+    RESAMPLE_SOURCES,
+    calculate_indicators,
+    resample_ohlcv,
+)
+
+# Üst zaman aralığı göstergelerini (ör. 60m grafikte günlük EMA 200) alt aralığın
+# indeksine taşır. Üst aralık barları yeni indirme yapılmadan, yüklü alt aralık
+# barlarının ve yerel deponun yeniden örneklenmesiyle kurulur. Her alt bar, kendi
+# döneminden önce tamamlanmış son üst barın değerini görür; henüz kapanmamış
+# dönemin değeri kullanılmadığı için geleceğe bakma (look-ahead) olmaz.
+
+TIMEFRAME_ORDER = ("15m", "30m", "60m", "1d", "1wk", "1mo")
+
+# Arayüzdeki seçenek -> (üst zaman aralığı, gösterge sütunu)
+MTF_OVERLAYS = {
+    "Günlük EMA 200": ("1d", "ema_200"),
+    "Haftalık RSI": ("1wk", "rsi_14"),
+}
+
+
+def overlay_column(interval, column):
+    """Taşınan göstergenin alt aralık verisindeki sütun adı (ör. ema_200_1d)."""
+    return f"{column}_{interval}"
+
+
+def is_higher_timeframe(interval, base_interval):
+    return TIMEFRAME_ORDER.index(interval) > TIMEFRAME_ORDER.index(base_interval)
+
+
+def period_labels(index, interval):
+    """Her zaman damgasının içinde bulunduğu üst aralık barının etiketi (resample_ohlcv ile aynı)."""
+    index = pd.DatetimeIndex(index)
+    if interval == "1d":
+        return index.normalize()
+    if interval == "1wk":
+        return (index - pd.to_timedelta(index.dayofweek, unit="D")).normalize()
+    if interval == "1mo":
+        return index.to_period("M").to_timestamp()
+    step = pd.Timedelta(interval.replace("m", "min"))
+    session_open = index.normalize() + BIST_SESSION_OPEN
+    return session_open + ((index - session_open) // step) * step
+
+
+def get_higher_timeframe_bars(hisse_kodu, veri, interval):
+    """
+    Üst aralık barlarını indirmeden kurar. Yüklü alt aralık barları yeniden örneklenir;
+    daha eski dönemler yerel depodaki üst aralık serisinden (yoksa onun ince
+    kaynağından) tamamlanır. Depodaki son bar güncel olmayabileceği için
+    o dönemden itibaren yeniden örneklenen barlar kullanılır.
+    """
+    resampled = resample_ohlcv(veri, interval)
+    stored = data_store.read_bars(hisse_kodu, interval)
+    if (stored is None or stored.empty) and interval in RESAMPLE_SOURCES:
+        source = data_store.read_bars(hisse_kodu, RESAMPLE_SOURCES[interval])
+        if source is not None and not source.empty:
+            stored = resample_ohlcv(source, interval)
+    if stored is None or stored.empty:
+        return resampled
+    if resampled.empty:
+        return stored
+
+    stored = stored[stored.index < min(stored.index[-1], resampled.index[0])]
+    return pd.concat([stored.reindex(columns=resampled.columns), resampled])
+
+
+def align_to_lower(values, lower_index, interval):
+    """
+    Üst aralık değerlerini alt aralık indeksine hizalar: her alt bar, kendi üst
+    döneminden önceki son üst barın değerini alır.
+    """
+    periods = period_labels(lower_index, interval)
+    positions = values.index.searchsorted(periods, side="left") - 1
+    aligned = values.iloc[positions.clip(min=0)]
+    aligned.index = lower_index
+    return aligned.where(pd.Series(positions >= 0, index=lower_index), axis=0)
+
+
+def add_higher_timeframe_indicators(hisse_kodu, base_interval, veri, selected_indicators=()):
+    """
+    Seçili üst aralık göstergelerini (bkz. MTF_OVERLAYS) veriye sütun olarak ekler.
+    Grafiğin aralığından kaba olmayan seçenekler atlanır.
+    """
+    overlays = [MTF_OVERLAYS[i] for i in selected_indicators if i in MTF_OVERLAYS]
+    by_interval = {}
+    for interval, column in overlays:
+        if is_higher_timeframe(interval, base_interval):
+            by_interval.setdefault(interval, []).append(column)
+
+    for interval, columns in by_interval.items():
+        higher = get_higher_timeframe_bars(hisse_kodu, veri, interval)
+        if higher.empty:
+            continue
+        computed = calculate_indicators(higher, hisse_kodu, interval)
+        aligned = align_to_lower(computed[columns], veri.index, interval)
+        for column in columns:
+            veri[overlay_column(interval, column)] = aligned[column].to_numpy()
+    return veri
@@ -2,11 +2,11 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
-import numpy as np
-from scipy.signal import find_peaks
 import logging
 import streamlit as st
 
+from helpers.support_resistance import get_recent_levels, strongest_zones
+
 
 def plot_candlestick_chart(
     veri,
@@ -16,13 +16,20 @@ def plot_candlestick_chart(
     selected_indicators,
     show_support_resistance,
     show_fibonacci=False,
+    events=None,
+    interval=None,
 ):
-    """Ana teknik analiz grafiğini oluşturur."""
+    """
+    Ana teknik analiz grafiğini oluşturur. events (olay dizini dilimi) verilirse
+    kesişim işaretleri sütun taraması yerine bu dilimden alınır. interval verilirse
+    destek/direnç bölgeleri önbellekten gelir.
+    """
 
     # Göstergelerin hangi alt grafiğe ait olduğunu ve başlıklarını tanımla
     indicator_subplot_map = {
         "RSI": ("RSI & StochRSI", 3),
         "StochRSI": ("RSI & StochRSI", 3),
+        "Haftalık RSI": ("RSI & StochRSI", 3),
         "MACD": ("MACD", 4),
         "ADX": ("ADX", 5),
         "OBV": ("OBV", 6),
@@ -189,6 +196,29 @@ def plot_candlestick_chart(
                 row=1,
                 col=1,
             )
+            for sutun in [c for c in veri.columns if c.startswith("avwap_")]:
+                fig.add_trace(
+                    go.Scatter(
+                        x=veri.index,
+                        y=veri[sutun],
+                        name=f"AVWAP ({sutun[len('avwap_'):]})",
+                        line=dict(width=1, dash="dashdot"),
+                    ),
+                    row=1,
+                    col=1,
+                )
+
+        if "Günlük EMA 200" in selected_indicators and "ema_200_1d" in veri.columns:
+            fig.add_trace(
+                go.Scatter(
+                    x=veri.index,
+                    y=veri["ema_200_1d"],
+                    name="Günlük EMA 200",
+                    line=dict(color="purple", width=1.5, dash="dash", shape="hv"),
+                ),
+                row=1,
+                col=1,
+            )
 
         if "Ichimoku Cloud" in selected_indicators:
             fig.add_trace(
@@ -281,6 +311,18 @@ def plot_candlestick_chart(
                 y=30, line_dash="dash", line_color="green", row=rsi_row, col=1
             )
 
+        if "Haftalık RSI" in selected_indicators and 3 in row_mapping and "rsi_14_1wk" in veri.columns:
+            fig.add_trace(
+                go.Scatter(
+                    x=veri.index,
+                    y=veri["rsi_14_1wk"],
+                    name="Haftalık RSI",
+                    line=dict(dash="dash", shape="hv"),
+                ),
+                row=row_mapping[3],
+                col=1,
+            )
+
         if "StochRSI" in selected_indicators and 3 in row_mapping:
             stoch_row = row_mapping[3]
             fig.add_trace(
@@ -379,19 +421,17 @@ def plot_candlestick_chart(
     # Support and Resistance Levels
     if show_support_resistance:
         try:
-            # Find peaks and troughs with their properties
-            peak_indices, peak_props = find_peaks(
-                veri["high"], prominence=veri["high"].std() * 0.3, distance=15
-            )
-            trough_indices, trough_props = find_peaks(
-                -veri["low"], prominence=veri["low"].std() * 0.3, distance=15
-            )
+            # Taramalarla aynı sabit geçmiş; yalnızca görünen penceredeki pivotlar işaretlenir.
+            pivots, zones = get_recent_levels(hisse_kodu, interval, veri)
+            pivots = pivots[pivots["ts"] >= veri.index[0]]
+            peaks = pivots[pivots["kind"] == "peak"]
+            troughs = pivots[pivots["kind"] == "trough"]
 
             # Show markers for all detected peaks and troughs
             fig.add_trace(
                 go.Scatter(
-                    x=veri.index[peak_indices],
-                    y=veri["high"].iloc[peak_indices],
+                    x=peaks["ts"],
+                    y=peaks["price"],
                     mode="markers",
                     marker=dict(symbol="triangle-down", color="red", size=10),
                     name="Tepe",
@@ -399,40 +439,38 @@ def plot_candlestick_chart(
             )
             fig.add_trace(
                 go.Scatter(
-                    x=veri.index[trough_indices],
-                    y=veri["low"].iloc[trough_indices],
+                    x=troughs["ts"],
+                    y=troughs["price"],
                     mode="markers",
                     marker=dict(symbol="triangle-up", color="green", size=10),
                     name="Dip",
                 )
             )
 
-            # Get prominences and sort by them to find the most significant ones
-            if len(peak_indices) > 0:
-                peak_prominences = peak_props["prominences"]
-                top_peak_indices = peak_indices[np.argsort(peak_prominences)[-3:]]
-                for peak_idx in top_peak_indices:
-                    level = veri["high"].iloc[peak_idx]
-                    fig.add_hline(
-                        y=level,
-                        line_dash="dash",
-                        line_color="rgba(255, 0, 0, 0.7)",
-                        annotation_text=f"Direnç {level:.2f}",
-                        annotation_position="bottom right",
-                    )
-
-            if len(trough_indices) > 0:
-                trough_prominences = trough_props["prominences"]
-                top_trough_indices = trough_indices[np.argsort(trough_prominences)[-3:]]
-                for trough_idx in top_trough_indices:
-                    level = veri["low"].iloc[trough_idx]
+            # En güçlü bölgeler; tek seviyeli bölgeler çizgi, diğerleri bant olarak
+            for kind, label, color in (
+                ("resistance", "Direnç", "255, 0, 0"),
+                ("support", "Destek", "0, 255, 0"),
+            ):
+                for zone in strongest_zones(zones, kind).itertuples(index=False):
                     fig.add_hline(
-                        y=level,
+                        y=zone.level,
                         line_dash="dash",
-                        line_color="rgba(0, 255, 0, 0.7)",
-                        annotation_text=f"Destek {level:.2f}",
+                        line_color=f"rgba({color}, 0.7)",
+                        annotation_text=f"{label} {zone.level:.2f} ({zone.touches} temas)",
                         annotation_position="bottom right",
+                        row=1,
+                        col=1,
                     )
+                    if zone.high > zone.low:
+                        fig.add_hrect(
+                            y0=zone.low,
+                            y1=zone.high,
+                            line_width=0,
+                            fillcolor=f"rgba({color}, 0.12)",
+                            row=1,
+                            col=1,
+                        )
 
         except Exception as e:
             logging.warning(
@@ -472,8 +510,16 @@ def plot_candlestick_chart(
 
     # Golden Cross ve Death Cross işaretleri
     if "Golden/Death Cross" in selected_indicators:
-        golden_cross_data = veri[veri["golden_cross"]]
-        death_cross_data = veri[veri["death_cross"]]
+        if events is not None:
+            golden_cross_data = veri.loc[
+                veri.index.intersection(events.loc[events["event"] == "golden_cross", "ts"])
+            ]
+            death_cross_data = veri.loc[
+                veri.index.intersection(events.loc[events["event"] == "death_cross", "ts"])
+            ]
+        else:
+            golden_cross_data = veri[veri["golden_cross"]]
+            death_cross_data = veri[veri["death_cross"]]
 
         if not golden_cross_data.empty:
             fig.add_trace(
@@ -550,6 +596,8 @@ def display_candlestick_chart(
     selected_indicators,
     show_support_resistance,
     show_fibonacci=False,
+    events=None,
+    interval=None,
 ):
     """Generates and displays the candlestick chart in Streamlit."""
     fig = plot_candlestick_chart(
@@ -560,6 +608,8 @@ def display_candlestick_chart(
         selected_indicators,
         show_support_resistance,
         show_fibonacci,
+        events=events,
+        interval=interval,
     )
     st.plotly_chart(fig, use_container_width=True)
 
@@ -0,0 +1,203 @@
+import json
+import os
+
+import pandas as pd
+import yfinance as yf
+
+from helpers import rate_limiter
+
+# Kullanılacak sağlayıcı ortam değişkeniyle seçilir: "yfinance" (varsayılan) veya
+# "replay". Replay sağlayıcı, ağ olmadan (CI, benchmark, çevrimdışı demo) çalışır.
+PROVIDER_ENV_VAR = "BORSA_DATA_PROVIDER"
+REPLAY_DIR_ENV_VAR = "BORSA_REPLAY_DIR"
+DEFAULT_REPLAY_DIR = "replay_data"
+
+_OHLCV_COLUMNS = {
+    "open": "Open",
+    "high": "High",
+    "low": "Low",
+    "close": "Close",
+    "adj close": "Adj Close",
+    "volume": "Volume",
+}
+
+
+class MarketDataProvider:
+    """
+    Piyasa verisi kaynağı arayüzü.
+
+    download, yf.download ile aynı biçimde (büyük harfli sütunlar, hisse düzeyli
+    MultiIndex) bir DataFrame; ticker ise info/financials/balance_sheet/cashflow/
+    dividends/actions alanlarını sunan bir nesne döndürür.
+    """
+
+    name = "base"
+
+    def acquire(self, cost=1):
+        """İstek bütçesinden pay alır; yerel sağlayıcılarda bir şey yapmaz."""
+
+    def download(
+        self, tickers, start=None, end=None, interval="1d", group_by="column", threads=True
+    ):
+        """threads, çoklu hisse indirmesinin kendi içinde paralel yapılıp yapılmayacağıdır."""
+        raise NotImplementedError
+
+    def ticker(self, symbol):
+        raise NotImplementedError
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Canlı yfinance kaynağı; tüm istekler ortak hız sınırlayıcıdan geçer."""
+
+    name = "yfinance"
+
+    def acquire(self, cost=1):
+        rate_limiter.acquire(cost=cost)
+
+    def download(
+        self, tickers, start=None, end=None, interval="1d", group_by="column", threads=True
+    ):
+        with rate_limiter.DOWNLOAD_LOCK:
+            veri = yf.download(
+                tickers,
+                start=start,
+                end=end,
+                interval=interval,
+                group_by=group_by,
+                auto_adjust=False,
+                progress=False,
+                threads=threads,
+            )
+            rate_limiter.remember_download_errors()
+        return veri
+
+    def ticker(self, symbol):
+        return yf.Ticker(symbol)
+
+
+class _ReplayTicker:
+    """yf.Ticker'ın kullanılan alanlarını diskteki dosyalardan sunar."""
+
+    def __init__(self, directory):
+        self._dir = directory
+
+    def _read_frame(self, name):
+        path = os.path.join(self._dir, f"{name}.csv")
+        if not os.path.exists(path):
+            return pd.DataFrame()
+        return pd.read_csv(path, index_col=0)
+
+    @property
+    def info(self):
+        path = os.path.join(self._dir, "info.json")
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    @property
+    def financials(self):
+        return self._read_frame("financials")
+
+    @property
+    def balance_sheet(self):
+        return self._read_frame("balance_sheet")
+
+    @property
+    def cashflow(self):
+        return self._read_frame("cashflow")
+
+    @property
+    def dividends(self):
+        frame = self._read_frame("dividends")
+        if frame.empty:
+            return pd.Series(dtype=float)
+        frame.index = pd.to_datetime(frame.index)
+        return frame.iloc[:, 0]
+
+    @property
+    def actions(self):
+        frame = self._read_frame("actions")
+        if not frame.empty:
+            frame.index = pd.to_datetime(frame.index)
+        return frame
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Önceden kaydedilmiş dosyalardan veri sunan çevrimdışı sağlayıcı.
+
+    Fiyatlar yerel depo ile aynı düzende tutulur (<kök>/<interval>/<hisse>.parquet
+    veya .csv); bu yüzden market_data dizininin bir kopyası doğrudan kullanılabilir.
+    Temel veriler <kök>/fundamentals/<hisse>/ altında info.json ve tablo başına
+    bir CSV dosyasıdır.
+    """
+
+    name = "replay"
+
+    def __init__(self, root_dir=DEFAULT_REPLAY_DIR):
+        self.root_dir = root_dir
+
+    def _read_bars(self, symbol, interval):
+        base = os.path.join(self.root_dir, interval, symbol)
+        if os.path.exists(f"{base}.parquet"):
+            return pd.read_parquet(f"{base}.parquet")
+        if os.path.exists(f"{base}.csv"):
+            return pd.read_csv(f"{base}.csv", index_col=0, parse_dates=True)
+        return None
+
+    def download(
+        self, tickers, start=None, end=None, interval="1d", group_by="column", threads=True
+    ):
+        symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+        frames = {}
+        for symbol in symbols:
+            veri = self._read_bars(symbol, interval)
+            if veri is None:
+                continue
+            veri = veri.rename(columns=lambda c: _OHLCV_COLUMNS.get(c.lower(), c))
+            # yf.download ile aynı anlam: start dahil, end hariç.
+            if start is not None:
+                veri = veri[veri.index >= pd.to_datetime(start)]
+            if end is not None:
+                veri = veri[veri.index < pd.to_datetime(end)]
+            if not veri.empty:
+                frames[symbol] = veri
+        if not frames:
+            return pd.DataFrame()
+
+        veri = pd.concat(frames, axis=1, sort=True, names=["Ticker", "Price"])
+        if group_by != "ticker":
+            veri.columns = veri.columns.swaplevel(0, 1)
+            veri = veri.sort_index(axis=1, level=0)
+        return veri
+
+    def ticker(self, symbol):
+        return _ReplayTicker(os.path.join(self.root_dir, "fundamentals", symbol))
+
+
+_provider = None
+
+
+def _provider_from_env():
+    kind = os.environ.get(PROVIDER_ENV_VAR, "yfinance").lower()
+    if kind == "replay":
+        return ReplayProvider(os.environ.get(REPLAY_DIR_ENV_VAR, DEFAULT_REPLAY_DIR))
+    if kind != "yfinance":
+        raise ValueError(f"Bilinmeyen veri sağlayıcı: {kind}")
+    return YFinanceProvider()
+
+
+def get_provider():
+    """Etkin piyasa verisi sağlayıcısını döndürür."""
+    global _provider
+    if _provider is None:
+        _provider = _provider_from_env()
+    return _provider
+
+
+def set_provider(provider):
+    """Etkin sağlayıcıyı değiştirir (testler ve benchmark'lar için); öncekini döndürür."""
+    global _provider
+    previous, _provider = _provider, provider
+    return previous
@@ -0,0 +1,123 @@
+import random
+import time
+import logging
+import threading
+
+import yfinance as yf
+
+import helpers.database as db
+from helpers.exceptions import RateLimitError
+
+# Tüm yfinance çağrılarının paylaştığı kova. Hız, kısıtlama yanıtlarında yarıya iner
+# ve başarılı isteklerle MAX_REQUESTS_PER_SECOND değerine kademeli olarak geri döner.
+YFINANCE_BUCKET = "yfinance"
+MAX_REQUESTS_PER_SECOND = 5.0
+MIN_REQUESTS_PER_SECOND = 0.2
+RATE_RECOVERY_STEP = 0.1
+BURST = 10
+
+# Hata sonrası tekrar denemeler için tam rastgele (full jitter) üstel bekleme.
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# Art arda bu kadar kısıtlama yanıtında devre açılır ve istekler hiç gönderilmez.
+CIRCUIT_THROTTLE_THRESHOLD = 3
+CIRCUIT_OPEN_SECONDS = 120
+
+_THROTTLE_MARKERS = ("too many requests", "rate limit", "429")
+
+# yf.download sonuçlarını ve hatalarını modül düzeyindeki yfinance.shared sözlüklerinde
+# toplar ve her çağrıda sıfırlar; eş zamanlı iki indirme birbirinin sonuçlarını ezer.
+# Bu yüzden indirmeler bu kilitle sırayla yapılır ve hatalar, kilit bırakılmadan önce
+# çağıran iş parçacığına kopyalanır.
+DOWNLOAD_LOCK = threading.Lock()
+_download_errors = threading.local()
+
+
+def is_throttle_error(error):
+    """Hatanın sağlayıcının istek kısıtlamasından kaynaklanıp kaynaklanmadığını döndürür."""
+    if error is None:
+        return False
+    if isinstance(error, RateLimitError) or type(error).__name__ == "YFRateLimitError":
+        return True
+    message = str(error).lower()
+    return any(marker in message for marker in _THROTTLE_MARKERS)
+
+
+def remember_download_errors():
+    """Biten yf.download'ın hatalarını çağıran iş parçacığı için saklar; DOWNLOAD_LOCK içinde çağrılır."""
+    _download_errors.errors = dict(getattr(getattr(yf, "shared", None), "_ERRORS", None) or {})
+
+
+def download_throttled(tickers):
+    """
+    yf.download hataları yutup boş veri döndürür; bu iş parçacığının son indirmesinde
+    verilen hisselerden biri kısıtlama nedeniyle boş döndüyse True döndürür.
+    """
+    if isinstance(tickers, str):
+        tickers = [tickers]
+    errors = getattr(_download_errors, "errors", {})
+    return any(is_throttle_error(errors.get(t)) for t in tickers)
+
+
+def circuit_open_until():
+    """Devre açıksa kapanacağı zamanı (epoch saniye), değilse None döndürür."""
+    state = db.get_rate_limit_state(YFINANCE_BUCKET)
+    if state is not None and state["open_until"] > time.time():
+        return state["open_until"]
+    return None
+
+
+def acquire(cost=1):
+    """
+    cost kadar istek için kovadan jeton alır; gerekiyorsa sırası gelene kadar bekler.
+    Devre açıksa beklemeden RateLimitError fırlatır.
+    """
+    open_until = circuit_open_until()
+    if open_until is not None:
+        raise RateLimitError(
+            f"Veri sağlayıcı istekleri kısıtlıyor; {open_until - time.time():.0f} sn sonra tekrar denenecek."
+        )
+    wait = db.reserve_rate_limit_tokens(
+        YFINANCE_BUCKET, cost, MAX_REQUESTS_PER_SECOND, BURST
+    )
+    if wait > 0:
+        time.sleep(wait)
+
+
+def backoff_delay(attempt):
+    """attempt. tekrar denemeden önce beklenecek rastgele süre (saniye)."""
+    cap = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)
+    return random.uniform(0, cap)
+
+
+def wait_before_retry(attempt):
+    time.sleep(backoff_delay(attempt))
+
+
+def record_success():
+    """Başarılı bir isteği kaydeder; kısıtlanmış hız kademeli olarak toparlanır."""
+    db.record_rate_limit_success(
+        YFINANCE_BUCKET, MAX_REQUESTS_PER_SECOND, BURST, RATE_RECOVERY_STEP
+    )
+
+
+def record_failure(error):
+    """
+    Başarısız bir isteği kaydeder. Yalnızca kısıtlama hataları hızı düşürür ve
+    devre kesiciyi besler; sembole özgü hatalar bkz. symbol_health.
+    """
+    if not is_throttle_error(error):
+        return
+    opened = db.record_rate_limit_throttle(
+        YFINANCE_BUCKET,
+        MAX_REQUESTS_PER_SECOND,
+        BURST,
+        MIN_REQUESTS_PER_SECOND,
+        CIRCUIT_THROTTLE_THRESHOLD,
+        CIRCUIT_OPEN_SECONDS,
+    )
+    if opened:
+        logging.warning(
+            f"yfinance istekleri kısıtlıyor; istekler {CIRCUIT_OPEN_SECONDS} sn durduruldu."
+        )
@@ -0,0 +1,110 @@
+import functools
+import threading
+
+import pandas as pd
+
+
+class _Call:
+    """Devam eden tek bir çağrının sonucunu bekleyenlerle paylaşır."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+def _own(result):
+    """DataFrame/Series sonuçlarının kopyasını döndürür; diğer sonuçlar paylaşılır."""
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return result.copy()
+    return result
+
+
+def _freeze(value):
+    """Liste/sözlük gibi hash'lenemeyen argümanları anahtar olarak kullanılabilir hale getirir."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class SingleFlight:
+    """
+    Aynı anahtarla eş zamanlı gelen çağrıları tek bir çalıştırmada birleştirir.
+
+    İlk çağrı işi yürütür; o sürerken gelen özdeş çağrılar bekler ve aynı sonucu
+    (veya aynı hatayı) alır. DataFrame/Series sonuçlarında birleşen her çağrı kendi
+    kopyasını alır; biri sonucu yerinde değiştirse de diğerleri etkilenmez. Sonuç
+    saklanmaz: iş bittikten sonra gelen çağrı yeniden çalıştırılır, önbellekleme üst
+    katmanın görevidir.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._stats = {"calls": 0, "executed": 0, "coalesced": 0}
+
+    def do(self, key, func, *args, **kwargs):
+        """func(*args, **kwargs) sonucunu döndürür; aynı key için çalışan bir çağrı varsa onu bekler."""
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            if call is not None:
+                self._stats["coalesced"] += 1
+                call.waiters += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._stats["executed"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return _own(call.result)
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+        # Bekleyen yoksa kopyaya gerek yok; varsa ilk çağrı da paylaşılan nesneyi almaz.
+        return _own(call.result) if shared else call.result
+
+    def in_flight(self):
+        """Şu anda yürütülmekte olan farklı anahtar sayısı."""
+        with self._lock:
+            return len(self._calls)
+
+    def get_stats(self):
+        """Toplam, yürütülen ve birleştirilen çağrı sayılarını döndürür."""
+        with self._lock:
+            return dict(self._stats)
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {"calls": 0, "executed": 0, "coalesced": 0}
+
+
+def coalesce(flight):
+    """Fonksiyonu, argümanlarından türetilen anahtarla verilen SingleFlight üzerinden çalıştırır."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__name__, _freeze(args), _freeze(kwargs))
+            return flight.do(key, func, *args, **kwargs)
+
+        wrapper.flight = flight
+        return wrapper
+
+    return decorator
@@ -0,0 +1,212 @@
+import copy
+import math
+import numbers
+from collections import deque
+
+import pandas as pd
+
+from helpers import indicator_kernels as kernels
+
+# Bar bar (veya tik tik) beslenen göstergeler. Her nesne update(bar) ile yeni kapanan
+# barı işler ve value ile güncel değeri verir; durum sabit boyutludur (Bollinger için
+# pencere uzunluğu kadar). Formüller calculate_indicators / indicator_kernels ile
+# aynıdır. bar, open/high/low/close/volume (VWAP için timestamp) anahtarlı bir sözlük
+# ya da pandas satırıdır; yalnızca kapanışa bakan göstergelere düz fiyat da verilebilir.
+
+NAN = float("nan")
+
+
+def _field(bar, name):
+    # Düz fiyat; float32 tablolardan gelen NumPy skalerleri de (np.float32) dahil.
+    if isinstance(bar, numbers.Real):
+        return 0.0 if name == "volume" else float(bar)
+    return float(bar[name])
+
+
+def iter_bars(veri):
+    """DataFrame satırlarını update() için timestamp anahtarlı sözlükler olarak verir."""
+    for ts, row in zip(veri.index, veri.to_dict("records")):
+        row["timestamp"] = ts
+        yield row
+
+
+class StreamingIndicator:
+
+    value = NAN
+
+    def update(self, bar):
+        raise NotImplementedError
+
+    def preview(self, bar):
+        """
+        Barı kalıcı olarak işlemeden, bar bu haliyle kapanırsa oluşacak değeri döndürür
+        (henüz kapanmamış gün içi bar veya canlı tik için).
+        """
+        return copy.deepcopy(self).update(bar)
+
+
+class StreamingEma(StreamingIndicator):
+    """İlk length değerin ortalamasıyla başlayan EMA (kernels.ema)."""
+
+    def __init__(self, length):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = NAN
+
+    def update(self, bar):
+        x = _field(bar, "close")
+        if self.count < self.length:
+            # Baştaki boş değerler atlanır (MACD sinyali ilk geçerli değerden başlar).
+            if self.count == 0 and math.isnan(x):
+                return self.value
+            self.seed_sum += x
+            self.count += 1
+            if self.count == self.length:
+                self.value = self.seed_sum / self.length
+            return self.value
+        self.value = self.alpha * x + (1 - self.alpha) * self.value
+        return self.value
+
+
+class _Wilder:
+    """Wilder ortalaması (kernels.wilder_scan): ewm(alpha=1/length, adjust=True, min_periods=length)."""
+
+    def __init__(self, length):
+        self.length = length
+        self.decay = 1.0 - 1.0 / length
+        self.weighted_sum = 0.0
+        self.weight = 0.0
+        self.nobs = 0
+        self.value = NAN
+
+    def update(self, x):
+        valid = not math.isnan(x)
+        self.weighted_sum = (x if valid else 0.0) + self.decay * self.weighted_sum
+        self.weight = float(valid) + self.decay * self.weight
+        self.nobs += valid
+        if self.nobs >= self.length:
+            self.value = self.weighted_sum / self.weight
+        return self.value
+
+
+def _true_range(high, low, prev_close):
+    if math.isnan(prev_close):
+        return NAN
+    return max(high - low, abs(high - prev_close), abs(prev_close - low))
+
+
+class StreamingRsi(StreamingIndicator):
+
+    def __init__(self, length=14):
+        self.gain = _Wilder(length)
+        self.loss = _Wilder(length)
+        self.prev_close = NAN
+        self.value = NAN
+
+    def update(self, bar):
+        close = _field(bar, "close")
+        change = close - self.prev_close
+        self.prev_close = close
+        avg_gain = self.gain.update(max(change, 0.0) if not math.isnan(change) else NAN)
+        avg_loss = self.loss.update(max(-change, 0.0) if not math.isnan(change) else NAN)
+        total = avg_gain + avg_loss
+        self.value = 100 * avg_gain / total if total else NAN
+        return self.value
+
+
+class StreamingMacd(StreamingIndicator):
+    """value: (macd, histogram, sinyal)."""
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = StreamingEma(fast)
+        self.slow = StreamingEma(slow)
+        self.signal = StreamingEma(signal)
+        self.value = (NAN, NAN, NAN)
+
+    def update(self, bar):
+        close = _field(bar, "close")
+        line = self.fast.update(close) - self.slow.update(close)
+        signal = self.signal.update(line)
+        self.value = (line, line - signal, signal)
+        return self.value
+
+
+class StreamingBollinger(StreamingIndicator):
+    """value: (alt, orta, üst, genişlik); standart sapma ddof=0."""
+
+    def __init__(self, length=20, std=2.0):
+        self.length = length
+        self.std = std
+        self.window = deque(maxlen=length)
+        self.value = (NAN, NAN, NAN, NAN)
+
+    def update(self, bar):
+        self.window.append(_field(bar, "close"))
+        if len(self.window) < self.length:
+            return self.value
+        mid = math.fsum(self.window) / self.length
+        deviation = math.sqrt(math.fsum((x - mid) ** 2 for x in self.window) / self.length)
+        lower, upper = mid - self.std * deviation, mid + self.std * deviation
+        self.value = (lower, mid, upper, (upper - lower) / mid)
+        return self.value
+
+
+class StreamingAtr(StreamingIndicator):
+
+    def __init__(self, length=14):
+        self.average = _Wilder(length)
+        self.prev_close = NAN
+        self.value = NAN
+
+    def update(self, bar):
+        high, low, close = _field(bar, "high"), _field(bar, "low"), _field(bar, "close")
+        self.value = self.average.update(_true_range(high, low, self.prev_close))
+        self.prev_close = close
+        return self.value
+
+
+class StreamingSuperTrend(StreamingIndicator):
+    """value: (trend, yön). Bant düzeltmeleri kernels.supertrend_scan ile aynıdır."""
+
+    def __init__(self, length=7, multiplier=3.0):
+        self.atr = StreamingAtr(length)
+        self.multiplier = multiplier
+        self.started = False
+        self.direction, self.upper, self.lower = 1, NAN, NAN
+        self.value = (NAN, 1)
+
+    def update(self, bar):
+        high, low, close = _field(bar, "high"), _field(bar, "low"), _field(bar, "close")
+        band = self.multiplier * self.atr.update(bar)
+        hl2 = 0.5 * (high + low)
+        trend, direction, _, _, state = kernels.supertrend_scan(
+            [close], [hl2 + band], [hl2 - band], self.direction, self.upper, self.lower, self.started
+        )
+        self.started = True
+        self.direction, self.upper, self.lower = state
+        self.value = (float(trend[0]), int(direction[0]))
+        return self.value
+
+
+class StreamingVwap(StreamingIndicator):
+    """Her işlem gününde sıfırlanan VWAP; gün, bar zaman damgasının yerel tarihidir."""
+
+    def __init__(self):
+        self.day = None
+        self.cum_tp_volume = 0.0
+        self.cum_volume = 0.0
+        self.value = NAN
+
+    def update(self, bar):
+        ts = pd.Timestamp(bar["timestamp"])
+        day = (ts.tz_localize(None) if ts.tzinfo is not None else ts).date()
+        if day != self.day:
+            self.day, self.cum_tp_volume, self.cum_volume = day, 0.0, 0.0
+        volume = _field(bar, "volume")
+        typical_price = (_field(bar, "high") + _field(bar, "low") + _field(bar, "close")) / 3
+        self.cum_tp_volume += typical_price * volume
+        self.cum_volume += volume
+        self.value = self.cum_tp_volume / self.cum_volume if self.cum_volume else NAN
+        return self.value
@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import find_peaks
+
+from helpers import data_store
+from helpers.indicator_cache import ByteLRUCache, value_nbytes
+
+# Çok ölçekli destek/direnç bölgeleri. Tepe ve dipler birkaç pivot ölçeğinde (iki pivot
+# arasındaki en az bar sayısı) bulunur, birbirine yakın seviyeler fiyat bölgelerinde
+# toplanır ve her bölgenin kaç kez test edildiği (temas) sayılır. Seviyeler depodaki son
+# SR_LOOKBACK_BARS bar üzerinden hesaplanıp (hisse, aralık, pencere, son bar) başına
+# önbelleğe alınır; grafik ve taramalar aynı pencereyi, dolayısıyla aynı kaydı kullanır.
+
+SR_PIVOT_SCALES = (5, 15, 40)
+# Seviyelerin hesaplandığı sabit geçmiş (bar sayısı)
+SR_LOOKBACK_BARS = 500
+# Pivotun çevresinden en az bu kadar (fiyat standart sapmasının katı) belirgin olması gerekir.
+SR_PROMINENCE_STD = 0.3
+# Aralarındaki fark ortalama bar aralığının bu katından küçük seviyeler aynı bölgededir.
+SR_ZONE_WIDTH = 0.5
+# Grafikte her yönde gösterilen en güçlü bölge sayısı
+SR_MAX_ZONES = 3
+# Taramalarda "güçlü" sayılan bölgenin en az temas sayısı ve fiyata en fazla uzaklığı
+SR_STRONG_TOUCHES = 3
+SR_NEAR_DISTANCE = 0.02
+# Hesap yöntemi değişince eski önbellek kayıtları kullanılmasın diye artırılır.
+SR_VERSION = 1
+SR_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+ZONE_COLUMNS = ["low", "high", "level", "kind", "touches", "strength", "max_scale", "last_touch"]
+
+
+def _levels_nbytes(levels):
+    return sum(value_nbytes(part) for part in levels)
+
+
+SR_CACHE = ByteLRUCache(SR_CACHE_MAX_BYTES, sizeof=_levels_nbytes)
+
+
+def get_sr_cache_stats():
+    """Destek/direnç önbelleğinin isabet ve boyut istatistikleri."""
+    return SR_CACHE.get_stats()
+
+
+def _empty_pivots():
+    return pd.DataFrame(
+        {"ts": pd.Series(dtype="datetime64[ns]"), "price": pd.Series(dtype=float),
+         "kind": pd.Series(dtype=object), "scale": pd.Series(dtype=int)}
+    )
+
+
+def find_pivots(veri, scales=SR_PIVOT_SCALES):
+    """
+    Her ölçekte tepe (high) ve dipleri (low) bulur. Birden çok ölçekte bulunan bar bir
+    kez, en büyük ölçeğiyle yazılır. (ts, price, kind, scale) DataFrame'i döndürür;
+    kind tepeler için "peak", dipler için "trough"tur.
+    """
+    high = veri["high"].to_numpy(dtype=float)
+    low = veri["low"].to_numpy(dtype=float)
+    found = {}
+    for kind, values in (("peak", high), ("trough", -low)):
+        prominence = np.nanstd(values) * SR_PROMINENCE_STD
+        for scale in sorted(scales):
+            indices, _ = find_peaks(values, prominence=prominence, distance=scale)
+            for i in indices:
+                found[(i, kind)] = scale
+    if not found:
+        return _empty_pivots()
+    keys = sorted(found)
+    positions = np.array([i for i, _ in keys])
+    kinds = np.array([kind for _, kind in keys], dtype=object)
+    return pd.DataFrame(
+        {
+            "ts": veri.index[positions],
+            "price": np.where(kinds == "peak", high[positions], low[positions]),
+            "kind": kinds,
+            "scale": [found[key] for key in keys],
+        }
+    )
+
+
+def cluster_zones(pivots, tolerance, last_close, scales=SR_PIVOT_SCALES):
+    """
+    Fiyata göre sıralı pivotlarda ardışık fark tolerance'ı aşınca yeni bölge başlar.
+    Bölge seviyesi son kapanışın üstündeyse "resistance", altındaysa "support" olur.
+    strength, temasların ölçek sırasına (en küçük ölçek 1) göre ağırlıklı toplamıdır.
+    """
+    if pivots.empty:
+        return pd.DataFrame(columns=ZONE_COLUMNS)
+    ordered = pivots.sort_values("price", kind="stable")
+    prices = ordered["price"].to_numpy()
+    zone_id = np.concatenate([[0], np.cumsum(np.diff(prices) > tolerance)])
+    rank = {scale: i + 1 for i, scale in enumerate(sorted(scales))}
+    grouped = ordered.assign(zone=zone_id, weight=ordered["scale"].map(rank)).groupby("zone")
+    zones = pd.DataFrame(
+        {
+            "low": grouped["price"].min(),
+            "high": grouped["price"].max(),
+            "level": grouped["price"].mean(),
+            "touches": grouped.size(),
+            "strength": grouped["weight"].sum(),
+            "max_scale": grouped["scale"].max(),
+            "last_touch": grouped["ts"].max(),
+        }
+    )
+    zones["kind"] = np.where(zones["level"] > last_close, "resistance", "support")
+    zones = zones.sort_values(["strength", "last_touch"], ascending=False, kind="stable")
+    return zones[ZONE_COLUMNS].reset_index(drop=True)
+
+
+def _calculate_levels(veri, scales):
+    pivots = find_pivots(veri, scales)
+    tolerance = SR_ZONE_WIDTH * float(np.nanmean(veri["high"] - veri["low"]))
+    zones = cluster_zones(pivots, tolerance, float(veri["close"].iloc[-1]), scales)
+    return pivots, zones
+
+
+def get_levels(veri, hisse_kodu=None, interval=None, scales=SR_PIVOT_SCALES):
+    """
+    (pivotlar, bölgeler) döndürür; bölgeler güce göre azalan sıradadır. hisse_kodu ve
+    interval verilirse sonuç (hisse, aralık, ilk bar, son bar) anahtarıyla SR_CACHE'te
+    tutulur; aynı pencere yeniden çizildiğinde veya tarandığında tekrar hesaplanmaz.
+    Bölgelerin destek/direnç yönü son kapanışa bağlı olduğundan son barın değerleri de
+    anahtara girer (gün içinde güncellenen bar eski seviyeleri döndürmez).
+    """
+    if veri is None or veri.empty:
+        return _empty_pivots(), pd.DataFrame(columns=ZONE_COLUMNS)
+    if hisse_kodu is None or interval is None:
+        return _calculate_levels(veri, scales)
+    son_bar = tuple(veri[c].iloc[-1] for c in ("open", "high", "low", "close"))
+    key = (
+        hisse_kodu,
+        interval,
+        veri.index[0],
+        veri.index[-1],
+        len(veri),
+        son_bar,
+        tuple(scales),
+        SR_VERSION,
+    )
+    levels = SR_CACHE.get(key)
+    if levels is None:
+        levels = _calculate_levels(veri, scales)
+        SR_CACHE.put(key, levels)
+    return levels
+
+
+def _lookback_window(hisse_kodu, interval, veri=None):
+    stored = None
+    if hisse_kodu is not None and interval is not None:
+        stored = data_store.read_bars(hisse_kodu, interval)
+    if stored is not None and veri is not None and not veri.empty:
+        stored = stored.loc[: veri.index[-1]]
+    if stored is not None and not stored.empty:
+        veri = stored
+    if veri is None or veri.empty:
+        return None
+    return veri.iloc[-SR_LOOKBACK_BARS:]
+
+
+def get_recent_levels(hisse_kodu, interval, veri=None, scales=SR_PIVOT_SCALES):
+    """
+    Son SR_LOOKBACK_BARS bar üzerindeki seviyeler. Barlar yerel depodan okunur; veri
+    (ör. grafikteki pencere) verilirse depo onun son barında kesilir. Depoda bölüm
+    yoksa (ör. türetilen aralıklar) veri kullanılır.
+    """
+    return get_levels(_lookback_window(hisse_kodu, interval, veri), hisse_kodu, interval, scales)
+
+
+def strongest_zones(zones, kind, limit=SR_MAX_ZONES):
+    """Verilen yöndeki (support/resistance) en güçlü bölgeler."""
+    return zones[zones["kind"] == kind].head(limit)
+
+
+def find_stocks_near_support(
+    hisse_list,
+    interval,
+    max_distance=SR_NEAR_DISTANCE,
+    min_touches=SR_STRONG_TOUCHES,
+):
+    """
+    Yerel depodaki son kapanışı, en az min_touches temaslı bir destek bölgesinin üst
+    sınırına max_distance (oran) kadar yakın olan hisseleri döndürür.
+    """
+    rows = []
+    for hisse_kodu in hisse_list:
+        veri = _lookback_window(hisse_kodu, interval)
+        if veri is None:
+            continue
+        _, zones = get_levels(veri, hisse_kodu, interval)
+        support = zones[(zones["kind"] == "support") & (zones["touches"] >= min_touches)]
+        if support.empty:
+            continue
+        close = float(veri["close"].iloc[-1])
+        distance = (close - support["high"]).clip(lower=0) / close
+        nearest = distance.idxmin()
+        if distance[nearest] <= max_distance:
+            zone = support.loc[nearest]
+            rows.append(
+                {
+                    "hisse": hisse_kodu,
+                    "kapanis": close,
+                    "destek": zone["level"],
+                    "uzaklik": distance[nearest],
+                    "temas": int(zone["touches"]),
+                    "guc": int(zone["strength"]),
+                }
+            )
+    report = pd.DataFrame(rows, columns=["hisse", "kapanis", "destek", "uzaklik", "temas", "guc"])
+    return report.sort_values(["uzaklik", "guc"], ascending=[True, False]).reset_index(drop=True)
@@ -0,0 +1,117 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import helpers.database as db
+from helpers import rate_limiter
+from helpers.exceptions import RateLimitError
+from helpers.providers import get_provider
+from constants import HISSE_GRUPPARI
+
+DEFAULT_MAX_WORKERS = 4
+
+# symbol_master sütunu -> yfinance info anahtarı
+_INFO_FIELDS = {
+    "name": "longName",
+    "sector": "sector",
+    "industry": "industry",
+    "trailing_pe": "trailingPE",
+    "price_to_book": "priceToBook",
+    "profit_margins": "profitMargins",
+    "ebitda_margins": "ebitdaMargins",
+    "debt_to_equity": "debtToEquity",
+    "market_cap": "marketCap",
+}
+
+
+def _to_float(value):
+    """info'daki sayısal alanları REAL sütuna yazılabilir hale getirir ('Infinity' vb. dahil)."""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if pd.notna(value) and abs(value) != float("inf") else None
+
+
+def record_from_info(symbol, info):
+    """yfinance info sözlüğünden bir symbol_master kaydı üretir."""
+    record = {"symbol": symbol}
+    for column, key in _INFO_FIELDS.items():
+        value = info.get(key)
+        record[column] = value if column in ("name", "sector", "industry") else _to_float(value)
+    return record
+
+
+def _fetch_record(symbol):
+    """Tek bir sembolün info verisini çeker; (kayıt, hata) döndürür."""
+    provider = get_provider()
+    try:
+        provider.acquire()
+        info = provider.ticker(symbol).info
+    except RateLimitError:
+        raise
+    except Exception as e:
+        rate_limiter.record_failure(e)
+        if not rate_limiter.is_throttle_error(e):
+            db.record_symbol_failure(symbol, "fundamental", e)
+        return None, str(e)
+    if not info or not info.get("sector"):
+        db.record_symbol_failure(symbol, "fundamental", "Sektör bilgisi yok")
+        return None, "Sektör bilgisi yok"
+    rate_limiter.record_success()
+    return record_from_info(symbol, info), None
+
+
+def refresh_symbol_master(hisseler=None, max_workers=DEFAULT_MAX_WORKERS, skip_blocked=True):
+    """
+    Sembol ana tablosunu (sektör, endüstri, temel oranlar) paralel olarak yeniler.
+
+    Args:
+        hisseler (list): '.IS' eki olmadan hisse kodları. Varsayılan "Tüm Hisseler".
+        max_workers (int): Aynı anda yapılan info isteği sayısı (hız sınırlayıcıya tabidir).
+        skip_blocked (bool): Temel veri bekleme süresindeki semboller atlanır.
+
+    Returns:
+        tuple: (hisse başına sonuç DataFrame'i, toplam süre saniye)
+    """
+    if hisseler is None:
+        hisseler = HISSE_GRUPPARI["Tüm Hisseler"]
+    tickers = [f"{h}.IS" for h in dict.fromkeys(hisseler)]
+
+    rows = []
+    if skip_blocked:
+        blocked = db.get_blocked_symbols("fundamental")
+        rows = [
+            {"hisse": t, "durum": "atlandı", "sektor": None, "hata": "Bekleme süresinde"}
+            for t in tickers
+            if t in blocked
+        ]
+        tickers = [t for t in tickers if t not in blocked]
+
+    def _safe_fetch(symbol):
+        try:
+            return _fetch_record(symbol)
+        except RateLimitError as e:
+            return None, str(e)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(_safe_fetch, tickers))
+    elapsed = time.perf_counter() - started
+
+    records = []
+    for symbol, (record, error) in zip(tickers, results):
+        if record is None:
+            rows.append({"hisse": symbol, "durum": "hata", "sektor": None, "hata": error})
+        else:
+            records.append(record)
+            rows.append({"hisse": symbol, "durum": "ok", "sektor": record["sector"], "hata": None})
+    if records:
+        db.upsert_symbol_master(records)
+    logging.info(f"Sembol ana tablosu güncellendi: {len(records)}/{len(tickers)} sembol.")
+
+    report = pd.DataFrame(rows, columns=["hisse", "durum", "sektor", "hata"])
+    report["hisse"] = report["hisse"].str.replace(".IS", "", regex=False)
+    return report.sort_values("hisse").reset_index(drop=True), elapsed
@@ -1,6 +1,6 @@
 import pandas as pd
 import streamlit as st
-from helpers.data_handler import get_fundamental_data
+from helpers.data_handler import get_fundamental_data, iter_fundamental_info
 import numpy as np
 
 # Bu dosya, hem Streamlit hem de Tkinter uygulamaları için metin tabanlı özetler üretir.
@@ -467,44 +467,55 @@ def generate_ai_analysis(veri):
 
     return sonuc, analiz_ozeti
 
+def _key_metrics_row(hisse, info, error):
+    """Karşılaştırma tablosu için tek bir hissenin satırını üretir."""
+    if error is not None:
+        return {"Hisse": hisse, "F/K": "Hata"}
+    if not info:
+        return {"Hisse": hisse, "F/K": "Veri Yok"}
+    return {
+        "Hisse": hisse,
+        "Piy. Değ. (mn)": info.get("marketCap", 0) / 1_000_000,
+        "F/K": info.get("trailingPE"),
+        "PD/DD": info.get("priceToBook"),
+        "Kâr Marjı (%)": info.get("profitMargins", 0) * 100,
+        "Özkaynak Kâr. (%)": info.get("returnOnEquity", 0) * 100,
+        "Borç/Özkaynak": info.get("debtToEquity"),
+    }
+
+
 def display_key_metrics_comparison(hisse_list):
     """
     Fetches and displays a comparison table of key fundamental metrics for a list of stocks.
+
+    Hisseler paralel çekilir; her sonuç geldikçe tablo güncellenir.
     """
-    metrics_data = []
-    
     st.subheader("Temel Metrikler Karşılaştırması")
-    
+
     progress_text = "Temel metrikler çekiliyor..."
     progress_bar = st.progress(0, text=progress_text)
-    
-    for i, hisse in enumerate(hisse_list):
-        hisse_yf = f"{hisse}.IS"
-        try:
-            data = get_fundamental_data(hisse_yf)
-            if data and data.get("info"):
-                info = data["info"]
-                metrics = {
-                    "Hisse": hisse,
-                    "Piy. Değ. (mn)": info.get("marketCap", 0) / 1_000_000,
-                    "F/K": info.get("trailingPE"),
-                    "PD/DD": info.get("priceToBook"),
-                    "Kâr Marjı (%)": info.get("profitMargins", 0) * 100,
-                    "Özkaynak Kâr. (%)": info.get("returnOnEquity", 0) * 100,
-                    "Borç/Özkaynak": info.get("debtToEquity"),
-                }
-                metrics_data.append(metrics)
-            else:
-                metrics_data.append({"Hisse": hisse, "F/K": "Veri Yok"})
-        except Exception as e:
-            st.warning(f"{hisse} için temel veriler alınırken hata oluştu: {e}")
-            metrics_data.append({"Hisse": hisse, "F/K": "Hata"})
-            
-        progress_bar.progress((i + 1) / len(hisse_list), text=f"{progress_text} ({hisse} tamamlandı)")
+    table = st.empty()
+
+    rows = {}
+    tickers = {f"{hisse}.IS": hisse for hisse in hisse_list}
+    for hisse_yf, info, error in iter_fundamental_info(list(tickers)):
+        hisse = tickers[hisse_yf]
+        if error is not None:
+            st.warning(f"{hisse} için temel veriler alınırken hata oluştu: {error}")
+        rows[hisse] = _key_metrics_row(hisse, info, error)
+        progress_bar.progress(
+            len(rows) / len(tickers), text=f"{progress_text} ({hisse} tamamlandı)"
+        )
+        # Gelen satırlar, kullanıcının seçtiği sırayla ara tabloya yazılır.
+        table.dataframe(
+            pd.DataFrame([rows[h] for h in hisse_list if h in rows]).set_index("Hisse")
+        )
 
     progress_bar.empty()
+    metrics_data = [rows[h] for h in hisse_list if h in rows]
 
     if not metrics_data:
+        table.empty()
         st.warning("Karşılaştırma için hiçbir hisseden veri alınamadı.")
         return
 
@@ -512,7 +523,7 @@ def display_key_metrics_comparison(hisse_list):
     df = df.set_index("Hisse")
     
     # Sütunları formatla
-    st.dataframe(
+    table.dataframe(
         df.style.format({
             "Piy. Değ. (mn)": "{:,.0f}",
             "F/K": "{:.2f}",
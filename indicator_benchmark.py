@@ -0,0 +1,92 @@
+import argparse
+import time
+
+# Proje kök dizinindeki diğer modülleri import edebilmek için
+import sys
+sys.path.append('.')
+
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+
+from helpers import data_store
+from helpers import indicator_kernels as kernels
+
+
+def _synthetic_bars(n, seed=0):
+    """Rastgele yürüyüşle n adet günlük bar üretir."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    spread = np.abs(rng.normal(0, 0.8, n)) + 0.05
+    return pd.DataFrame(
+        {
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(1_000, 100_000, n).astype(float),
+        },
+        index=pd.date_range("2000-01-03", periods=n, freq="B"),
+    )
+
+
+def _best_time(func, repeat):
+    """func'ın repeat denemedeki en kısa süresini (ms) döndürür."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _cases(bars):
+    """Gösterge adı -> (pandas_ta çağrısı, çekirdek çağrısı)."""
+    h, l, c, v = bars["high"], bars["low"], bars["close"], bars["volume"]
+    ha, la, ca, va = (s.to_numpy(dtype=float) for s in (h, l, c, v))
+    return {
+        "ema_200": (lambda: ta.ema(c, length=200), lambda: kernels.ema(ca, 200)),
+        "bbands": (lambda: ta.bbands(c, length=20), lambda: kernels.bbands(ca, 20, 2.0)),
+        "rsi_14": (lambda: ta.rsi(c, length=14), lambda: kernels.rsi(ca, 14)),
+        "macd": (lambda: ta.macd(c), lambda: kernels.macd(ca)),
+        "atr_14": (lambda: ta.atr(h, l, c, length=14), lambda: kernels.atr(ha, la, ca, 14)),
+        "adx_14": (lambda: ta.adx(h, l, c, length=14), lambda: kernels.adx(ha, la, ca, 14)),
+        "obv": (lambda: ta.obv(c, v), lambda: kernels.obv(ca, va)),
+        "stochrsi": (lambda: ta.stochrsi(c), lambda: kernels.stochrsi(ca)),
+        "supertrend": (
+            lambda: ta.supertrend(h, l, c, length=7, multiplier=3),
+            lambda: kernels.supertrend(ha, la, ca, 7, 3.0),
+        ),
+        "ichimoku": (lambda: ta.ichimoku(h, l, c), lambda: kernels.ichimoku(ha, la, ca)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="pandas_ta ile NumPy gösterge çekirdeklerinin hızını karşılaştırır."
+    )
+    parser.add_argument("--bars", type=int, default=5000, help="Sentetik bar sayısı (varsayılan: 5000)")
+    parser.add_argument("--ticker", help="Sentetik veri yerine yerel depodaki hisse (örn. GARAN.IS)")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.ticker:
+        bars = data_store.read_bars(args.ticker, args.interval)
+        if bars is None or bars.empty:
+            parser.error(f"{args.ticker} ({args.interval}) yerel depoda bulunamadı.")
+    else:
+        bars = _synthetic_bars(args.bars)
+
+    print(f"{len(bars)} bar, en iyi {args.repeat} deneme (ms)")
+    print(f"{'gösterge':<12}{'pandas_ta':>12}{'çekirdek':>12}{'hızlanma':>10}")
+    toplam_ta = toplam_kernel = 0.0
+    for name, (ta_call, kernel_call) in _cases(bars).items():
+        ta_ms, kernel_ms = _best_time(ta_call, args.repeat), _best_time(kernel_call, args.repeat)
+        toplam_ta += ta_ms
+        toplam_kernel += kernel_ms
+        print(f"{name:<12}{ta_ms:>12.2f}{kernel_ms:>12.2f}{ta_ms / kernel_ms:>9.1f}x")
+    print(f"{'toplam':<12}{toplam_ta:>12.2f}{toplam_kernel:>12.2f}{toplam_ta / toplam_kernel:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
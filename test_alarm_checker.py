@@ -0,0 +1,51 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import alarm_checker
+import helpers.database as db
+from fixtures import sample_bars
+from helpers import dtype_policy
+
+
+class TestAlarmChecker(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._orig_db = db.DB_FILE
+        self._orig_policy = dtype_policy.DTYPE_POLICY
+        db.DB_FILE = os.path.join(self._tmp_dir, "test_alarms.db")
+        db.init_db()
+        dtype_policy.DTYPE_POLICY = "compact"
+
+    def tearDown(self):
+        db.DB_FILE = self._orig_db
+        dtype_policy.DTYPE_POLICY = self._orig_policy
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def _check(self, close):
+        """Son kapanışı close olan, get_stock_data gibi küçültülmüş barlarla alarmları kontrol eder."""
+        bars = sample_bars(30, seed=2, base=120)
+        bars.iloc[-1, bars.columns.get_loc("close")] = close
+        veri = dtype_policy.compact_frame(bars)
+        with mock.patch.object(alarm_checker, "get_stock_data", return_value=veri), \
+                mock.patch.object(alarm_checker.notification, "notify") as notify:
+            alarm_checker.check_alarms()
+        return notify
+
+    def test_price_alarm_at_exact_threshold(self):
+        """Fiyat eşiğe tam eşitse >= alarmı tetiklenmeli, eşiğin altındaki <= alarmı tetiklenmemeli."""
+        db.add_alarm("GARAN", "Fiyat >=", 123.45)
+        db.add_alarm("GARAN", "Fiyat <=", 123.44)
+        notify = self._check(123.45)
+
+        self.assertEqual(notify.call_count, 1)
+        alarms = db.get_all_alarms()
+        durum = dict(zip(alarms["condition_type"], alarms["status"]))
+        self.assertEqual(durum, {"Fiyat >=": "triggered", "Fiyat <=": "active"})
+
+
+if __name__ == '__main__':
+    unittest.main()
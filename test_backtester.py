@@ -0,0 +1,79 @@
+import os
+import unittest
+import shutil
+import tempfile
+import numpy as np
+
+from fixtures import sample_bars
+from helpers import backtester
+
+
+STAT_KEYS = ["Return [%]", "Sharpe Ratio", "Max. Drawdown [%]", "Win Rate [%]", "# Trades"]
+
+
+class TestVectorizedBacktest(unittest.TestCase):
+    """Vektörel motor backtesting.py ile aynı işlemleri ve istatistikleri üretmeli."""
+
+    def setUp(self):
+        self.bars = sample_bars(900, seed=3, start="2015-01-05", base=100)
+        # run_backtest bokeh grafiğini çalışma dizinine HTML olarak yazar.
+        self._orig_cwd = os.getcwd()
+        self._tmp_dir = tempfile.mkdtemp()
+        os.chdir(self._tmp_dir)
+
+    def tearDown(self):
+        os.chdir(self._orig_cwd)
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def assertSameResults(self, strategy_class, **params):
+        beklenen, _ = backtester.run_backtest(strategy_class, self.bars, **params)
+        sonuc, grafik = backtester.run_backtest(
+            strategy_class, self.bars, engine="vectorized", **params
+        )
+        self.assertIsNone(grafik)
+        self.assertGreater(sonuc["# Trades"], 0)
+        for key in STAT_KEYS:
+            self.assertAlmostEqual(sonuc[key], beklenen[key], places=9, msg=key)
+        for column in ("Size", "EntryBar", "ExitBar"):
+            np.testing.assert_array_equal(sonuc["_trades"][column], beklenen["_trades"][column])
+        np.testing.assert_allclose(
+            sonuc["_equity_curve"]["Equity"], beklenen["_equity_curve"]["Equity"], rtol=1e-12
+        )
+
+    def test_ema_cross(self):
+        self.assertSameResults(backtester.EmaCross, n1=10, n2=30)
+
+    def test_rsi_oscillator_with_stops(self):
+        self.assertSameResults(
+            backtester.RsiOscillator, rsi_window=10, stop_loss=0.03, take_profit=0.05
+        )
+
+    def test_macd_cross_with_stops(self):
+        self.assertSameResults(backtester.MacdCross, stop_loss=0.02, take_profit=0.04)
+
+    def test_bband_strategy(self):
+        self.assertSameResults(backtester.BBandStrategy, length=15, std=1.5)
+
+    def test_optimize_heatmap(self):
+        """Izgara taraması her kombinasyon için tekli testle aynı değeri vermeli."""
+        heatmap = backtester.optimize_strategy(
+            backtester.EmaCross,
+            self.bars,
+            maximize="Return [%]",
+            engine="vectorized",
+            n1=range(5, 15, 5),
+            n2=[20, 40],
+        )
+        self.assertEqual(heatmap.name, "Return [%]")
+        self.assertEqual(list(heatmap.index.names), ["n1", "n2"])
+        self.assertEqual(len(heatmap), 4)
+        tekli = backtester.run_backtest_vectorized(backtester.EmaCross, self.bars, n1=10, n2=40)
+        self.assertEqual(heatmap.loc[(10, 40)], tekli["Return [%]"])
+
+    def test_unknown_parameter(self):
+        with self.assertRaises(AttributeError):
+            backtester.run_backtest_vectorized(backtester.EmaCross, self.bars, n3=5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
+import numpy as np
+import pandas as pd
+
+from helpers import data_store
+from helpers import bulk_loader
+from helpers import providers
+from helpers import database as db
+
+
+class _FakeHistoryTicker:
+    """yfinance.multi içindeki Ticker yerine geçer; indirme yolunun geri kalanı gerçektir."""
+
+    def __init__(self, symbol, hook):
+        self._symbol = symbol
+        self._hook = hook
+
+    def history(self, **kwargs):
+        self._hook(self._symbol)
+        index = pd.date_range("2024-01-01", periods=3, freq="D")
+        return pd.DataFrame(
+            {"Open": 10.0, "High": 10.0, "Low": 10.0, "Close": 10.0, "Adj Close": 10.0, "Volume": 100},
+            index=index,
+        )
+
+
+def _multi_ticker_frame(tickers, periods=3, missing=()):
+    """yf.download(group_by='ticker') biçiminde örnek bir çıktı üretir."""
+    index = pd.date_range("2024-01-01", periods=periods, freq="D")
+    frames = {}
+    for t in tickers:
+        values = np.nan if t in missing else 10.0
+        frames[t] = pd.DataFrame(
+            {"Open": values, "High": values, "Low": values, "Close": values, "Volume": values},
+            index=index,
+        )
+    return pd.concat(frames, axis=1)
+
+
+class TestBulkLoader(unittest.TestCase):
+
+    def setUp(self):
+        """Geçici bir depo dizini ve sembol sağlığı için geçici bir veritabanı kullan."""
+        self._orig_dir = data_store.DATA_STORE_DIR
+        self._orig_db = db.DB_FILE
+        data_store.DATA_STORE_DIR = tempfile.mkdtemp()
+        db.DB_FILE = os.path.join(data_store.DATA_STORE_DIR, "test_health.db")
+        db.init_db()
+
+    def tearDown(self):
+        shutil.rmtree(data_store.DATA_STORE_DIR, ignore_errors=True)
+        data_store.DATA_STORE_DIR = self._orig_dir
+        db.DB_FILE = self._orig_db
+
+    def test_chunks(self):
+        """Evren, verilen boyutta partilere bölünmeli."""
+        self.assertEqual(bulk_loader._chunks([1, 2, 3, 4, 5], 2), [[1, 2], [3, 4], [5]])
+
+    def test_split_batch_skips_empty_tickers(self):
+        """Tamamen boş dönen hisseler sonuçta yer almamalı."""
+        veri = _multi_ticker_frame(["A.IS", "B.IS"], missing=("B.IS",))
+        result = bulk_loader._split_batch(veri, ["A.IS", "B.IS", "C.IS"])
+        self.assertEqual(list(result), ["A.IS"])
+        self.assertEqual(list(result["A.IS"].columns), ["open", "high", "low", "close", "volume"])
+
+    def test_refresh_universe_writes_store_and_reports(self):
+        """Başarılı hisseler depoya yazılmalı, eksikler hata olarak raporlanmalı."""
+
+        def fake_download(tickers, **kwargs):
+            return _multi_ticker_frame(tickers, missing=("ZRE20.IS",))
+
+        with mock.patch.object(providers.yf, "download", side_effect=fake_download) as dl:
+            report, elapsed = bulk_loader.refresh_universe(
+                ["GARAN", "THYAO", "ZRE20", "GARAN"], chunk_size=2, max_workers=2
+            )
+
+        self.assertEqual(dl.call_count, 2)
+        self.assertGreaterEqual(elapsed, 0)
+        self.assertEqual(list(report["hisse"]), ["GARAN", "THYAO", "ZRE20"])
+        self.assertEqual(list(report["durum"]), ["ok", "ok", "hata"])
+        self.assertEqual(len(data_store.read_bars("GARAN.IS", "1d")), 3)
+        self.assertIsNone(data_store.read_bars("ZRE20.IS", "1d"))
+        self.assertTrue(db.is_symbol_blocked("ZRE20.IS"))
+
+    def test_overlapping_batches_keep_their_own_results(self):
+        """
+        yf.download sonuçlarını modül düzeyindeki sözlüklerde toplar; aynı anda çalışan
+        iki parti birbirinin hisselerini veya kısıtlama hatalarını kaybettirmemeli.
+        """
+        first_batch_wrote = threading.Event()
+        second_batch_started = threading.Event()
+        first_batch_symbols = []
+
+        def acquire(cost=1):
+            # İkinci parti (2 hisse), ilk partinin bir hissesi yazıldıktan sonra başlar.
+            if cost == 2:
+                first_batch_wrote.wait(1)
+
+        def hook(symbol):
+            if symbol in ("GARAN.IS", "AKBNK.IS", "THYAO.IS"):
+                first_batch_symbols.append(symbol)
+                if len(first_batch_symbols) > 1:
+                    # Önceki hisse yazıldı; ilk parti, ikinci parti indirmeye başlayana
+                    # kadar (en fazla 1 sn) açık kalır.
+                    first_batch_wrote.set()
+                    second_batch_started.wait(1)
+            else:
+                second_batch_started.set()
+            if symbol == "ZRE20.IS":
+                raise ValueError("No data found, symbol may be delisted")
+            if symbol == "KCHOL.IS":
+                raise ValueError("Too Many Requests. Rate limited. Try after a while.")
+
+        with mock.patch.object(
+            providers.yf.multi, "Ticker", side_effect=lambda s: _FakeHistoryTicker(s, hook)
+        ), mock.patch.object(providers.rate_limiter, "acquire", side_effect=acquire):
+            report, _ = bulk_loader.refresh_universe(
+                ["GARAN", "AKBNK", "THYAO", "KCHOL", "ZRE20"], chunk_size=3, max_workers=2
+            )
+
+        sonuc = dict(zip(report["hisse"], report["hata"].fillna(report["durum"])))
+        self.assertEqual(
+            sonuc,
+            {
+                "AKBNK": "ok",
+                "GARAN": "ok",
+                "KCHOL": "İstek kısıtlandı",
+                "THYAO": "ok",
+                "ZRE20": "Veri bulunamadı",
+            },
+        )
+        self.assertEqual(len(data_store.read_bars("GARAN.IS", "1d")), 3)
+        self.assertTrue(db.is_symbol_blocked("ZRE20.IS"))
+        self.assertFalse(db.is_symbol_blocked("GARAN.IS"))
+        self.assertFalse(db.is_symbol_blocked("KCHOL.IS"))
+
+    def test_refresh_universe_skips_blocked_symbols(self):
+        """Bekleme süresindeki semboller indirilmeden atlanmalı."""
+        db.record_symbol_failure("ZRE20.IS", "price", "Boş veri")
+
+        def fake_download(tickers, **kwargs):
+            self.assertNotIn("ZRE20.IS", tickers)
+            return _multi_ticker_frame(tickers)
+
+        with mock.patch.object(providers.yf, "download", side_effect=fake_download):
+            report, _ = bulk_loader.refresh_universe(["GARAN", "ZRE20"])
+
+        self.assertEqual(
+            dict(zip(report["hisse"], report["durum"])), {"GARAN": "ok", "ZRE20": "atlandı"}
+        )
+
+    def test_intraday_batch_start_is_clamped_to_provider_window(self):
+        """Gün içi partiler yfinance penceresinden eski bir tarih istememeli."""
+        start = pd.Timestamp(bulk_loader._batch_start_date(["GARAN.IS"], "15m"))
+        self.assertEqual(start, bulk_loader.get_provider_history_start("15m"))
+        self.assertEqual(bulk_loader._batch_start_date(["GARAN.IS"], "1d"), "1990-01-01")
+
+    def test_accumulate_intraday_appends_each_interval(self):
+        """Biriktirme, her gün içi aralık için ayrı bir güncelleme çalıştırmalı."""
+        intraday = pd.date_range("2024-01-02 10:00", periods=4, freq="15min")
+
+        def fake_download(tickers, **kwargs):
+            frame = _multi_ticker_frame(tickers, periods=4)
+            frame.index = intraday
+            return frame
+
+        with mock.patch.object(providers.yf, "download", side_effect=fake_download):
+            results = bulk_loader.accumulate_intraday(["GARAN"], intervals=("15m", "60m"))
+
+        self.assertEqual(set(results), {"15m", "60m"})
+        self.assertEqual(len(data_store.read_bars("GARAN.IS", "15m")), 4)
+        self.assertEqual(len(data_store.read_bars("GARAN.IS", "60m")), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
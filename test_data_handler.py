@@ -1,7 +1,14 @@
 import unittest
+import shutil
+from datetime import datetime
+import tempfile
+from unittest import mock
 import pandas as pd
 import numpy as np
 
+from helpers import data_store
+from helpers import data_handler
+from helpers.exceptions import NoDataError, RateLimitError
 from helpers.data_handler import calculate_indicators
 
 class TestDataHandler(unittest.TestCase):
@@ -66,5 +73,238 @@ class TestDataHandler(unittest.TestCase):
         self.assertTrue((last_close >= last_valid_bbl) and (last_close <= last_valid_bbu))
 
 
+class TestStoredStockData(unittest.TestCase):
+
+    def setUp(self):
+        """Yerel depoyu geçici bir dizine yönlendir."""
+        self._orig_dir = data_store.DATA_STORE_DIR
+        data_store.DATA_STORE_DIR = tempfile.mkdtemp()
+        index = pd.date_range("2024-01-01", periods=10, freq="D")
+        self.history = pd.DataFrame(
+            {"open": 1.0, "high": 2.0, "low": 0.5, "close": range(10), "volume": 100},
+            index=index,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(data_store.DATA_STORE_DIR, ignore_errors=True)
+        data_store.DATA_STORE_DIR = self._orig_dir
+
+    def test_cold_fetch_then_served_from_store(self):
+        """İlk çağrı ağdan çekip depoya yazmalı, taze depo ikinci çağrıda ağa gitmemeli."""
+        with mock.patch.object(
+            data_handler, "_get_stock_data_native", return_value=self.history.copy()
+        ) as native:
+            ilk = data_handler._get_stock_data_stored("GARAN.IS", "1d", "2024-01-01")
+            ikinci = data_handler._get_stock_data_stored(
+                "GARAN.IS", "1d", "2024-01-03", "2024-01-05"
+            )
+
+        self.assertEqual(native.call_count, 1)
+        self.assertEqual(len(ilk), 10)
+        self.assertEqual(list(ikinci["close"]), [2, 3, 4])
+
+    def test_stale_store_fetches_only_delta(self):
+        """Bayat depo yalnızca son kayıtlı bardan itibaren veri istemeli."""
+        data_store.write_bars("GARAN.IS", "1d", self.history)
+        data_store.update_meta("GARAN.IS", "1d", covered_from="2024-01-01T00:00:00")
+        delta = pd.DataFrame(
+            {"open": 1.0, "high": 2.0, "low": 0.5, "close": [99, 10], "volume": 100},
+            index=pd.to_datetime(["2024-01-10", "2024-01-11"]),
+        )
+
+        with mock.patch.object(data_store, "is_fresh", return_value=False), mock.patch.object(
+            data_handler, "_get_stock_data_native", return_value=delta
+        ) as native:
+            veri = data_handler._get_stock_data_stored("GARAN.IS", "1d", "2024-01-01")
+
+        native.assert_called_once_with("GARAN.IS", "1d", start_date="2024-01-10")
+        self.assertEqual(len(veri), 11)
+        self.assertEqual(veri["close"].iloc[-2], 99)
+
+    def test_backfill_failure_keeps_coverage(self):
+        """Kısıtlanan geçmiş isteği kapsamı ilerletmemeli; gerçekten boş dönem ilerletmeli."""
+        data_store.write_bars("GARAN.IS", "1d", self.history)
+        data_store.update_meta("GARAN.IS", "1d", covered_from="2024-01-01T00:00:00")
+
+        with mock.patch.object(
+            data_handler, "_get_stock_data_native", side_effect=RateLimitError("devre açık")
+        ):
+            veri = data_handler._get_stock_data_stored("GARAN.IS", "1d", "2023-06-01")
+        self.assertEqual(len(veri), 10)
+        self.assertEqual(
+            data_store.read_meta("GARAN.IS", "1d")["covered_from"], "2024-01-01T00:00:00"
+        )
+
+        with mock.patch.object(
+            data_handler, "_get_stock_data_native", side_effect=NoDataError("işlem yok")
+        ):
+            data_handler._get_stock_data_stored("GARAN.IS", "1d", "2023-06-01")
+        self.assertEqual(
+            data_store.read_meta("GARAN.IS", "1d")["covered_from"], "2023-06-01T00:00:00"
+        )
+
+
+class TestResampling(unittest.TestCase):
+
+    def setUp(self):
+        self._orig_dir = data_store.DATA_STORE_DIR
+        data_store.DATA_STORE_DIR = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(data_store.DATA_STORE_DIR, ignore_errors=True)
+        data_store.DATA_STORE_DIR = self._orig_dir
+
+    @staticmethod
+    def _bars(index):
+        n = len(index)
+        return pd.DataFrame(
+            {
+                "open": np.arange(n, dtype=float),
+                "high": np.arange(n, dtype=float) + 10,
+                "low": np.arange(n, dtype=float) - 10,
+                "close": np.arange(n, dtype=float) + 0.5,
+                "volume": np.ones(n) * 100,
+            },
+            index=index,
+        )
+
+    def test_weekly_and_monthly_from_daily(self):
+        """Haftalık barlar pazartesiye, aylık barlar ayın ilk gününe etiketlenmeli."""
+        veri = self._bars(pd.bdate_range("2024-01-01", "2024-02-29"))
+        haftalik = data_handler.resample_ohlcv(veri, "1wk")
+        self.assertTrue((haftalik.index.dayofweek == 0).all())
+        ilk_hafta = haftalik.iloc[0]
+        self.assertEqual(ilk_hafta["open"], 0)
+        self.assertEqual(ilk_hafta["close"], 4.5)
+        self.assertEqual(ilk_hafta["high"], 14)
+        self.assertEqual(ilk_hafta["low"], -10)
+        self.assertEqual(ilk_hafta["volume"], 500)
+
+        aylik = data_handler.resample_ohlcv(veri, "1mo")
+        self.assertEqual(list(aylik.index), list(pd.to_datetime(["2024-01-01", "2024-02-01"])))
+        self.assertEqual(aylik["volume"].sum(), veri["volume"].sum())
+
+    def test_intraday_bins_align_to_session_open(self):
+        """60 dakikalık barlar 10:00 seans açılışından başlamalı, seans dışı boş barlar atılmalı."""
+        gun1 = pd.date_range("2024-01-02 10:00", "2024-01-02 17:45", freq="15min")
+        gun2 = pd.date_range("2024-01-03 10:00", "2024-01-03 17:45", freq="15min")
+        veri = self._bars(gun1.append(gun2))
+        saatlik = data_handler.resample_ohlcv(veri, "60m")
+        self.assertEqual(len(saatlik), 16)
+        self.assertEqual(saatlik.index[0], pd.Timestamp("2024-01-02 10:00"))
+        self.assertEqual(saatlik.index[8], pd.Timestamp("2024-01-03 10:00"))
+        self.assertEqual(saatlik["volume"].iloc[0], 400)
+
+    def test_coarse_interval_served_from_store_without_network(self):
+        """Günlük seri depoda taze ise haftalık veri ağa gitmeden türetilmeli."""
+        data_store.write_bars("GARAN.IS", "1d", self._bars(pd.bdate_range("2024-01-01", "2024-03-29")))
+        data_store.update_meta("GARAN.IS", "1d", covered_from="2024-01-01T00:00:00")
+        with mock.patch.object(data_handler, "_get_stock_data_native") as native:
+            haftalik = data_handler._get_resampled_from_store(
+                "GARAN.IS", "1wk", "2024-01-10", "2024-03-29"
+            )
+        native.assert_not_called()
+        self.assertEqual(haftalik.index[0], pd.Timestamp("2024-01-15"))
+
+    def test_uncovered_range_falls_back(self):
+        """Kaynak seri istenen dönemi kapsamıyorsa None dönmeli."""
+        data_store.write_bars("GARAN.IS", "1d", self._bars(pd.bdate_range("2024-01-01", "2024-03-29")))
+        data_store.update_meta("GARAN.IS", "1d", covered_from="2024-01-01T00:00:00")
+        self.assertIsNone(data_handler._get_resampled_from_store("GARAN.IS", "1wk", "2023-06-01"))
+        self.assertIsNone(data_handler._get_resampled_from_store("GARAN.IS", "60m", "2024-01-10"))
+
+
+class TestIntradayHistory(unittest.TestCase):
+
+    def setUp(self):
+        self._orig_dir = data_store.DATA_STORE_DIR
+        data_store.DATA_STORE_DIR = tempfile.mkdtemp()
+        bugun = pd.Timestamp(datetime.today()).normalize()
+        # yfinance pencerelerinden (59/729 gün) daha eskiye uzanan biriktirilmiş 15m geçmişi
+        self.ilk_gun = bugun - pd.Timedelta(days=900)
+        index = pd.date_range(self.ilk_gun + pd.Timedelta(hours=10), periods=4, freq="15min")
+        index = index.append(pd.date_range(bugun + pd.Timedelta(hours=10), periods=4, freq="15min"))
+        veri = pd.DataFrame(
+            {"open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 100}, index=index
+        )
+        data_store.write_bars("GARAN.IS", "15m", veri)
+        data_store.update_meta("GARAN.IS", "15m", covered_from=self.ilk_gun.isoformat())
+
+    def tearDown(self):
+        shutil.rmtree(data_store.DATA_STORE_DIR, ignore_errors=True)
+        data_store.DATA_STORE_DIR = self._orig_dir
+
+    def test_available_history_extends_beyond_provider_window(self):
+        """Depoda biriken gün içi geçmiş, yfinance penceresinden eski tarihleri açmalı."""
+        self.assertEqual(data_handler.get_available_history_start("GARAN.IS", "15m"), self.ilk_gun)
+        # 60m, 15m geçmişinden türetilebildiği için aynı tarihten başlar.
+        self.assertEqual(data_handler.get_available_history_start("GARAN.IS", "60m"), self.ilk_gun)
+        self.assertIsNone(data_handler.get_available_history_start("GARAN.IS", "1d"))
+        self.assertGreater(
+            data_handler.get_available_history_start("THYAO.IS", "15m"), self.ilk_gun
+        )
+
+    def test_old_intraday_range_served_from_store(self):
+        """Pencere dışındaki eski aralık ağa gidilmeden depodan birleştirilerek sunulmalı."""
+        with mock.patch.object(data_handler, "_get_stock_data_native") as native:
+            veri = data_handler._get_stock_data_stored("GARAN.IS", "15m", self.ilk_gun)
+        native.assert_not_called()
+        self.assertEqual(len(veri), 8)
+
+
+class TestWarmupFetch(unittest.TestCase):
+
+    def test_warmup_bars_follow_selection(self):
+        """Görünür aralık öncesi ısınma yalnızca seçili göstergelere göre belirlenmeli."""
+        self.assertEqual(data_handler.get_warmup_bars(["RSI"]), 60)
+        self.assertEqual(data_handler.get_warmup_bars(["RSI", "EMA UZUN (50, 200)"]), 400)
+        self.assertEqual(data_handler.get_warmup_bars([]), 0)
+        self.assertEqual(data_handler.get_summary_warmup_bars(), 400)
+
+    def test_warmup_start_for_daily_and_weekly(self):
+        """Isınma başlangıcı, hafta sonları payıyla birlikte yeterince geride olmalı."""
+        start = pd.Timestamp("2024-06-03")
+        daily = data_handler.get_warmup_start(start, "1d", 100)
+        # 100 seans en az 140 takvim günü gerektirir.
+        self.assertLessEqual(daily, start - pd.Timedelta(days=140))
+        self.assertGreater(daily, start - pd.Timedelta(days=170))
+        self.assertEqual(
+            data_handler.get_warmup_start(start, "1wk", 10), start - pd.Timedelta(days=70)
+        )
+        self.assertEqual(data_handler.get_warmup_start(start, "1d", 0), start)
+
+    def test_warmup_start_respects_intraday_window(self):
+        """Gün içi aralıklarda ısınma, yfinance'in sunduğu pencerenin dışına taşmamalı."""
+        start = pd.Timestamp(datetime.today()).normalize() - pd.Timedelta(days=30)
+        warmup = data_handler.get_warmup_start(start, "15m", 32 * 100)
+        self.assertGreaterEqual(
+            warmup, pd.Timestamp(datetime.today()).normalize() - pd.Timedelta(days=59)
+        )
+
+    def test_fetch_is_trimmed_to_exact_warmup(self):
+        """Dönen veri görünür aralıktan önce tam olarak gereken sayıda bar içermeli."""
+        index = pd.bdate_range("2022-01-03", "2024-12-31")
+        veri = pd.DataFrame({"close": range(len(index))}, index=index)
+        with mock.patch.object(data_handler, "get_stock_data", return_value=veri):
+            sonuc = data_handler.get_stock_data_with_warmup(
+                "GARAN.IS", "1d", "2023-01-02", "2024-12-31", ["RSI"]
+            )
+        self.assertEqual((sonuc.index < pd.Timestamp("2023-01-02")).sum(), 60)
+        self.assertEqual(sonuc.index[-1], index[-1])
+
+    def test_short_range_keeps_summary_warmup_from_last_bar(self):
+        """Kısa bir görünür aralıkta son bardan geriye özet ısınması kadar bar kalmalı."""
+        index = pd.bdate_range("2022-01-03", "2024-12-31")
+        veri = pd.DataFrame({"close": range(len(index))}, index=index)
+        with mock.patch.object(data_handler, "get_stock_data", return_value=veri) as fetch:
+            sonuc = data_handler.get_stock_data_with_warmup(
+                "GARAN.IS", "1d", "2024-12-02", "2024-12-31", ["RSI"]
+            )
+        self.assertEqual(len(sonuc), 401)
+        self.assertLessEqual(
+            fetch.call_args.kwargs["start_date"], index[-401]
+        )
+
+
 if __name__ == '__main__':
     unittest.main()
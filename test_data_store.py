@@ -0,0 +1,127 @@
+import unittest
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+import pandas as pd
+
+from helpers import data_store
+
+
+def _bars(start, periods, freq="D", base=100.0):
+    """Basit, artan fiyatlı bir OHLCV DataFrame'i üretir."""
+    index = pd.date_range(start=start, periods=periods, freq=freq)
+    close = [base + i for i in range(periods)]
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": [c + 1 for c in close],
+            "low": [c - 1 for c in close],
+            "close": close,
+            "volume": [1000 + i for i in range(periods)],
+        },
+        index=index,
+    )
+
+
+class TestDataStore(unittest.TestCase):
+
+    def setUp(self):
+        """Her test için geçici bir depo dizini kullan."""
+        self._orig_dir = data_store.DATA_STORE_DIR
+        data_store.DATA_STORE_DIR = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(data_store.DATA_STORE_DIR, ignore_errors=True)
+        data_store.DATA_STORE_DIR = self._orig_dir
+
+    def test_read_missing_partition(self):
+        """Olmayan bir bölüm için None dönmeli."""
+        self.assertIsNone(data_store.read_bars("GARAN.IS", "1d"))
+        self.assertIsNone(data_store.get_last_timestamp("GARAN.IS", "1d"))
+
+    def test_write_and_read_roundtrip(self):
+        """Yazılan barlar aynen geri okunmalı ve tarih aralığı dahil olarak kesilmeli."""
+        veri = _bars("2024-01-01", 10)
+        data_store.write_bars("GARAN.IS", "1d", veri)
+
+        okunan = data_store.read_bars("GARAN.IS", "1d")
+        pd.testing.assert_frame_equal(okunan, veri, check_freq=False)
+
+        aralik = data_store.read_bars(
+            "GARAN.IS", "1d", start_date="2024-01-03", end_date="2024-01-05"
+        )
+        self.assertEqual(len(aralik), 3)
+        self.assertEqual(aralik.index[-1], pd.Timestamp("2024-01-05"))
+
+    def test_append_overrides_overlapping_bars(self):
+        """Ekleme yinelenen zamanlarda yeni barı tutmalı ve sıralı kalmalı."""
+        data_store.write_bars("THYAO.IS", "1d", _bars("2024-01-01", 5))
+        yeni = _bars("2024-01-05", 3, base=200.0)
+        birlesik = data_store.append_bars("THYAO.IS", "1d", yeni)
+
+        self.assertEqual(len(birlesik), 7)
+        self.assertTrue(birlesik.index.is_monotonic_increasing)
+        self.assertEqual(birlesik.loc["2024-01-05", "close"], 200.0)
+        self.assertEqual(
+            data_store.get_last_timestamp("THYAO.IS", "1d"), pd.Timestamp("2024-01-07")
+        )
+
+    def test_concurrent_appends_keep_all_bars(self):
+        """Aynı bölüme eşzamanlı eklemeler birbirinin barlarını silmemeli."""
+        data_store.write_bars("GARAN.IS", "1d", _bars("2024-01-01", 5))
+        read_parquet = pd.read_parquet
+
+        def slow_read(path, *args, **kwargs):
+            # Okuma ile yazma arasını açarak iki eklemenin iç içe geçmesini kolaylaştırır.
+            veri = read_parquet(path, *args, **kwargs)
+            time.sleep(0.05)
+            return veri
+
+        threads = [
+            threading.Thread(
+                target=data_store.append_bars,
+                args=("GARAN.IS", "1d", _bars(f"2024-02-0{i + 1}", 1)),
+            )
+            for i in range(4)
+        ]
+        with mock.patch.object(data_store.pd, "read_parquet", side_effect=slow_read):
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(data_store.read_bars("GARAN.IS", "1d")), 9)
+
+    def test_partitions_are_separated_by_interval(self):
+        """Aynı hissenin farklı zaman aralıkları ayrı bölümlerde tutulmalı."""
+        data_store.write_bars("ASELS.IS", "1d", _bars("2024-01-01", 5))
+        data_store.write_bars("ASELS.IS", "15m", _bars("2024-01-02 10:00", 8, freq="15min"))
+        self.assertEqual(len(data_store.read_bars("ASELS.IS", "1d")), 5)
+        self.assertEqual(len(data_store.read_bars("ASELS.IS", "15m")), 8)
+
+    def test_meta_and_freshness(self):
+        """Meta veri güncellenince bölüm taze sayılmalı."""
+        self.assertFalse(data_store.is_fresh("GARAN.IS", "1d", 300))
+        data_store.update_meta("GARAN.IS", "1d", covered_from="2020-01-01T00:00:00")
+        self.assertTrue(data_store.is_fresh("GARAN.IS", "1d", 300))
+        self.assertFalse(data_store.is_fresh("GARAN.IS", "1d", 0))
+        self.assertEqual(
+            data_store.read_meta("GARAN.IS", "1d")["covered_from"], "2020-01-01T00:00:00"
+        )
+
+    def test_normalize_ohlcv(self):
+        """MultiIndex sütunlar düzleşmeli, saat dilimi İstanbul'a çevrilip kaldırılmalı."""
+        index = pd.date_range("2024-01-02 07:00", periods=2, freq="h", tz="UTC")
+        columns = pd.MultiIndex.from_product([["Close", "Volume"], ["GARAN.IS"]])
+        veri = pd.DataFrame([[1.0, 10], [2.0, 20]], index=index, columns=columns)
+
+        normal = data_store.normalize_ohlcv(veri)
+        self.assertEqual(list(normal.columns), ["close", "volume"])
+        self.assertIsNone(normal.index.tz)
+        self.assertEqual(normal.index[0], pd.Timestamp("2024-01-02 10:00"))
+
+
+if __name__ == '__main__':
+    unittest.main()
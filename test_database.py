@@ -30,6 +30,7 @@ class TestDatabase(unittest.TestCase):
         cursor.execute("DELETE FROM transactions")
         cursor.execute("DELETE FROM user_preferences")
         cursor.execute("DELETE FROM alarms")
+        cursor.execute("DELETE FROM symbol_health")
         conn.commit()
         conn.close()
 
@@ -97,6 +98,32 @@ class TestDatabase(unittest.TestCase):
         # 4. Alarm sil
         db.delete_alarm(alarm_to_update_id)
         self.assertEqual(len(db.get_all_alarms()), 1)
+    def test_symbol_health(self):
+        """Sembol sağlık kaydı, üstel bekleme ve temizleme fonksiyonlarını test et."""
+        # 1. Başlangıçta hiçbir sembol engelli olmamalı
+        self.assertFalse(db.is_symbol_blocked("ZRE20.IS"))
+        self.assertEqual(db.get_blocked_symbols(), set())
+
+        # 2. Hata kaydı sembolü engellemeli ve bekleme süresi her hatada ikiye katlanmalı
+        self.assertEqual(db.record_symbol_failure("ZRE20.IS", "price", "Boş veri"), 1)
+        ilk_bekleme = db.get_symbol_health().iloc[0]
+        self.assertEqual(db.record_symbol_failure("ZRE20.IS", "price", "Boş veri"), 2)
+        ikinci_bekleme = db.get_symbol_health().iloc[0]
+        ilk_sure = pd.to_datetime(ilk_bekleme["retry_after"]) - pd.to_datetime(ilk_bekleme["last_failure"])
+        ikinci_sure = pd.to_datetime(ikinci_bekleme["retry_after"]) - pd.to_datetime(ikinci_bekleme["last_failure"])
+        self.assertEqual(ikinci_sure, ilk_sure * 2)
+
+        self.assertTrue(db.is_symbol_blocked("ZRE20.IS"))
+        self.assertEqual(db.get_blocked_symbols("price"), {"ZRE20.IS"})
+
+        # 3. Fiyat ve temel veri hataları birbirinden bağımsız olmalı
+        self.assertFalse(db.is_symbol_blocked("ZRE20.IS", "fundamental"))
+
+        # 4. Başarılı deneme kaydı temizlemeli
+        db.record_symbol_success("ZRE20.IS")
+        self.assertFalse(db.is_symbol_blocked("ZRE20.IS"))
+        self.assertTrue(db.get_symbol_health().empty)
+
 
 if __name__ == '__main__':
     unittest.main()
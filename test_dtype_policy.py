@@ -0,0 +1,61 @@
+import unittest
+import numpy as np
+
+from fixtures import sample_bars
+from helpers import data_handler
+from helpers import dtype_policy
+
+
+class TestDtypePolicy(unittest.TestCase):
+
+    def setUp(self):
+        self._orig_policy = dtype_policy.DTYPE_POLICY
+        self.bars = sample_bars(
+            3000, seed=23, start="2012-01-02", base=60, step=0.8, volume=(1_000, 5_000_000)
+        )
+
+    def tearDown(self):
+        dtype_policy.DTYPE_POLICY = self._orig_policy
+
+    def _calculate(self, policy):
+        dtype_policy.DTYPE_POLICY = policy
+        return data_handler.calculate_indicators(dtype_policy.compact_frame(self.bars.copy()))
+
+    def test_compact_dtypes_and_memory(self):
+        """Göstergeler float32, fiyat float64, hacim tamsayı, bayraklar bool olmalı; bellek %40'tan fazla azalmalı."""
+        full = self._calculate("full")
+        compact = self._calculate("compact")
+
+        self.assertEqual(compact["close"].dtype, np.float64)
+        self.assertEqual(compact["rsi_14"].dtype, np.float32)
+        self.assertEqual(compact["volume"].dtype, np.int64)
+        self.assertEqual(compact["golden_cross"].dtype, bool)
+        self.assertEqual(compact["supertd_7_3.0"].dtype, np.int8)
+        self.assertEqual(full["rsi_14"].dtype, np.float64)
+        self.assertLess(
+            compact.memory_usage(deep=True).sum(), 0.6 * full.memory_usage(deep=True).sum()
+        )
+
+    def test_precision_impact(self):
+        """Küçültme her sütunda ölçeğin 1e-5'inden az hata getirmeli; sinyaller değişmemeli."""
+        full = self._calculate("full")
+        compact = self._calculate("compact")
+        for column in full.columns:
+            expected = full[column].to_numpy(dtype=float)
+            actual = compact[column].to_numpy(dtype=float)
+            np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected), err_msg=column)
+            scale = np.nanmax(np.abs(expected)) or 1.0
+            self.assertLess(np.nanmax(np.abs(actual - expected)) / scale, 1e-5, column)
+        for column in ("golden_cross", "death_cross", "supertd_7_3.0"):
+            np.testing.assert_array_equal(compact[column], full[column], err_msg=column)
+
+    def test_volume_with_gaps_stays_float(self):
+        """Boş değer içeren hacim tamsayıya çevrilmemeli."""
+        veri = self.bars.head(10).astype({"volume": float})
+        veri.iloc[3, veri.columns.get_loc("volume")] = np.nan
+        self.assertEqual(dtype_policy.compact_frame(veri, "compact")["volume"].dtype, np.float32)
+        self.assertIs(dtype_policy.compact_frame(veri, "full"), veri)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import os
+import unittest
+import shutil
+import tempfile
+from unittest import mock
+import pandas as pd
+
+import helpers.database as db
+from fixtures import sample_bars
+from helpers import data_store
+from helpers import event_index
+from helpers import indicator_engine
+from helpers import indicator_panel
+from helpers.data_handler import calculate_indicators
+
+
+class TestEventIndex(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._orig_store = data_store.DATA_STORE_DIR
+        self._orig_db = db.DB_FILE
+        data_store.DATA_STORE_DIR = self._tmp_dir
+        db.DB_FILE = os.path.join(self._tmp_dir, "test_events.db")
+        db.init_db()
+        indicator_engine.clear_engine_cache()
+        self.bars = {
+            "GARAN.IS": sample_bars(600, seed=5, start="2021-01-04"),
+            "THYAO.IS": sample_bars(600, seed=8, start="2021-01-04"),
+        }
+        self.veri = calculate_indicators(self.bars["GARAN.IS"].copy())
+
+    def tearDown(self):
+        indicator_engine.clear_engine_cache()
+        data_store.DATA_STORE_DIR = self._orig_store
+        db.DB_FILE = self._orig_db
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def _stored(self, hisse="GARAN.IS"):
+        return db.get_indicator_events("1d", [hisse]).sort_values(["ts", "event"]).reset_index(drop=True)
+
+    def test_golden_cross_matches_indicator_flags(self):
+        """Dizindeki golden/death cross olayları gösterge sütunlarındaki bayraklarla aynı olmalı."""
+        olaylar = event_index.events_from_frame("GARAN.IS", self.veri)
+        for event in ("golden_cross", "death_cross"):
+            beklenen = self.veri.index[self.veri[event].to_numpy(dtype=bool)]
+            self.assertTrue(len(beklenen) > 0, event)
+            self.assertEqual(list(olaylar.loc[olaylar["event"] == event, "ts"]), list(beklenen))
+
+    def test_build_matches_incremental_and_skips_last_bar(self):
+        """Panelden toplu kurulan dizin, bar bar genişletilen dizinle aynı olmalı."""
+        for hisse, bars in self.bars.items():
+            data_store.write_bars(hisse, "1d", bars)
+        event_index.build_event_index(list(self.bars), "1d")
+        toplu = self._stored()
+        filigran = db.get_indicator_event_watermarks("1d")
+        self.assertEqual(filigran["GARAN.IS"], self.veri.index[-2])
+        self.assertTrue((toplu["ts"] < self.veri.index[-1]).all())
+
+        conn = db.get_db_connection()
+        with conn:
+            conn.execute("DELETE FROM indicator_events WHERE symbol = 'GARAN.IS'")
+            conn.execute("DELETE FROM indicator_event_watermarks WHERE symbol = 'GARAN.IS'")
+        conn.close()
+        event_index.update_event_index("GARAN.IS", "1d", self.veri.iloc[:400])
+        for end in range(401, len(self.veri) + 1, 37):
+            event_index.update_event_index("GARAN.IS", "1d", self.veri.iloc[:end])
+        sonuc = event_index.update_event_index("GARAN.IS", "1d", self.veri)
+
+        pd.testing.assert_frame_equal(self._stored(), toplu, check_exact=False)
+        self.assertGreater(len(sonuc), 0)
+        self.assertEqual(
+            db.get_indicator_event_watermarks("1d", ["GARAN.IS"])["GARAN.IS"], self.veri.index[-2]
+        )
+
+    def test_short_chart_window_uses_stored_history(self):
+        """Kısa ve göstergesiz grafik penceresi, panelden kurulan dizinle aynı olayları yazmalı."""
+        bars = self.bars["GARAN.IS"]
+        data_store.write_bars("GARAN.IS", "1d", bars.iloc[:-20])
+        event_index.build_event_index(["GARAN.IS"], "1d")
+        event_index.update_event_index("GARAN.IS", "1d", bars.iloc[-60:-19])
+
+        data_store.write_bars("GARAN.IS", "1d", bars)
+        pencere = bars.iloc[-60:]
+        with mock.patch.object(
+            indicator_panel, "compute_panel", wraps=indicator_panel.compute_panel
+        ) as compute, mock.patch.object(
+            indicator_engine, "update_indicators", wraps=indicator_engine.update_indicators
+        ) as update:
+            event_index.update_event_index("GARAN.IS", "1d", pencere)
+            # Yeni bar kapanmadıkça tekrar hesaplanmaz.
+            event_index.update_event_index("GARAN.IS", "1d", pencere)
+        self.assertEqual(compute.call_count, 0)
+        self.assertEqual(update.call_count, 1)
+        # Yalnızca son çağrıdan sonra gelen barlar işlenir.
+        self.assertEqual(indicator_engine._engines[("GARAN.IS", "1d")].last_advanced_bars, 21)
+        artimli = self._stored()
+
+        event_index.build_event_index(["GARAN.IS"], "1d")
+        pd.testing.assert_frame_equal(artimli, self._stored(), check_exact=False)
+
+    def test_provisional_bar_not_persisted(self):
+        """Kapanmamış son bardaki olay döndürülmeli ama dizine yazılmamalı."""
+        olaylar = event_index.events_from_frame("GARAN.IS", self.veri)
+        ts = olaylar["ts"].iloc[len(olaylar) // 2]
+        veri = self.veri.loc[:ts]
+        sonuc = event_index.update_event_index("GARAN.IS", "1d", veri)
+        self.assertIn(ts, set(sonuc["ts"]))
+        self.assertNotIn(ts, set(self._stored()["ts"]))
+        # Bar kapanıp yeni bar geldiğinde olay kalıcı hale gelir.
+        event_index.update_event_index("GARAN.IS", "1d", self.veri.iloc[: len(veri) + 1])
+        self.assertIn(ts, set(self._stored()["ts"]))
+
+    def test_get_crossings(self):
+        """Verilen günün olayları tüm hisselerden döndürülmeli."""
+        for hisse, bars in self.bars.items():
+            data_store.write_bars(hisse, "1d", bars)
+        olaylar = event_index.build_event_index(list(self.bars), "1d")
+        gun = olaylar["ts"].iloc[-1]
+        sonuc = event_index.get_crossings("1d", gun)
+        beklenen = olaylar[olaylar["ts"] == gun]
+        self.assertEqual(len(sonuc), len(beklenen))
+        self.assertTrue((sonuc["ts"].dt.normalize() == gun.normalize()).all())
+        sadece = event_index.get_crossings("1d", gun, event_types=["rsi_oversold"])
+        self.assertTrue((sadece["event"] == "rsi_oversold").all())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import unittest
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest import mock
+import pandas as pd
+
+from helpers import data_handler
+from helpers import database as db
+from helpers import fundamentals
+from helpers import providers
+from helpers.exceptions import DataFetchError
+
+
+class _CountingTicker:
+    """Her bölüme erişimi sayan sahte yf.Ticker."""
+
+    def __init__(self, symbol, calls, barrier=None):
+        self._symbol = symbol
+        self._calls = calls
+        self._barrier = barrier
+
+    def _access(self, section, value):
+        self._calls.append(section)
+        return value
+
+    @property
+    def info(self):
+        if self._barrier is not None:
+            # Tüm istekler aynı anda açık olmadan hiçbiri tamamlanamaz.
+            self._barrier.wait(5)
+        quote_type = "ETF" if self._symbol == "FON.IS" else "EQUITY"
+        return self._access("info", {"quoteType": quote_type, "trailingPE": 5.0})
+
+    @property
+    def financials(self):
+        return self._access("financials", pd.DataFrame({"2023": [1.0]}, index=["Net Income"]))
+
+    @property
+    def balance_sheet(self):
+        raise RuntimeError("bilanço alınamadı")
+
+
+class _CountingProvider(providers.MarketDataProvider):
+    def __init__(self, barrier=None):
+        self.calls = []
+        self.barrier = barrier
+
+    def ticker(self, symbol):
+        return _CountingTicker(symbol, self.calls, self.barrier)
+
+
+class TestLazyFundamentals(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._orig_db = db.DB_FILE
+        self._orig_cache = fundamentals.FUNDAMENTALS_CACHE_DIR
+        db.DB_FILE = os.path.join(self._tmp_dir, "test_fundamentals.db")
+        fundamentals.FUNDAMENTALS_CACHE_DIR = os.path.join(self._tmp_dir, "cache")
+        db.init_db()
+        self.provider = _CountingProvider()
+        self._previous = providers.set_provider(self.provider)
+
+    def tearDown(self):
+        providers.set_provider(self._previous)
+        db.DB_FILE = self._orig_db
+        fundamentals.FUNDAMENTALS_CACHE_DIR = self._orig_cache
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def test_sections_are_fetched_on_first_access(self):
+        """Yalnızca erişilen bölümler çekilmeli; ikinci erişim bellekten gelmeli."""
+        data = fundamentals.LazyFundamentals("GARAN.IS")
+        self.assertEqual(data.get("info")["trailingPE"], 5.0)
+        self.assertEqual(self.provider.calls, ["info"])
+
+        self.assertEqual(data["financials"].loc["Net Income"].iloc[0], 1.0)
+        data["financials"]
+        self.assertEqual(self.provider.calls, ["info", "financials"])
+        self.assertEqual(data.loaded_sections(), ["info", "financials"])
+
+    def test_disk_cache_respects_section_ttl(self):
+        """Disk önbelleği yeni nesnelerce kullanılmalı; süresi dolan bölüm yeniden çekilmeli."""
+        fundamentals.LazyFundamentals("GARAN.IS")["info"]
+        fundamentals.LazyFundamentals("GARAN.IS")["info"]
+        self.assertEqual(self.provider.calls, ["info"])
+
+        path = fundamentals._cache_path("GARAN.IS", "info")
+        eski = os.path.getmtime(path) - fundamentals.SECTION_TTL_SECONDS["info"] - 1
+        os.utime(path, (eski, eski))
+        fundamentals.LazyFundamentals("GARAN.IS")["info"]
+        self.assertEqual(self.provider.calls, ["info", "info"])
+
+    def test_cached_section_expires_from_file_time(self):
+        """Önbellekten gelen bölümün süresi yüklendiği andan değil, dosyanın zamanından sayılmalı."""
+        fundamentals.LazyFundamentals("GARAN.IS")["info"]
+        path = fundamentals._cache_path("GARAN.IS", "info")
+        ttl = fundamentals.SECTION_TTL_SECONDS["info"]
+        eski = time.time() - ttl + 60
+        os.utime(path, (eski, eski))
+
+        data = fundamentals.LazyFundamentals("GARAN.IS")
+        data["info"]
+        self.assertEqual(self.provider.calls, ["info"])
+        simdi = time.time() + 120
+        with mock.patch.object(fundamentals.time, "time", return_value=simdi):
+            data["info"]
+        self.assertEqual(self.provider.calls, ["info", "info"])
+
+    def test_corrupt_cache_is_refetched(self):
+        """Bozuk veya yarım kalmış önbellek dosyası silinip bölüm yeniden çekilmeli."""
+        fundamentals.LazyFundamentals("GARAN.IS")["financials"]
+        path = fundamentals._cache_path("GARAN.IS", "financials")
+        with open(path, "rb") as f:
+            icerik = f.read()
+        for bozuk in (icerik[: len(icerik) // 2], b"bozuk veri"):
+            with open(path, "wb") as f:
+                f.write(bozuk)
+            data = fundamentals.LazyFundamentals("GARAN.IS")
+            self.assertEqual(data.get("financials").loc["Net Income"].iloc[0], 1.0)
+        self.assertEqual(self.provider.calls, ["financials"] * 3)
+        self.assertEqual(fundamentals._read_cached("GARAN.IS", "financials")[0].shape, (1, 1))
+
+    def test_failed_statement_returns_empty_table(self):
+        """Alınamayan bir finansal tablo sayfayı bozmamalı, boş tablo dönmeli."""
+        original = fundamentals.rate_limiter.wait_before_retry
+        fundamentals.rate_limiter.wait_before_retry = lambda attempt: None
+        try:
+            self.assertTrue(fundamentals.LazyFundamentals("GARAN.IS")["balance_sheet"].empty)
+        finally:
+            fundamentals.rate_limiter.wait_before_retry = original
+
+    def test_load_info_rejects_non_equity(self):
+        """Hisse olmayan semboller reddedilmeli ve bekleme süresine alınmalı."""
+        with self.assertRaises(DataFetchError):
+            fundamentals.load_info("FON.IS")
+        self.assertTrue(db.is_symbol_blocked("FON.IS", "fundamental"))
+        self.assertEqual(fundamentals.load_info("GARAN.IS")["quoteType"], "EQUITY")
+
+    def test_iter_fundamental_info_runs_in_parallel(self):
+        """Karşılaştırma için hisseler paralel çekilmeli; her hisse için tek istek yapılmalı."""
+        hisseler = ["GARAN.IS", "AKBNK.IS", "THYAO.IS", "ASELS.IS", "FON.IS"]
+        # İstekler sırayla yapılırsa bariyer dolmaz ve info hatası döner.
+        self.provider.barrier = threading.Barrier(len(hisseler))
+
+        sonuclar = {h: (info, hata) for h, info, hata in data_handler.iter_fundamental_info(hisseler)}
+
+        self.assertEqual(set(sonuclar), set(hisseler))
+        for hisse in hisseler[:-1]:
+            self.assertIsNone(sonuclar[hisse][1], hisse)
+            self.assertEqual(sonuclar[hisse][0]["trailingPE"], 5.0)
+        self.assertIsNotNone(sonuclar["FON.IS"][1])
+        self.assertFalse(self.provider.barrier.broken)
+        self.assertEqual(self.provider.calls, ["info"] * len(hisseler))
+        self.assertEqual(list(data_handler.iter_fundamental_info([])), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
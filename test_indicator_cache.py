@@ -0,0 +1,75 @@
+import unittest
+import pandas as pd
+
+from fixtures import sample_bars
+from helpers import data_handler
+from helpers.indicator_cache import ByteLRUCache
+
+
+class TestByteLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        """Boyut sınırı aşılınca en uzun süredir kullanılmayan kayıt atılmalı."""
+        cache = ByteLRUCache(max_bytes=30, sizeof=len)
+        cache.put("a", "x" * 10)
+        cache.put("b", "x" * 10)
+        cache.put("c", "x" * 10)
+        self.assertIsNotNone(cache.get("a"))
+        cache.put("d", "x" * 10)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "x" * 10)
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (2, 1, 1))
+        self.assertEqual((stats["entries"], stats["bytes"]), (3, 30))
+
+    def test_oversized_value_is_not_stored(self):
+        """Tek başına sınırdan büyük değer saklanmamalı, mevcut kayıtlar korunmalı."""
+        cache = ByteLRUCache(max_bytes=10, sizeof=len)
+        cache.put("a", "x" * 5)
+        cache.put("b", "x" * 11)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get_stats()["evictions"], 0)
+
+
+class TestCalculateIndicatorsCache(unittest.TestCase):
+
+    def setUp(self):
+        data_handler.INDICATOR_CACHE.clear()
+        data_handler.INDICATOR_CACHE.reset_stats()
+        self.bars = sample_bars(300, seed=3, base=20, step=0.4)
+
+    def tearDown(self):
+        data_handler.INDICATOR_CACHE.clear()
+        data_handler.INDICATOR_CACHE.reset_stats()
+
+    def test_repeated_call_hits_cache(self):
+        """Aynı hisse ve barlar için ikinci çağrı önbellekten, ayrı bir kopya olarak dönmeli."""
+        ilk = data_handler.calculate_indicators(self.bars, "TEST.IS", "1d")
+        ikinci = data_handler.calculate_indicators(self.bars, "TEST.IS", "1d")
+        pd.testing.assert_frame_equal(ilk, ikinci)
+        self.assertNotIn("rsi_14", self.bars.columns)
+
+        ikinci["rsi_14"] = 0.0
+        ucuncu = data_handler.calculate_indicators(self.bars, "TEST.IS", "1d")
+        pd.testing.assert_series_equal(ucuncu["rsi_14"], ilk["rsi_14"])
+        stats = data_handler.get_indicator_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (2, 1))
+
+    def test_revised_last_bar_misses(self):
+        """Son barın kapanışı değişince (aynı zaman damgası) yeniden hesaplanmalı."""
+        ilk = data_handler.calculate_indicators(self.bars, "TEST.IS", "1d")
+        revize = self.bars.copy()
+        revize.iloc[-1, revize.columns.get_loc("close")] += 1.0
+        ikinci = data_handler.calculate_indicators(revize, "TEST.IS", "1d")
+        self.assertNotEqual(ilk["rsi_14"].iloc[-1], ikinci["rsi_14"].iloc[-1])
+        self.assertEqual(data_handler.get_indicator_cache_stats()["misses"], 2)
+
+    def test_without_identity_is_not_cached(self):
+        """Hisse ve aralık verilmezse önbellek kullanılmamalı."""
+        data_handler.calculate_indicators(self.bars.copy())
+        self.assertEqual(data_handler.get_indicator_cache_stats()["entries"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+import unittest
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+
+from fixtures import sample_bars
+from helpers import data_handler
+from helpers import data_store
+from helpers import dtype_policy
+from helpers import indicator_engine
+from helpers.data_handler import calculate_indicators
+
+
+class TestIndicatorEngine(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._orig_store = data_store.DATA_STORE_DIR
+        data_store.DATA_STORE_DIR = self._tmp_dir
+        indicator_engine.clear_engine_cache()
+        self.bars = sample_bars(400, seed=7, start="2024-01-02 10:00", freq="15min", base=100)
+
+    def tearDown(self):
+        indicator_engine.clear_engine_cache()
+        data_store.DATA_STORE_DIR = self._orig_store
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def assertFramesClose(self, actual, expected):
+        pd.testing.assert_frame_equal(
+            actual[expected.columns], expected, check_dtype=False, rtol=1e-9, atol=1e-9
+        )
+
+    def test_full_computation_matches_calculate_indicators(self):
+        """Soğuk hesap, pandas_ta tabanlı calculate_indicators ile aynı sonucu vermeli."""
+        expected = calculate_indicators(self.bars.copy())
+        result = indicator_engine.update_indicators("GARAN.IS", "15m", self.bars)
+        self.assertEqual(list(result.columns), list(expected.columns))
+        self.assertFramesClose(result, expected)
+
+    def test_new_bars_advance_saved_state(self):
+        """Yeni barlar geldiğinde yalnızca onlar işlenmeli; sonuç baştan hesapla aynı olmalı."""
+        indicator_engine.update_indicators("GARAN.IS", "15m", self.bars.iloc[:-30])
+        result = indicator_engine.update_indicators("GARAN.IS", "15m", self.bars)
+        engine = indicator_engine._engines[("GARAN.IS", "15m")]
+        self.assertEqual(engine.last_advanced_bars, 31)
+        self.assertFramesClose(result, calculate_indicators(self.bars.copy()))
+
+    def test_revised_last_bar_is_recomputed(self):
+        """Oluşmakta olan son barın güncellenmesi durumu bozmamalı."""
+        indicator_engine.update_indicators("GARAN.IS", "15m", self.bars)
+        revised = self.bars.copy()
+        revised.iloc[-1, revised.columns.get_loc("close")] += 5
+        revised.iloc[-1, revised.columns.get_loc("high")] += 5
+        result = indicator_engine.update_indicators("GARAN.IS", "15m", revised)
+        self.assertEqual(indicator_engine._engines[("GARAN.IS", "15m")].last_advanced_bars, 1)
+        self.assertFramesClose(result, calculate_indicators(revised.copy()))
+
+    def test_state_persists_across_restarts(self):
+        """Durum diske yazılmalı; bellek temizlense de artımlı devam edilmeli."""
+        indicator_engine.update_indicators("GARAN.IS", "15m", self.bars.iloc[:-10])
+        self.assertTrue(os.path.exists(indicator_engine._state_path("GARAN.IS", "15m")))
+        indicator_engine.clear_engine_cache()
+
+        result = indicator_engine.update_indicators("GARAN.IS", "15m", self.bars)
+        self.assertEqual(indicator_engine._engines[("GARAN.IS", "15m")].last_advanced_bars, 11)
+        self.assertFramesClose(result, calculate_indicators(self.bars.copy()))
+
+    def test_saves_append_only_new_rows(self):
+        """Her kayıt yalnızca yeni satırları günlüğe eklemeli; durum dosyası geçmişle büyümemeli."""
+        indicator_engine.update_indicators("GARAN.IS", "15m", self.bars.iloc[:-30])
+        state_path = indicator_engine._state_path("GARAN.IS", "15m")
+        rows_path = indicator_engine._rows_path("GARAN.IS", "15m")
+        ilk_durum = os.path.getsize(state_path)
+        for end in (371, 381, 399):
+            indicator_engine.update_indicators("GARAN.IS", "15m", self.bars.iloc[:end])
+
+        segments = indicator_engine._read_row_segments(rows_path)
+        self.assertEqual([len(s) for s in segments], [369, 1, 10, 18])
+        self.assertLess(abs(os.path.getsize(state_path) - ilk_durum), 1024)
+        with open(state_path, "rb") as f:
+            self.assertIsNone(pickle.load(f).frame)
+
+        # Yeniden yüklenen motor günlükten devam etmeli; çok parçalı günlük sıkıştırılmalı.
+        indicator_engine.clear_engine_cache()
+        orig_limit = indicator_engine.ENGINE_MAX_ROW_SEGMENTS
+        indicator_engine.ENGINE_MAX_ROW_SEGMENTS = 2
+        try:
+            result = indicator_engine.update_indicators("GARAN.IS", "15m", self.bars)
+        finally:
+            indicator_engine.ENGINE_MAX_ROW_SEGMENTS = orig_limit
+        self.assertEqual(indicator_engine._engines[("GARAN.IS", "15m")].last_advanced_bars, 2)
+        self.assertEqual(len(indicator_engine._read_row_segments(rows_path)), 1)
+        self.assertFramesClose(result, calculate_indicators(self.bars.copy()))
+
+    def test_tickers_do_not_share_a_lock(self):
+        """Bir hissenin hesabı sürerken başka bir hisse beklemeden hesaplanabilmeli."""
+        bitti = threading.Event()
+
+        def _other():
+            indicator_engine.update_indicators("THYAO.IS", "15m", self.bars)
+            bitti.set()
+
+        with indicator_engine._engine_lock(("GARAN.IS", "15m")):
+            worker = threading.Thread(target=_other)
+            worker.start()
+            self.assertTrue(bitti.wait(30))
+        worker.join()
+        self.assertIs(
+            indicator_engine._engine_lock(("GARAN.IS", "15m")),
+            indicator_engine._engine_lock(("GARAN.IS", "15m")),
+        )
+
+    def test_changed_history_triggers_full_recompute(self):
+        """Seri durumdan önce başlarsa veya geçmiş barlar değişirse hesap baştan yapılmalı."""
+        indicator_engine.update_indicators("GARAN.IS", "15m", self.bars.iloc[5:])
+        result = indicator_engine.update_indicators("GARAN.IS", "15m", self.bars)
+        self.assertEqual(indicator_engine._engines[("GARAN.IS", "15m")].last_advanced_bars, len(self.bars))
+        self.assertFramesClose(result, calculate_indicators(self.bars.copy()))
+
+        # Bölünme düzeltmesi gibi geçmişi yeniden yazan bir revizyon
+        revised = self.bars.copy()
+        revised[["open", "high", "low", "close"]] *= 0.5
+        indicator_engine.update_indicators("GARAN.IS", "15m", revised)
+        self.assertEqual(indicator_engine._engines[("GARAN.IS", "15m")].last_advanced_bars, len(revised))
+
+    def test_alternating_start_dates_reuse_state(self):
+        """Farklı başlangıç tarihli istekler aynı durumdan devam etmeli; durum yeniden yazılmamalı."""
+        expected = calculate_indicators(self.bars.copy())
+        indicator_engine.update_indicators("GARAN.IS", "15m", self.bars.iloc[:-30])
+        rows_path = indicator_engine._rows_path("GARAN.IS", "15m")
+        for end, start in ((-25, 120), (-20, 40), (-15, 200), (-10, 0)):
+            bars = self.bars.iloc[start:end]
+            result = indicator_engine.update_indicators("GARAN.IS", "15m", bars)
+            self.assertEqual(indicator_engine._engines[("GARAN.IS", "15m")].last_advanced_bars, 6)
+            self.assertEqual(list(result.index), list(bars.index))
+            # Geçmiş satırlar serinin başından ısınmış değerlerdir (ics_26 geleceğe bakar).
+            self.assertFramesClose(
+                result.iloc[:-1].drop(columns="ics_26"),
+                expected.iloc[start : len(bars) + start - 1].drop(columns="ics_26"),
+            )
+        self.assertEqual(
+            [len(s) for s in indicator_engine._read_row_segments(rows_path)], [369, 5, 5, 5, 5]
+        )
+        result = indicator_engine.update_indicators("GARAN.IS", "15m", self.bars.iloc[60:])
+        self.assertFramesClose(result, expected.iloc[60:])
+
+    def test_new_group_on_later_start_keeps_previous_columns(self):
+        """Geç başlayan istekte yeni grup için hesap baştan yapılmalı; önceki sütunlar korunmalı."""
+        indicator_engine.update_indicators("GARAN.IS", "15m", self.bars, ["RSI"])
+        bars = self.bars.iloc[100:]
+        result = indicator_engine.update_indicators("GARAN.IS", "15m", bars, ["Super Trend"])
+        self.assertEqual(indicator_engine._engines[("GARAN.IS", "15m")].last_advanced_bars, len(bars))
+        self.assertFramesClose(
+            result, calculate_indicators(bars.copy())[["rsi_14", "supert_7_3.0", "supertd_7_3.0"]]
+        )
+
+    def test_only_requested_groups_are_computed(self):
+        """Yalnızca istenen gruplar (ve bağımlılıkları) hesaplanmalı."""
+        result = indicator_engine.update_indicators("GARAN.IS", "15m", self.bars, ["RSI", "Golden/Death Cross"])
+        for column in ("rsi_14", "ema_50", "ema_200", "golden_cross", "volume_ma_20"):
+            self.assertIn(column, result.columns)
+        for column in ("isa_9", "supert_7_3.0", "macd_12_26_9", "ema_5"):
+            self.assertNotIn(column, result.columns)
+
+    def test_later_groups_are_filled_lazily(self):
+        """Sonradan istenen grup geçmiş barlar için eklenmeli, mevcut durum korunmalı."""
+        indicator_engine.update_indicators("GARAN.IS", "15m", self.bars.iloc[:-20], ["RSI"])
+        result = indicator_engine.update_indicators(
+            "GARAN.IS", "15m", self.bars, ["RSI", "Super Trend", "Ichimoku Cloud"]
+        )
+        self.assertEqual(indicator_engine._engines[("GARAN.IS", "15m")].last_advanced_bars, 21)
+        expected = calculate_indicators(self.bars.copy())
+        columns = ["rsi_14", "supert_7_3.0", "supertd_7_3.0", "isa_9", "ics_26"]
+        self.assertFramesClose(result, expected[columns])
+
+        # Grup listesi verilmeden yapılan sonraki çağrı eksik kalan her şeyi tamamlamalı.
+        result = indicator_engine.update_indicators("GARAN.IS", "15m", self.bars)
+        self.assertFramesClose(result, expected)
+
+    def test_required_indicators_include_summary_needs(self):
+        """Özet ve yapay zeka skorunun kullandığı göstergeler her zaman istenmeli."""
+        required = data_handler.get_required_indicators(["VWAP"])
+        self.assertEqual(required[0], "VWAP")
+        for group in ("EMA KISA (5, 20)", "EMA UZUN (50, 200)", "RSI", "MACD", "ADX", "StochRSI", "Super Trend"):
+            self.assertIn(group, required)
+
+
+class TestIndicatorGraph(unittest.TestCase):
+
+    def setUp(self):
+        self._orig_policy = dtype_policy.DTYPE_POLICY
+        dtype_policy.DTYPE_POLICY = "full"
+        self.bars = sample_bars(200, seed=7, start="2024-01-02 10:00", freq="15min", base=100)
+
+    def tearDown(self):
+        dtype_policy.DTYPE_POLICY = self._orig_policy
+
+    def test_shared_intermediates_are_computed_once(self):
+        """ATR, ADX ve SuperTrend tek bir true range düğümünü paylaşmalı; süreler raporlanmalı."""
+        engine = indicator_engine.IndicatorEngine()
+        columns = indicator_engine.group_columns(["ATR", "ADX", "Super Trend", "EMA KISA (5, 20)", "MACD"])
+        engine.update(self.bars, columns)
+
+        nodes = list(engine.nodes)
+        self.assertEqual(nodes.count("true_range"), 1)
+        self.assertEqual(nodes.count("ema_20"), 1)
+        self.assertLess(nodes.index("true_range"), nodes.index("atr_7"))
+        self.assertLess(nodes.index("ema_12"), nodes.index("macd_12_26_9"))
+        self.assertNotIn("rsi_14", nodes)
+        self.assertEqual(set(engine.timings), set(nodes))
+
+    def test_new_indicator_plugs_in_by_declaring_inputs(self):
+        """Kayda eklenen bir düğüm, girdileri paylaşılarak sütun olarak istenebilmeli."""
+        indicator_engine.register(
+            "atr_band_14", ["close", "atr_14"], indicator_engine.stateless(np.add)
+        )
+        try:
+            engine = indicator_engine.IndicatorEngine()
+            result = engine.update(self.bars, ["atr_14", "atr_band_14"])
+            np.testing.assert_allclose(
+                result["atr_band_14"], result["close"] + result["atr_14"], equal_nan=True
+            )
+            self.assertEqual(list(engine.nodes).count("atr_14"), 1)
+            with self.assertRaises(ValueError):
+                indicator_engine.register("bozuk", ["olmayan_girdi"], indicator_engine.stateless(np.abs))
+        finally:
+            indicator_engine.REGISTRY.pop("atr_band_14", None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,183 @@
+import unittest
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+
+from fixtures import sample_bars
+from helpers import dtype_policy
+from helpers import indicator_kernels as kernels
+from helpers.data_handler import add_anchored_vwap, calculate_indicators, get_vwap_anchors
+
+
+class TestKernelParity(unittest.TestCase):
+    """Çekirdekler pandas_ta ile aynı sonucu vermeli."""
+
+    def setUp(self):
+        self.bars = sample_bars(600, seed=11)
+        self.high = self.bars["high"].to_numpy()
+        self.low = self.bars["low"].to_numpy()
+        self.close = self.bars["close"].to_numpy()
+        self.volume = self.bars["volume"].to_numpy()
+
+    def assertSeriesClose(self, actual, expected):
+        np.testing.assert_allclose(actual, np.asarray(expected, dtype=float), rtol=1e-9, atol=1e-9)
+
+    def test_moving_averages(self):
+        for length in (5, 20, 200):
+            self.assertSeriesClose(kernels.ema(self.close, length), ta.ema(self.bars["close"], length=length))
+        self.assertSeriesClose(kernels.rma(self.close, 14), ta.rma(self.bars["close"], length=14))
+        self.assertSeriesClose(kernels.rolling(self.volume, 20), ta.sma(self.bars["volume"], length=20))
+
+    def test_oscillators(self):
+        self.assertSeriesClose(kernels.rsi(self.close, 14), ta.rsi(self.bars["close"], length=14))
+
+        expected = ta.macd(self.bars["close"])
+        line, hist, signal = kernels.macd(self.close)
+        self.assertSeriesClose(line, expected["MACD_12_26_9"])
+        self.assertSeriesClose(hist, expected["MACDh_12_26_9"])
+        self.assertSeriesClose(signal, expected["MACDs_12_26_9"])
+
+        expected = ta.stochrsi(self.bars["close"])
+        k, d = kernels.stochrsi(self.close)
+        self.assertSeriesClose(k, expected["STOCHRSIk_14_14_3_3"])
+        self.assertSeriesClose(d, expected["STOCHRSId_14_14_3_3"])
+
+    def test_volatility_and_trend(self):
+        bars = self.bars
+        self.assertSeriesClose(
+            kernels.atr(self.high, self.low, self.close, 14),
+            ta.atr(bars["high"], bars["low"], bars["close"], length=14),
+        )
+
+        expected = ta.adx(bars["high"], bars["low"], bars["close"], length=14)
+        adx, dmp, dmn = kernels.adx(self.high, self.low, self.close, 14)
+        self.assertSeriesClose(adx, expected["ADX_14"])
+        self.assertSeriesClose(dmp, expected["DMP_14"])
+        self.assertSeriesClose(dmn, expected["DMN_14"])
+
+        expected = ta.bbands(bars["close"], length=20)
+        lower, mid, upper, _ = kernels.bbands(self.close, 20, 2.0)
+        self.assertSeriesClose(lower, expected["BBL_20_2.0"])
+        self.assertSeriesClose(mid, expected["BBM_20_2.0"])
+        self.assertSeriesClose(upper, expected["BBU_20_2.0"])
+
+        self.assertSeriesClose(kernels.obv(self.close, self.volume), ta.obv(bars["close"], bars["volume"]))
+
+    def test_supertrend_and_ichimoku(self):
+        bars = self.bars
+        expected = ta.supertrend(bars["high"], bars["low"], bars["close"], length=7, multiplier=3)
+        for actual, column in zip(
+            kernels.supertrend(self.high, self.low, self.close, 7, 3.0),
+            ["SUPERT_7_3.0", "SUPERTd_7_3.0", "SUPERTl_7_3.0", "SUPERTs_7_3.0"],
+        ):
+            self.assertSeriesClose(actual, expected[column])
+
+        expected, _ = ta.ichimoku(bars["high"], bars["low"], bars["close"])
+        for actual, column in zip(
+            kernels.ichimoku(self.high, self.low, self.close),
+            ["ISA_9", "ISB_26", "ITS_9", "IKS_26", "ICS_26"],
+        ):
+            self.assertSeriesClose(actual, expected[column])
+
+    def test_short_series_yields_nan(self):
+        """Uzunluktan kısa serilerde EMA tamamen NaN olmalı."""
+        self.assertTrue(np.isnan(kernels.ema(self.close[:10], 20)).all())
+        self.assertTrue(np.isnan(kernels.rsi(self.close[:10], 14)).all())
+
+    def test_two_dimensional_input_matches_columns(self):
+        """(tarih x hisse) matrisinde her sütun tek seri sonucuyla aynı olmalı."""
+        other = self.close[::-1].copy()
+        panel = np.column_stack([self.close, other])
+        panel[:30, 1] = np.nan  # ikinci hisse daha geç listelenmiş
+        for kernel in (lambda x: kernels.ema(x, 20), lambda x: kernels.rsi(x, 14)):
+            result = kernel(panel)
+            self.assertSeriesClose(result[:, 0], kernel(self.close))
+            self.assertSeriesClose(result[30:, 1], kernel(other[30:]))
+            self.assertTrue(np.isnan(result[:30, 1]).all())
+
+
+class TestCalculateIndicators(unittest.TestCase):
+
+    def setUp(self):
+        self._orig_policy = dtype_policy.DTYPE_POLICY
+        dtype_policy.DTYPE_POLICY = "full"
+
+    def tearDown(self):
+        dtype_policy.DTYPE_POLICY = self._orig_policy
+
+    def test_matches_pandas_ta_pipeline(self):
+        """calculate_indicators sütunları pandas_ta çıktılarıyla aynı olmalı."""
+        bars = sample_bars(400, seed=11)
+        result = calculate_indicators(bars.copy())
+        adx = ta.adx(bars["high"], bars["low"], bars["close"], length=14)
+        supertrend = ta.supertrend(bars["high"], bars["low"], bars["close"], length=7, multiplier=3)
+        np.testing.assert_allclose(result["ema_200"], ta.ema(bars["close"], length=200), rtol=1e-9)
+        np.testing.assert_allclose(result["adx_14"], adx["ADX_14"], rtol=1e-9)
+        np.testing.assert_array_equal(result["supertd_7_3.0"], supertrend["SUPERTd_7_3.0"])
+        self.assertEqual(result["supertd_7_3.0"].dtype, np.int64)
+        self.assertEqual(result["golden_cross"].dtype, bool)
+
+
+class TestVwap(unittest.TestCase):
+
+    def setUp(self):
+        bars = sample_bars(300, seed=11)
+        bars.index = pd.date_range("2024-03-04 10:00", periods=300, freq="30min", tz="Europe/Istanbul")
+        self.bars = bars
+
+    def test_session_vwap_matches_groupby(self):
+        """Günlük VWAP, gün bazında gruplanmış kümülatif toplamla aynı olmalı."""
+        bars = self.bars
+        day = kernels.day_codes(bars.index)
+        vwap = kernels.session_vwap(bars["high"], bars["low"], bars["close"], bars["volume"], day)[-1]
+        tp_volume = (bars["high"] + bars["low"] + bars["close"]) / 3 * bars["volume"]
+        gunler = bars.index.tz_localize(None).date
+        expected = tp_volume.groupby(gunler).cumsum() / bars["volume"].groupby(gunler).cumsum()
+        np.testing.assert_allclose(vwap, expected, rtol=1e-12)
+
+    def test_day_codes_use_local_day(self):
+        """Saat dilimli indekste gün sınırı yerel gece yarısı olmalı."""
+        index = pd.DatetimeIndex(["2024-03-04 23:30", "2024-03-05 00:30"]).tz_localize("Europe/Istanbul")
+        codes = kernels.day_codes(index)
+        self.assertEqual(codes[1] - codes[0], 1)
+
+    def test_session_cumsum_continues_from_carry(self):
+        """Parça parça hesaplanan toplam tek seferdeki ile aynı olmalı."""
+        values = self.bars["volume"].to_numpy()
+        day = kernels.day_codes(self.bars.index)
+        full = kernels.session_cumsum(values, day)
+        head = kernels.session_cumsum(values[:137], day[:137])
+        tail = kernels.session_cumsum(values[137:], day[137:], prev_day=day[136], carry=head[-1])
+        np.testing.assert_allclose(np.concatenate([head, tail]), full, rtol=1e-12)
+
+    def test_anchored_vwap_matches_loop(self):
+        """Her başlangıç için sonuç, başlangıçtan itibaren hesaplanan VWAP olmalı."""
+        bars = self.bars
+        anchors = [0, 45, 299]
+        result = kernels.anchored_vwap(bars["high"], bars["low"], bars["close"], bars["volume"], anchors)
+        self.assertEqual(result.shape, (300, 3))
+        tp_volume = ((bars["high"] + bars["low"] + bars["close"]) / 3 * bars["volume"]).to_numpy()
+        for sutun, anchor in enumerate(anchors):
+            expected = np.cumsum(tp_volume[anchor:]) / np.cumsum(bars["volume"].to_numpy()[anchor:])
+            np.testing.assert_allclose(result[anchor:, sutun], expected, rtol=1e-12)
+            self.assertTrue(np.isnan(result[:anchor, sutun]).all())
+
+    def test_add_anchored_vwap_columns(self):
+        """Tarihle verilen başlangıçlar sonraki bara oturmalı ve avwap_ sütunu olarak eklenmeli."""
+        bars = self.bars.copy()
+        anchors = get_vwap_anchors(bars, swing_lookback=60)
+        self.assertEqual(set(anchors), {"swing_low"})
+        anchors["bilanco"] = bars.index[100] - pd.Timedelta(minutes=10)
+        anchors["gelecek"] = bars.index[-1] + pd.Timedelta(days=1)
+        result = add_anchored_vwap(bars, anchors)
+        self.assertIn("avwap_swing_low", result.columns)
+        self.assertNotIn("avwap_gelecek", result.columns)
+        self.assertTrue(np.isnan(result["avwap_bilanco"].iloc[99]))
+        self.assertAlmostEqual(
+            result["avwap_bilanco"].iloc[100],
+            (bars["high"].iloc[100] + bars["low"].iloc[100] + bars["close"].iloc[100]) / 3,
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+from fixtures import sample_bars
+from helpers import data_store
+from helpers import indicator_panel
+from helpers.data_handler import calculate_indicators
+
+
+class TestIndicatorPanel(unittest.TestCase):
+
+    def setUp(self):
+        index = pd.date_range("2022-01-03", periods=500, freq="B")
+        self.frames = {
+            "GARAN.IS": sample_bars(index=index, seed=1, base=40),
+            # Halka arzı sonradan olan hisse
+            "ASTOR.IS": sample_bars(index=index[180:], seed=2, base=40),
+            # İşlem durdurma nedeniyle ortada eksik barlar
+            "THYAO.IS": sample_bars(index=index, seed=3, base=40).drop(index[300:305]),
+        }
+        self.panel = indicator_panel.build_panel(self.frames)
+
+    def assertFramesClose(self, actual, expected):
+        for column in expected.columns:
+            np.testing.assert_allclose(
+                actual[column].to_numpy(dtype=float),
+                expected[column].to_numpy(dtype=float),
+                rtol=1e-9,
+                atol=1e-9,
+                err_msg=column,
+            )
+
+    def test_matches_single_ticker_calculation(self):
+        """Boşluksuz hisselerde panel sonucu calculate_indicators ile aynı olmalı."""
+        sonuc = indicator_panel.compute_panel(self.panel)
+        self.assertEqual(sonuc.index.names, ["date", "ticker"])
+        for hisse in ("GARAN.IS", "ASTOR.IS"):
+            beklenen = calculate_indicators(self.frames[hisse].copy())
+            tek = sonuc.xs(hisse, level="ticker")
+            self.assertEqual(len(tek), len(beklenen))
+            self.assertFramesClose(tek, beklenen.drop(columns=["golden_cross", "death_cross"]))
+            np.testing.assert_array_equal(tek["golden_cross"], beklenen["golden_cross"])
+
+    def test_gapped_ticker_matches_single_ticker_calculation(self):
+        """Eksik barlı hissede yapay bar üretilmemeli; sonuç kendi barlarıyla yapılan hesapla aynı olmalı."""
+        sonuc = indicator_panel.compute_panel(self.panel)
+        tek = sonuc.xs("THYAO.IS", level="ticker")
+        beklenen = calculate_indicators(self.frames["THYAO.IS"].copy())
+        self.assertEqual(list(tek.index), list(beklenen.index))
+        self.assertFramesClose(tek, beklenen.drop(columns=["golden_cross", "death_cross"]))
+        np.testing.assert_array_equal(tek["death_cross"], beklenen["death_cross"])
+
+    def test_intraday_sessions_per_ticker(self):
+        """Gün içi panelde seans VWAP'ı her hissenin kendi barlarıyla sıfırlanmalı."""
+        index = pd.date_range("2024-03-04 10:00", periods=16 * 6, freq="30min")
+        frames = {
+            "GARAN.IS": sample_bars(index=index, seed=4, base=40),
+            "THYAO.IS": sample_bars(index=index, seed=5, base=40).drop(index[20:40]),
+        }
+        sonuc = indicator_panel.compute_panel(indicator_panel.build_panel(frames), groups=["VWAP"])
+        for hisse, bars in frames.items():
+            beklenen = calculate_indicators(bars.copy())
+            self.assertFramesClose(
+                sonuc.xs(hisse, level="ticker"), beklenen[["cum_volume", "vwap_d"]]
+            )
+
+    def test_selected_groups_only(self):
+        """Yalnızca istenen gruplar (ve hacim ortalaması) hesaplanmalı."""
+        sonuc = indicator_panel.compute_panel(self.panel, groups=["RSI"])
+        self.assertEqual(
+            list(sonuc.columns),
+            list(indicator_panel.PANEL_FIELDS) + ["volume_ma_20", "rsi_14"],
+        )
+        self.assertEqual(set(indicator_panel.PANEL_GROUPS), set(indicator_panel.INDICATOR_GROUPS))
+
+    def test_load_panel_reads_store(self):
+        """Depodaki hisselerden panel kurulmalı; depoda olmayanlar atlanmalı."""
+        tmp_dir = tempfile.mkdtemp()
+        orig_store = data_store.DATA_STORE_DIR
+        data_store.DATA_STORE_DIR = tmp_dir
+        try:
+            data_store.write_bars("GARAN.IS", "1d", self.frames["GARAN.IS"])
+            panel = indicator_panel.load_panel(["GARAN.IS", "YOK.IS"], "1d")
+        finally:
+            data_store.DATA_STORE_DIR = orig_store
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.assertEqual(list(panel["close"].columns), ["GARAN.IS"])
+        self.assertEqual(len(panel["close"]), 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import shutil
+import tempfile
+import pandas as pd
+
+from fixtures import sample_bars
+from helpers import data_store
+from helpers import multi_timeframe as mtf
+from helpers.data_handler import calculate_indicators, resample_ohlcv
+
+
+def _intraday_bars(days=60, seed=5):
+    """Her gün 10:00-18:00 arasında 15 dakikalık rastgele yürüyüş barları."""
+    gunler = pd.bdate_range("2024-01-01", periods=days)
+    index = pd.DatetimeIndex(
+        [g + pd.Timedelta(hours=10) + pd.Timedelta(minutes=15 * i) for g in gunler for i in range(32)]
+    )
+    return sample_bars(
+        index=index, seed=seed, base=100, step=0.5, spread=0.3, open_noise=0.1, volume=(100, 5_000)
+    )
+
+
+class TestMultiTimeframe(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._orig_store = data_store.DATA_STORE_DIR
+        data_store.DATA_STORE_DIR = self._tmp_dir
+        self.bars = _intraday_bars()
+
+    def tearDown(self):
+        data_store.DATA_STORE_DIR = self._orig_store
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def test_period_labels_match_resample(self):
+        """Alt barların dönem etiketleri resample_ohlcv etiketleriyle aynı olmalı."""
+        for interval in ("60m", "1d", "1wk", "1mo"):
+            beklenen = resample_ohlcv(self.bars, interval).index
+            etiketler = mtf.period_labels(self.bars.index, interval)
+            self.assertTrue(etiketler.unique().equals(beklenen), interval)
+
+    def test_overlay_uses_previous_completed_period(self):
+        """Her alt bar bir önceki günün günlük göstergesini görmeli."""
+        sonuc = mtf.add_higher_timeframe_indicators(
+            "TEST.IS", "15m", self.bars.copy(), ["Günlük EMA 200", "Haftalık RSI"]
+        )
+        self.assertIn("ema_200_1d", sonuc.columns)
+        self.assertIn("rsi_14_1wk", sonuc.columns)
+
+        gunluk = calculate_indicators(resample_ohlcv(self.bars, "1d"))
+        hizali = mtf.align_to_lower(gunluk[["rsi_14"]], self.bars.index, "1d")
+        bugun = self.bars.index[self.bars.index.normalize() == gunluk.index[31]]
+        self.assertTrue((hizali.loc[bugun, "rsi_14"] == gunluk["rsi_14"].iloc[30]).all())
+        self.assertTrue(hizali.loc[self.bars.index[:32], "rsi_14"].isna().all())
+
+    def test_no_look_ahead(self):
+        """Gelecekteki barların değişmesi geçmiş barlardaki değerleri etkilememeli."""
+        kesim = self.bars.index[20 * 32]
+        degisik = self.bars.copy()
+        degisik.loc[degisik.index >= kesim, ["open", "high", "low", "close"]] *= 1.5
+
+        ilk = mtf.add_higher_timeframe_indicators("TEST.IS", "15m", self.bars.copy(), ["Haftalık RSI"])
+        ikinci = mtf.add_higher_timeframe_indicators("TEST.IS", "15m", degisik, ["Haftalık RSI"])
+        gecmis = ilk.index < kesim
+        pd.testing.assert_series_equal(ilk.loc[gecmis, "rsi_14_1wk"], ikinci.loc[gecmis, "rsi_14_1wk"])
+
+    def test_store_extends_history(self):
+        """Yüklü veriden eski dönemler depodaki üst aralık serisinden gelmeli."""
+        gunluk = resample_ohlcv(self.bars, "1d")
+        data_store.write_bars("TEST.IS", "1d", gunluk.iloc[:52])
+        son_gunler = self.bars.iloc[-10 * 32 :]
+
+        ust = mtf.get_higher_timeframe_bars("TEST.IS", son_gunler, "1d")
+        pd.testing.assert_frame_equal(ust, gunluk, check_freq=False)
+
+    def test_lower_or_equal_timeframes_are_skipped(self):
+        """Grafikten kaba olmayan aralıklar eklenmemeli."""
+        gunluk = resample_ohlcv(self.bars, "1d")
+        sonuc = mtf.add_higher_timeframe_indicators("TEST.IS", "1d", gunluk.copy(), ["Günlük EMA 200"])
+        self.assertNotIn("ema_200_1d", sonuc.columns)
+
+
+if __name__ == '__main__':
+    unittest.main()
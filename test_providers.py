@@ -0,0 +1,117 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from unittest import mock
+import pandas as pd
+
+from helpers import data_handler
+from helpers import database as db
+from helpers import fundamentals
+from helpers import providers
+from helpers.exceptions import DataFetchError, NoDataError
+
+
+def _bars(start, periods, base=100.0):
+    """Depo biçiminde (küçük harfli sütunlar) basit bir OHLCV DataFrame'i üretir."""
+    index = pd.date_range(start=start, periods=periods, freq="D")
+    close = [base + i for i in range(periods)]
+    return pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close, "volume": 1000},
+        index=index,
+    )
+
+
+class TestReplayProvider(unittest.TestCase):
+
+    def setUp(self):
+        """Geçici bir replay dizini hazırla ve replay sağlayıcıyı etkinleştir."""
+        self.root = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.root, "1d"))
+        _bars("2024-01-01", 10).to_parquet(os.path.join(self.root, "1d", "GARAN.IS.parquet"))
+        _bars("2024-01-01", 10, base=200.0).to_csv(os.path.join(self.root, "1d", "THYAO.IS.csv"))
+
+        fundamentals_dir = os.path.join(self.root, "fundamentals", "GARAN.IS")
+        os.makedirs(fundamentals_dir)
+        with open(os.path.join(fundamentals_dir, "info.json"), "w", encoding="utf-8") as f:
+            json.dump({"quoteType": "EQUITY", "sector": "Financial Services"}, f)
+        pd.DataFrame({"2023-12-31": [1.0]}, index=["Net Income"]).to_csv(
+            os.path.join(fundamentals_dir, "financials.csv")
+        )
+
+        self.provider = providers.ReplayProvider(self.root)
+        self._previous = providers.set_provider(self.provider)
+        self._orig_db = db.DB_FILE
+        db.DB_FILE = os.path.join(self.root, "test_providers.db")
+        db.init_db()
+        self._orig_cache = fundamentals.FUNDAMENTALS_CACHE_DIR
+        fundamentals.FUNDAMENTALS_CACHE_DIR = os.path.join(self.root, "cache")
+
+    def tearDown(self):
+        providers.set_provider(self._previous)
+        db.DB_FILE = self._orig_db
+        fundamentals.FUNDAMENTALS_CACHE_DIR = self._orig_cache
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_download_matches_yfinance_shape(self):
+        """Tek ve çoklu hisse çıktısı yf.download ile aynı sütun düzeninde olmalı."""
+        tek = self.provider.download("GARAN.IS", start="2024-01-03", end="2024-01-06")
+        self.assertEqual(list(tek.columns.names), ["Price", "Ticker"])
+        self.assertEqual(len(tek), 3)
+        self.assertIn(("Close", "GARAN.IS"), tek.columns)
+
+        coklu = self.provider.download(["GARAN.IS", "THYAO.IS", "YOK.IS"], group_by="ticker")
+        self.assertEqual(sorted(coklu.columns.get_level_values(0).unique()), ["GARAN.IS", "THYAO.IS"])
+        self.assertEqual(coklu[("THYAO.IS", "Close")].iloc[0], 200.0)
+        self.assertTrue(self.provider.download("YOK.IS").empty)
+
+    def test_ticker_reads_fundamentals(self):
+        """info ve finansal tablolar dosyalardan okunmalı; eksik tablolar boş dönmeli."""
+        ticker = self.provider.ticker("GARAN.IS")
+        self.assertEqual(ticker.info["sector"], "Financial Services")
+        self.assertEqual(ticker.financials.loc["Net Income"].iloc[0], 1.0)
+        self.assertTrue(ticker.cashflow.empty)
+        self.assertTrue(ticker.dividends.empty)
+        self.assertEqual(self.provider.ticker("YOK.IS").info, {})
+
+    def test_data_handler_uses_active_provider(self):
+        """data_handler, ağ yerine etkin sağlayıcıdan veri çekmeli."""
+        veri = data_handler._get_stock_data_native(
+            "GARAN.IS", "1d", start_date="2024-01-01", end_date="2024-01-05"
+        )
+        self.assertCountEqual(veri.columns, ["open", "high", "low", "close", "volume"])
+        self.assertEqual(len(veri), 5)
+
+        temel = data_handler._get_fundamental_data_native("GARAN.IS")
+        self.assertEqual(temel["info"]["quoteType"], "EQUITY")
+
+    def test_only_missing_symbols_enter_backoff(self):
+        """Boş sonuç sembol hatası sayılmalı; bağlantı hatası symbol_health'e yazılmamalı."""
+        with self.assertRaises(NoDataError):
+            data_handler._get_stock_data_native("YOK.IS", "1d", retries=1)
+        with mock.patch.object(
+            self.provider, "download", side_effect=ConnectionError("bağlantı koptu")
+        ):
+            with self.assertRaises(DataFetchError) as hata:
+                data_handler._get_stock_data_native("GARAN.IS", "1d", retries=1)
+        self.assertNotIsInstance(hata.exception, NoDataError)
+        self.assertEqual(list(db.get_symbol_health()["symbol"]), ["YOK.IS"])
+        self.assertFalse(db.is_symbol_blocked("GARAN.IS"))
+
+    def test_provider_selected_from_environment(self):
+        """Ortam değişkeni replay sağlayıcıyı seçmeli."""
+        os.environ[providers.PROVIDER_ENV_VAR] = "replay"
+        os.environ[providers.REPLAY_DIR_ENV_VAR] = self.root
+        try:
+            providers.set_provider(None)
+            provider = providers.get_provider()
+            self.assertIsInstance(provider, providers.ReplayProvider)
+            self.assertEqual(provider.root_dir, self.root)
+        finally:
+            del os.environ[providers.PROVIDER_ENV_VAR]
+            del os.environ[providers.REPLAY_DIR_ENV_VAR]
+
+
+if __name__ == '__main__':
+    unittest.main()
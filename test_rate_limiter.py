@@ -0,0 +1,77 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from helpers import database as db
+from helpers import rate_limiter
+from helpers.exceptions import RateLimitError
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        """Kova durumunu geçici bir veritabanında tut."""
+        self._orig_db = db.DB_FILE
+        self._tmp_dir = tempfile.mkdtemp()
+        db.DB_FILE = os.path.join(self._tmp_dir, "test_rate_limit.db")
+        db.init_db()
+
+    def tearDown(self):
+        db.DB_FILE = self._orig_db
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def test_burst_then_wait(self):
+        """Kova dolu başlar; jetonlar bitince beklenen süre hıza göre artmalı."""
+        rate, burst = rate_limiter.MAX_REQUESTS_PER_SECOND, rate_limiter.BURST
+        waits = [
+            db.reserve_rate_limit_tokens("test", 1, rate, burst) for _ in range(burst + 2)
+        ]
+        self.assertEqual(waits[:burst], [0.0] * burst)
+        self.assertAlmostEqual(waits[burst], 1 / rate, delta=0.05)
+        self.assertAlmostEqual(waits[burst + 1], 2 / rate, delta=0.05)
+
+    def test_acquire_sleeps_only_when_bucket_is_empty(self):
+        """acquire, kova doluyken beklememeli; borçlanınca kalan süre kadar uyumalı."""
+        with mock.patch.object(rate_limiter.time, "sleep") as sleep:
+            rate_limiter.acquire(cost=rate_limiter.BURST)
+            sleep.assert_not_called()
+            rate_limiter.acquire()
+            sleep.assert_called_once()
+            self.assertGreater(sleep.call_args[0][0], 0)
+
+    def test_throttling_halves_rate_and_opens_circuit(self):
+        """Art arda kısıtlamalar hızı düşürmeli ve devreyi açmalı; başarılar hızı toparlamalı."""
+        error = Exception("429 Client Error: Too Many Requests")
+        for _ in range(rate_limiter.CIRCUIT_THROTTLE_THRESHOLD - 1):
+            rate_limiter.record_failure(error)
+        self.assertIsNone(rate_limiter.circuit_open_until())
+        rate_limiter.record_failure(error)
+        self.assertIsNotNone(rate_limiter.circuit_open_until())
+        with self.assertRaises(RateLimitError):
+            rate_limiter.acquire()
+
+        state = db.get_rate_limit_state(rate_limiter.YFINANCE_BUCKET)
+        reduced = state["rate"]
+        self.assertLess(reduced, rate_limiter.MAX_REQUESTS_PER_SECOND)
+        rate_limiter.record_success()
+        self.assertGreater(db.get_rate_limit_state(rate_limiter.YFINANCE_BUCKET)["rate"], reduced)
+
+    def test_symbol_errors_do_not_feed_circuit(self):
+        """Sembole özgü hatalar kısıtlama sayılmamalı."""
+        rate_limiter.record_failure(Exception("No data found, symbol may be delisted"))
+        self.assertIsNone(db.get_rate_limit_state(rate_limiter.YFINANCE_BUCKET))
+        self.assertTrue(rate_limiter.is_throttle_error(RateLimitError("x")))
+
+    def test_backoff_delay_is_jittered_and_capped(self):
+        """Bekleme süresi üstel sınırın altında rastgele olmalı ve üst sınırı aşmamalı."""
+        for attempt in range(10):
+            cap = min(
+                rate_limiter.BACKOFF_MAX_SECONDS, rate_limiter.BACKOFF_BASE_SECONDS * 2 ** attempt
+            )
+            self.assertTrue(0 <= rate_limiter.backoff_delay(attempt) <= cap)
+
+
+if __name__ == '__main__':
+    unittest.main()
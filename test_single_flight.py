@@ -0,0 +1,128 @@
+import unittest
+import threading
+import time
+
+import pandas as pd
+
+from helpers.single_flight import SingleFlight, coalesce
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_execution(self):
+        """Aynı anahtarla eş zamanlı gelen çağrılar tek bir çalıştırmayı paylaşmalı."""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        executions = []
+        results = []
+
+        def fetch():
+            executions.append(1)
+            started.set()
+            release.wait(5)
+            return "veri"
+
+        def leader():
+            results.append(flight.do("THYAO.IS", fetch))
+
+        def follower():
+            started.wait(5)
+            results.append(flight.do("THYAO.IS", fetch))
+
+        threads = [threading.Thread(target=leader)]
+        threads += [threading.Thread(target=follower) for _ in range(4)]
+        for t in threads:
+            t.start()
+        # Takipçilerin bekleme listesine girmesini bekle, sonra liderin işini bitir.
+        deadline = time.time() + 5
+        while flight.get_stats()["calls"] < 5 and time.time() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(results, ["veri"] * 5)
+        self.assertEqual(flight.get_stats(), {"calls": 5, "executed": 1, "coalesced": 4})
+        self.assertEqual(flight.in_flight(), 0)
+
+    def test_dataframe_results_are_copied_per_caller(self):
+        """Birleşen çağrılar aynı DataFrame'i paylaşmamalı; birinin değişikliği diğerine yansımamalı."""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def fetch():
+            started.set()
+            release.wait(5)
+            return pd.DataFrame({"close": [1.0, 2.0]})
+
+        def caller(wait_first):
+            if wait_first:
+                started.wait(5)
+            veri = flight.do("THYAO.IS", fetch)
+            veri["close"] *= 10
+            results.append(veri)
+
+        threads = [threading.Thread(target=caller, args=(i > 0,)) for i in range(3)]
+        for t in threads:
+            t.start()
+        deadline = time.time() + 5
+        while flight.get_stats()["calls"] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len({id(veri) for veri in results}), 3)
+        for veri in results:
+            self.assertEqual(list(veri["close"]), [10.0, 20.0])
+
+    def test_errors_are_shared_and_not_cached(self):
+        """Liderin hatası bekleyenlere iletilmeli; sonraki çağrı yeniden çalışmalı."""
+        flight = SingleFlight()
+        release = threading.Event()
+        errors = []
+
+        def failing():
+            release.wait(5)
+            raise ValueError("yfinance hatası")
+
+        def call():
+            try:
+                flight.do("GARAN.IS", failing)
+            except ValueError as e:
+                errors.append(str(e))
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for t in threads:
+            t.start()
+        deadline = time.time() + 5
+        while flight.get_stats()["calls"] < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, ["yfinance hatası"] * 3)
+        self.assertEqual(flight.do("GARAN.IS", lambda: "tekrar"), "tekrar")
+        self.assertEqual(flight.get_stats()["executed"], 2)
+
+    def test_coalesce_keys_on_arguments(self):
+        """Dekoratör farklı argümanları ayrı, liste argümanlarını hash'lenebilir anahtar olarak ele almalı."""
+        flight = SingleFlight()
+
+        @coalesce(flight)
+        def fetch(hisse_kodu, interval="1d"):
+            return (tuple(hisse_kodu) if isinstance(hisse_kodu, list) else hisse_kodu, interval)
+
+        self.assertEqual(fetch("THYAO.IS", interval="1h"), ("THYAO.IS", "1h"))
+        self.assertEqual(fetch(["A.IS", "B.IS"]), (("A.IS", "B.IS"), "1d"))
+        self.assertEqual(flight.get_stats()["executed"], 2)
+        self.assertIs(fetch.flight, flight)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+
+from fixtures import sample_bars
+from helpers import indicator_kernels as kernels
+from helpers import streaming_indicators as streaming
+
+
+class TestStreamingIndicators(unittest.TestCase):
+    """Bar bar beslenen göstergeler toplu hesapla aynı sonucu vermeli."""
+
+    def setUp(self):
+        # Birden çok seansa yayılan 30 dakikalık barlar
+        self.bars = sample_bars(
+            500, seed=17, start="2024-02-01 10:00", freq="30min", base=30, step=0.3
+        )
+        self.high = self.bars["high"].to_numpy()
+        self.low = self.bars["low"].to_numpy()
+        self.close = self.bars["close"].to_numpy()
+        self.volume = self.bars["volume"].to_numpy()
+
+    def _stream(self, indicator):
+        return self._stream_frame(indicator, self.bars)
+
+    def _stream_frame(self, indicator, veri):
+        return np.array([indicator.update(bar) for bar in streaming.iter_bars(veri)], dtype=float)
+
+    def assertSeriesClose(self, actual, expected):
+        np.testing.assert_allclose(actual, np.asarray(expected, dtype=float), rtol=1e-9, atol=1e-9)
+
+    def test_ema_and_rsi(self):
+        self.assertSeriesClose(self._stream(streaming.StreamingEma(20)), kernels.ema(self.close, 20))
+        self.assertSeriesClose(self._stream(streaming.StreamingRsi(14)), kernels.rsi(self.close, 14))
+
+    def test_macd_and_bollinger(self):
+        macd = self._stream(streaming.StreamingMacd())
+        for i, expected in enumerate(kernels.macd(self.close)):
+            self.assertSeriesClose(macd[:, i], expected)
+        bollinger = self._stream(streaming.StreamingBollinger(20, 2.0))
+        for i, expected in enumerate(kernels.bbands(self.close, 20, 2.0)):
+            self.assertSeriesClose(bollinger[:, i], expected)
+
+    def test_atr_supertrend_and_vwap(self):
+        self.assertSeriesClose(
+            self._stream(streaming.StreamingAtr(14)), kernels.atr(self.high, self.low, self.close, 14)
+        )
+        supertrend = self._stream(streaming.StreamingSuperTrend(7, 3.0))
+        trend, direction, _, _ = kernels.supertrend(self.high, self.low, self.close, 7, 3.0)
+        self.assertSeriesClose(supertrend[:, 0], trend)
+        np.testing.assert_array_equal(supertrend[:, 1], direction)
+        vwap = kernels.session_vwap(
+            self.high, self.low, self.close, self.volume, kernels.day_codes(self.bars.index)
+        )[-1]
+        self.assertSeriesClose(self._stream(streaming.StreamingVwap()), vwap)
+
+    def test_preview_does_not_commit(self):
+        """preview, durumu değiştirmeden bir sonraki değeri göstermeli."""
+        rsi = streaming.StreamingRsi(14)
+        for close in self.close[:-1]:
+            rsi.update(close)
+        onceki = rsi.value
+        onizleme = rsi.preview(self.close[-1])
+        self.assertEqual(rsi.value, onceki)
+        self.assertEqual(rsi.update(self.close[-1]), onizleme)
+        self.assertAlmostEqual(onizleme, kernels.rsi(self.close, 14)[-1])
+
+    def test_float32_scalars(self):
+        """float32 sütunlardan tek tek okunan NumPy skalerleri kabul edilmeli."""
+        bars32 = self.bars.astype(np.float32)
+        rsi = streaming.StreamingRsi(14)
+        for close in bars32["close"].iloc[:-1]:
+            rsi.update(close)
+        onizleme = rsi.preview(bars32["close"].iloc[-1])
+        beklenen = kernels.rsi(bars32["close"].to_numpy(dtype=float), 14)[-1]
+        self.assertAlmostEqual(onizleme, beklenen, places=9)
+        satirlar = self._stream_frame(streaming.StreamingEma(20), bars32)
+        self.assertSeriesClose(satirlar, kernels.ema(bars32["close"].to_numpy(dtype=float), 20))
+
+
+if __name__ == '__main__':
+    unittest.main()
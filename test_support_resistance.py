@@ -0,0 +1,107 @@
+import unittest
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from scipy.signal import find_peaks
+
+from helpers import data_store
+from helpers import support_resistance as sr
+
+
+def _range_bars(n=400, seed=11):
+    """30 ile 40 arasında gidip gelen (destek 30, direnç 40) barlar."""
+    rng = np.random.default_rng(seed)
+    close = 35 + 5 * np.sin(np.arange(n) * 2 * np.pi / 50) + rng.normal(0, 0.2, n)
+    spread = np.abs(rng.normal(0, 0.3, n)) + 0.05
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(1_000, 50_000, n).astype(float),
+        },
+        index=pd.date_range("2023-01-02", periods=n, freq="B"),
+    )
+
+
+class TestSupportResistance(unittest.TestCase):
+
+    def setUp(self):
+        self.bars = _range_bars()
+        sr.SR_CACHE.clear()
+        sr.SR_CACHE.reset_stats()
+
+    def test_pivots_cover_single_scale_peaks(self):
+        """Eski tek ölçekli (distance=15) tepeler çok ölçekli pivotların içinde olmalı."""
+        pivots = sr.find_pivots(self.bars)
+        high = self.bars["high"]
+        eski, _ = find_peaks(high, prominence=high.std() * sr.SR_PROMINENCE_STD, distance=15)
+        tepeler = set(pivots.loc[pivots["kind"] == "peak", "ts"])
+        self.assertTrue(set(self.bars.index[eski]) <= tepeler)
+        # Aynı bar birden çok ölçekte bulunsa da bir kez yazılır.
+        self.assertFalse(pivots.duplicated(["ts", "kind"]).any())
+
+    def test_zones_cluster_repeated_levels(self):
+        """Tekrar tekrar test edilen 30 ve 40 seviyeleri çok temaslı bölgeler olmalı."""
+        _, zones = sr.get_levels(self.bars)
+        direnc = sr.strongest_zones(zones, "resistance").iloc[0]
+        destek = sr.strongest_zones(zones, "support").iloc[0]
+        self.assertAlmostEqual(direnc["level"], 40, delta=1)
+        self.assertAlmostEqual(destek["level"], 30, delta=1)
+        self.assertGreaterEqual(direnc["touches"], 5)
+        self.assertGreaterEqual(destek["touches"], 5)
+        self.assertTrue((zones["low"] <= zones["level"]).all())
+        self.assertTrue((zones["level"] <= zones["high"]).all())
+
+    def test_levels_cached_per_window(self):
+        """Aynı hisse/aralık/pencere ikinci kez hesaplanmamalı; yeni bar yeni hesap gerektirir."""
+        ilk = sr.get_levels(self.bars, "GARAN.IS", "1d")
+        ikinci = sr.get_levels(self.bars, "GARAN.IS", "1d")
+        self.assertIs(ilk, ikinci)
+        sr.get_levels(self.bars.iloc[:-1], "GARAN.IS", "1d")
+        # Gün içinde güncellenen son bar (aynı zaman damgası) yeni hesap gerektirir.
+        guncel = self.bars.copy()
+        guncel.iloc[-1, guncel.columns.get_loc("close")] += 1
+        sr.get_levels(guncel, "GARAN.IS", "1d")
+        stats = sr.get_sr_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 3, 3))
+
+    def test_chart_and_screener_share_levels(self):
+        """Grafik penceresi ne olursa olsun tarama ile aynı sabit geçmiş ve önbellek kaydı kullanılmalı."""
+        tmp_dir = tempfile.mkdtemp()
+        orig_store = data_store.DATA_STORE_DIR
+        data_store.DATA_STORE_DIR = tmp_dir
+        try:
+            data_store.write_bars("DIP.IS", "1d", self.bars.iloc[:388])
+            gorunen = data_store.read_bars("DIP.IS", "1d").iloc[-60:]
+            grafik = sr.get_recent_levels("DIP.IS", "1d", gorunen)
+            sr.find_stocks_near_support(["DIP.IS"], "1d")
+        finally:
+            data_store.DATA_STORE_DIR = orig_store
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.assertLess(grafik[0]["ts"].min(), gorunen.index[0])
+        stats = sr.get_sr_cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_find_stocks_near_support(self):
+        """Kapanışı güçlü desteğe yakın hisseler taramada çıkmalı, uzak olanlar çıkmamalı."""
+        tmp_dir = tempfile.mkdtemp()
+        orig_store = data_store.DATA_STORE_DIR
+        data_store.DATA_STORE_DIR = tmp_dir
+        try:
+            # Döngünün dibinde biten ve tepesinde biten iki hisse
+            data_store.write_bars("DIP.IS", "1d", self.bars.iloc[:388])
+            data_store.write_bars("TEPE.IS", "1d", self.bars.iloc[:363])
+            sonuc = sr.find_stocks_near_support(["DIP.IS", "TEPE.IS", "YOK.IS"], "1d")
+        finally:
+            data_store.DATA_STORE_DIR = orig_store
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.assertEqual(list(sonuc["hisse"]), ["DIP.IS"])
+        self.assertLessEqual(sonuc["uzaklik"].iloc[0], sr.SR_NEAR_DISTANCE)
+        self.assertGreaterEqual(sonuc["temas"].iloc[0], sr.SR_STRONG_TOUCHES)
+
+
+if __name__ == '__main__':
+    unittest.main()
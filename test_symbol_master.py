@@ -0,0 +1,95 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from helpers import data_handler
+from helpers import database as db
+from helpers import providers
+from helpers import symbol_master
+
+_INFOS = {
+    "GARAN.IS": {"sector": "Financial Services", "industry": "Banks", "trailingPE": 5.0, "priceToBook": 1.0},
+    "AKBNK.IS": {"sector": "Financial Services", "industry": "Banks", "trailingPE": 7.0, "priceToBook": 1.4},
+    "YKBNK.IS": {"sector": "Financial Services", "industry": "Banks", "trailingPE": "Infinity"},
+    "THYAO.IS": {"sector": "Industrials", "industry": "Airlines", "trailingPE": 4.0},
+    "ZRE20.IS": {},
+}
+
+
+class _FakeTicker:
+    def __init__(self, symbol):
+        self.info = _INFOS.get(symbol, {})
+
+
+class _FakeProvider(providers.MarketDataProvider):
+    """Çağrı sayısını tutan, info sözlüklerini bellekten sunan sağlayıcı."""
+
+    def __init__(self):
+        self.calls = []
+
+    def ticker(self, symbol):
+        self.calls.append(symbol)
+        return _FakeTicker(symbol)
+
+
+class TestSymbolMaster(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self._orig_db = db.DB_FILE
+        db.DB_FILE = os.path.join(self._tmp_dir, "test_symbol_master.db")
+        db.init_db()
+        self.provider = _FakeProvider()
+        self._previous = providers.set_provider(self.provider)
+        self._universe = mock.patch.dict(
+            data_handler.HISSE_GRUPPARI,
+            {"BIST 100 Hisseleri": ["GARAN", "AKBNK", "YKBNK", "THYAO", "ZRE20"]},
+        )
+        self._universe.start()
+
+    def tearDown(self):
+        self._universe.stop()
+        providers.set_provider(self._previous)
+        db.DB_FILE = self._orig_db
+        shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+    def test_refresh_writes_records_and_reports(self):
+        """Sektörü olan semboller tabloya yazılmalı, olmayanlar hata olarak raporlanmalı."""
+        report, _ = symbol_master.refresh_symbol_master(["GARAN", "YKBNK", "ZRE20"])
+        self.assertEqual(dict(zip(report["hisse"], report["durum"])),
+                         {"GARAN": "ok", "YKBNK": "ok", "ZRE20": "hata"})
+        record = db.get_symbol_master_record("GARAN.IS")
+        self.assertEqual(record["industry"], "Banks")
+        self.assertEqual(record["trailing_pe"], 5.0)
+        self.assertIsNone(db.get_symbol_master_record("YKBNK.IS")["trailing_pe"])
+        self.assertTrue(db.is_symbol_blocked("ZRE20.IS", "fundamental"))
+
+    def test_sector_queries_only_read_the_table(self):
+        """Sektör sorguları yalnızca yerel tabloyu okumalı, sağlayıcıya gitmemeli."""
+        symbol_master.refresh_symbol_master(["GARAN", "AKBNK", "YKBNK", "THYAO", "ZRE20"])
+        self.provider.calls.clear()
+
+        sector, peers = data_handler.get_sector_peers("GARAN.IS")
+        self.assertEqual(sector, "Financial Services")
+        self.assertEqual(peers, ["AKBNK", "YKBNK"])
+
+        sector, averages = data_handler.get_sector_comparison_data("GARAN.IS")
+        self.assertEqual(self.provider.calls, [])
+        self.assertAlmostEqual(averages["F/K"], 7.0)
+        self.assertAlmostEqual(averages["PD/DD"], 1.4)
+
+    def test_missing_record_is_not_fetched(self):
+        """Tabloda olmayan bir hisse için (None, None) dönmeli ve istek yapılmamalı."""
+        self.assertEqual(data_handler.get_sector_peers("GARAN.IS"), (None, None))
+        self.assertEqual(self.provider.calls, [])
+
+    def test_unknown_symbol_has_no_sector(self):
+        """Sektörü bilinmeyen bir hisse için (None, None) dönmeli."""
+        symbol_master.refresh_symbol_master(["GARAN", "AKBNK", "YKBNK", "THYAO", "ZRE20"])
+        self.assertEqual(data_handler.get_sector_peers("ZRE20.IS"), (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import argparse
+import logging
+
+# Proje kök dizinindeki diğer modülleri import edebilmek için
+import sys
+sys.path.append('.')
+
+import helpers.database as db
+from helpers.bulk_loader import (
+    refresh_universe,
+    accumulate_intraday,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_WORKERS,
+)
+from helpers.symbol_master import refresh_symbol_master
+from helpers.event_index import build_event_index, get_crossings
+from constants import HISSE_GRUPPARI
+
+# Loglama ayarları
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(message)s",
+    filename="universe_updater.log",
+    filemode="a",
+)
+
+
+def _print_report(interval, report, elapsed):
+    """Bir aralığın güncelleme raporunu ekrana ve log dosyasına yazar."""
+    basarili = report[report["durum"] == "ok"]
+    hatali = report[report["durum"] == "hata"]
+    atlanan = report[report["durum"] == "atlandı"]
+    for _, row in hatali.iterrows():
+        logging.warning(f"{row['hisse']} ({interval}) güncellenemedi: {row['hata']}")
+
+    print(f"[{interval}] {len(basarili)}/{len(report)} hisse güncellendi, süre: {elapsed:.1f} sn.")
+    if not atlanan.empty:
+        print(f"{len(atlanan)} hisse yakın zamandaki hatalar nedeniyle atlandı.")
+    if not hatali.empty:
+        print("Güncellenemeyen hisseler: " + ", ".join(hatali["hisse"]))
+    logging.info(
+        f"Evren güncellemesi bitti ({interval}): {len(basarili)} başarılı, {len(hatali)} hatalı, {elapsed:.1f} sn."
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="'Tüm Hisseler' evrenini yerel veri deposuna toplu olarak indirir."
+    )
+    parser.add_argument("--interval", default="1d", help="yfinance zaman aralığı (varsayılan: 1d)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS)
+    parser.add_argument(
+        "--intraday",
+        action="store_true",
+        help="Günün 15m/60m barlarını da yerel depoya ekler (her gün çalıştırılmalı)",
+    )
+    parser.add_argument(
+        "--master",
+        action="store_true",
+        help="Sembol ana tablosunu (sektör, endüstri, temel oranlar) da yeniler",
+    )
+    parser.add_argument(
+        "--events",
+        action="store_true",
+        help="Kesişim olayları dizinini depodaki barlardan yeniden kurar ve bugünün olaylarını yazar",
+    )
+    args = parser.parse_args()
+
+    # Başlamadan önce veritabanının var olduğundan emin ol
+    db.init_db()
+
+    print(f"Evren güncellemesi başlatıldı ({args.interval}).")
+    report, elapsed = refresh_universe(
+        interval=args.interval, chunk_size=args.chunk_size, max_workers=args.workers
+    )
+    _print_report(args.interval, report, elapsed)
+
+    if args.intraday:
+        print("Gün içi barlar yerel depoya ekleniyor...")
+        results = accumulate_intraday(chunk_size=args.chunk_size, max_workers=args.workers)
+        for interval, (report, elapsed) in results.items():
+            _print_report(interval, report, elapsed)
+
+    if args.master:
+        print("Sembol ana tablosu yenileniyor...")
+        report, elapsed = refresh_symbol_master(max_workers=args.workers)
+        _print_report("sembol ana tablosu", report, elapsed)
+
+    if args.events:
+        print("Kesişim olayları dizini kuruluyor...")
+        hisseler = [f"{h}.IS" for h in dict.fromkeys(HISSE_GRUPPARI["Tüm Hisseler"])]
+        olaylar = build_event_index(hisseler, args.interval)
+        print(f"[{args.interval}] {len(olaylar)} olay dizine yazıldı.")
+        for row in get_crossings(args.interval).itertuples(index=False):
+            print(f"{row.symbol}: {row.event} ({row.price:.2f})")
+
+
+if __name__ == "__main__":
+    main()